@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Measure the cold-start import cost of every skill module.
+
+Each module is imported in a fresh interpreter with a stand-in `agentos`
+package on sys.path, so the number is the module's own import chain (its
+top-level code plus third-party imports), not the engine's. Modules whose
+optional dependencies aren't installed are reported as errors rather than
+timed.
+
+    bin/import-bench.py                     # every module under skills/
+    bin/import-bench.py skills/media        # one subtree
+    bin/import-bench.py --budget-ms 150     # exit 1 if any module is slower
+    bin/import-bench.py --json              # machine-readable output
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Stand-in for the engine's agentos package. Every attribute is a stub that
+# works as a module, a value, or a decorator (with or without arguments),
+# and `agentos.<anything>` imports as another stub module.
+AGENTOS_STUB = '''
+import importlib.abc
+import importlib.machinery
+import sys
+import types
+
+
+class _Stub:
+    def __init__(self, name="stub"):
+        self._name = name
+
+    def __call__(self, *args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return _Stub(self._name)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _Stub(f"{self._name}.{name}")
+
+    def __iter__(self):
+        return iter(())
+
+    def keys(self):
+        return ()
+
+    def __getitem__(self, key):
+        return _Stub(self._name)
+
+    def __setitem__(self, key, value):
+        pass
+
+    def __mro_entries__(self, bases):
+        return (object,)
+
+
+def __getattr__(name):
+    if name.startswith("__"):
+        raise AttributeError(name)
+    return _Stub(name)
+
+
+class _StubFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def find_spec(self, fullname, path, target=None):
+        if fullname.startswith("agentos."):
+            return importlib.machinery.ModuleSpec(fullname, self, is_package=True)
+        return None
+
+    def create_module(self, spec):
+        module = types.ModuleType(spec.name)
+        module.__path__ = []
+        module.__getattr__ = __getattr__
+        return module
+
+    def exec_module(self, module):
+        pass
+
+
+sys.meta_path.insert(0, _StubFinder())
+'''
+
+# Runs in the child: import one file and print {"ms": ..., "error": ...}
+CHILD = '''
+import importlib.util, json, sys, time
+stub_dir, path = sys.argv[1], sys.argv[2]
+sys.path[:0] = [stub_dir, str(__import__("pathlib").Path(path).parent)]
+import agentos
+# The engine has these loaded before any skill runs
+import asyncio, re, pathlib
+start = time.perf_counter()
+error = None
+try:
+    spec = importlib.util.spec_from_file_location("_bench_module", path)
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
+except BaseException as e:
+    error = f"{type(e).__name__}: {e}".splitlines()[0][:160]
+print(json.dumps({"ms": (time.perf_counter() - start) * 1000, "error": error}))
+'''
+
+
+def _modules(roots):
+    for root in roots:
+        root = Path(root)
+        files = [root] if root.is_file() else sorted(root.rglob("*.py"))
+        for path in files:
+            # _research/ and friends hold scratch scripts, not skill modules
+            if not any(part.startswith(("_", ".")) for part in path.relative_to(root).parts[:-1]):
+                yield path.resolve()
+
+
+def _measure(stub_dir, path, repeat):
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", CHILD, stub_dir, str(path)],
+            capture_output=True, text=True, timeout=120, cwd=path.parent,
+        )
+        try:
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            return None, (proc.stderr.strip().splitlines() or ["no output"])[-1]
+        if result["error"]:
+            return None, result["error"]
+        best = result["ms"] if best is None else min(best, result["ms"])
+    return best, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="*", default=[str(REPO_ROOT / "skills")])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per module; the fastest is reported")
+    parser.add_argument("--budget-ms", type=float, help="fail if any module imports slower than this")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as stub_dir:
+        (Path(stub_dir) / "agentos").mkdir()
+        (Path(stub_dir) / "agentos" / "__init__.py").write_text(AGENTOS_STUB)
+        for path in _modules(args.paths):
+            ms, error = _measure(stub_dir, path, max(args.repeat, 1))
+            try:
+                name = str(path.relative_to(REPO_ROOT))
+            except ValueError:
+                name = str(path)
+            results.append({"module": name, "ms": ms, "error": error})
+
+    results.sort(key=lambda r: (r["ms"] is None, -(r["ms"] or 0)))
+    over = [r for r in results if args.budget_ms is not None and r["ms"] is not None and r["ms"] > args.budget_ms]
+
+    if args.json:
+        print(json.dumps({"results": results, "over_budget": [r["module"] for r in over]}, indent=2))
+    else:
+        width = max((len(r["module"]) for r in results), default=0)
+        for r in results:
+            cost = f"{r['ms']:8.1f} ms" if r["ms"] is not None else "       error"
+            flag = "  over budget" if r in over else ""
+            note = f"  {r['error']}" if r["error"] else ""
+            print(f"{r['module']:<{width}}  {cost}{flag}{note}")
+        timed = [r["ms"] for r in results if r["ms"] is not None]
+        print(f"\n{len(timed)} timed, {len(results) - len(timed)} failed to import, total {sum(timed):.1f} ms")
+
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,18 @@ code_review.py — Evaluate code changes against project principles and architec
 
 Scores every diff against engine principles, shape principles,
 skill SDK patterns, and active refactoring specs. Uses llm.oneshot()
-for a single evaluation pass — no tools, no agent loop.
+per diff chunk — no tools, no agent loop. Large diffs are split by file
+and the chunks evaluated concurrently; each chunk's review is cached by
+hash, so re-running the hook on an unchanged index costs nothing.
 """
 
+import asyncio
+import hashlib
 import json
-import yaml
+import os
+import re
+import tempfile
+import time
 from pathlib import Path
 
 from agentos import llm, returns, shell, timeout
@@ -20,6 +27,20 @@ from agentos import llm, returns, shell, timeout
 # Absolute paths — skill may run from any cwd
 AGENTOS_ROOT = Path.home() / "dev" / "agentos"
 SDK_ROOT = Path.home() / "dev" / "agentos-sdk"
+CACHE_DIR = Path.home() / ".agentos" / "cache" / "code-review"
+
+# Loaded knowledge, reused while the source files' mtimes are unchanged
+_knowledge_cache: dict = {"sig": None, "value": None}
+
+# dev.sh arch output is reused until the agentos index or HEAD moves
+ARCH_TTL = 600
+
+
+def _mtime(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
 
 
 def _load_principles() -> tuple[str, str, str]:
@@ -61,12 +82,83 @@ def _load_refactoring_specs() -> str:
     return "\n\n".join(parts)
 
 
+def _knowledge_sig() -> list:
+    specs_dir = AGENTOS_ROOT / "docs" / "specs" / "refactoring"
+    paths = [
+        AGENTOS_ROOT / "principles.md",
+        SDK_ROOT / "docs" / "principles.md",
+        SDK_ROOT / "docs" / "skills.md",
+    ]
+    if specs_dir.exists():
+        paths += sorted(specs_dir.glob("*.md"))
+    return [[str(p), _mtime(p)] for p in paths]
+
+
+def _load_knowledge() -> tuple[tuple[str, str, str, str], list]:
+    """Principles plus refactoring specs, re-read only when a file changes."""
+    sig = _knowledge_sig()
+    if _knowledge_cache["sig"] != sig:
+        _knowledge_cache["value"] = (*_load_principles(), _load_refactoring_specs())
+        _knowledge_cache["sig"] = sig
+    return _knowledge_cache["value"], sig
+
+
+def _read_cache(name: str) -> dict | None:
+    try:
+        return json.loads((CACHE_DIR / name).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(name: str, data: dict) -> None:
+    path = CACHE_DIR / name
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
 async def _load_arch() -> str:
+    git_dir = AGENTOS_ROOT / ".git"
+    sig = [_mtime(git_dir / "index"), _mtime(git_dir / "HEAD")]
+    cached = _read_cache("arch.json")
+    if cached and cached.get("sig") == sig and time.time() - cached.get("at", 0) < ARCH_TTL:
+        return cached["text"]
     try:
         result = await shell.run(str(AGENTOS_ROOT / "dev.sh"), ["arch"], cwd=str(AGENTOS_ROOT))
-        return result.get("stdout", "")
+        text = result.get("stdout", "")
     except Exception:
         return ""
+    _write_cache("arch.json", {"sig": sig, "at": time.time(), "text": text})
+    return text
+
+
+# ---------------------------------------------------------------------------
+# Diff chunking
+# ---------------------------------------------------------------------------
+
+# Files are packed into chunks up to this size; a single larger file is
+# sent on its own rather than split mid-hunk.
+CHUNK_CHARS = 60_000
+CHUNK_CONCURRENCY = 4
+
+
+def _chunk_diff(diff: str) -> list[str]:
+    """Split a diff at `diff --git` boundaries and pack files into chunks."""
+    files = [f for f in re.split(r"(?m)^(?=diff --git )", diff) if f.strip()]
+    chunks, current = [], ""
+    for f in files:
+        if current and len(current) + len(f) > CHUNK_CHARS:
+            chunks.append(current)
+            current = ""
+        current += f
+    if current:
+        chunks.append(current)
+    return chunks or [diff]
 
 
 # ---------------------------------------------------------------------------
@@ -135,7 +227,7 @@ verdict: pass if no critical violations and ≤2 major violations. Otherwise fai
     "violations": "string",
     "summary": "string",
 })
-@timeout(120)
+@timeout(300)
 async def evaluate_commit(
     diff: str,
     files: str = "",
@@ -151,8 +243,7 @@ async def evaluate_commit(
         threshold: Minimum passing score out of 100 (default 90)
         model: LLM model to use for evaluation (default sonnet)
     """
-    engine_principles, sdk_principles, skill_guide = _load_principles()
-    refactoring_specs = _load_refactoring_specs()
+    (engine_principles, sdk_principles, skill_guide, refactoring_specs), sig = _load_knowledge()
     arch = await _load_arch()
 
     prompt_parts = [
@@ -179,37 +270,80 @@ async def evaluate_commit(
         "## Files changed",
         files,
         "",
-        "## Diff",
-        diff,
     ]
 
-    result = await llm.oneshot(
-        prompt="\n".join(prompt_parts),
-        system=EVALUATOR_SYSTEM_PROMPT,
-        model=model,
-    )
+    chunks = _chunk_diff(diff)
+    sem = asyncio.Semaphore(CHUNK_CONCURRENCY)
+
+    async def review(n: int, chunk: str) -> dict:
+        header = ["## Diff"]
+        if len(chunks) > 1:
+            header = [
+                f"## Diff (part {n + 1} of {len(chunks)} — review only this part; "
+                "the full list of changed files is above)",
+            ]
+        # Arch output is excluded from the key: it drifts with unrelated edits
+        # and would defeat the cache for an unchanged index.
+        key = hashlib.sha256(
+            json.dumps([model, sig, files, header, chunk]).encode()
+        ).hexdigest()
+        cached = _read_cache(f"verdicts/{key}.json")
+        if cached:
+            return cached
+        async with sem:
+            result = await llm.oneshot(
+                prompt="\n".join(prompt_parts + header + [chunk]),
+                system=EVALUATOR_SYSTEM_PROMPT,
+                model=model,
+            )
+        parsed = _parse_review(result.get("content") or "")
+        # Only a real verdict is worth keeping; an empty or failed response
+        # parses as "fail" and must be retried on the next run.
+        if parsed["parsed"] and not result.get("error"):
+            _write_cache(f"verdicts/{key}.json", parsed)
+        return parsed
+
+    reviews = await asyncio.gather(*(review(n, c) for n, c in enumerate(chunks)))
+
+    # Merge: any failing chunk fails the commit, and the score is computed
+    # from the violation counts across all chunks.
+    verdict = "pass" if all(r["verdict"] == "pass" for r in reviews) else "fail"
+    critical = sum(r["critical"] for r in reviews)
+    major = sum(r["major"] for r in reviews)
+    minor = sum(r["minor"] for r in reviews)
+
+    # Compute score: start at 100, deduct per violation
+    score = max(0, 100 - (critical * 30) - (major * 15) - (minor * 5))
+
+    violation_lines = list(dict.fromkeys(v for r in reviews for v in r["violations"]))
+    summaries = list(dict.fromkeys(r["summary"] for r in reviews if r["summary"] != "No summary"))
+
+    return {"__result__": {
+        "score": score,
+        "maxScore": 100,
+        "pass": verdict == "pass" and score >= threshold,
+        "violations": "\n".join(violation_lines) if violation_lines else "None",
+        "summary": "\n".join(summaries) if summaries else "No summary",
+    }}
 
-    content = result.get("content", "")
 
+def _parse_review(content: str) -> dict:
+    """Pull verdict, violation counts, summary and violation lines from a review."""
     # Parse verdict from frontmatter
     verdict = "fail"
+    parsed = False
     if content.startswith("---"):
         parts = content.split("---", 2)
         if len(parts) >= 3:
+            import yaml
+
             try:
                 fm = yaml.safe_load(parts[1]) or {}
-                verdict = fm.get("verdict", "fail")
+                if isinstance(fm, dict) and "verdict" in fm:
+                    verdict, parsed = fm["verdict"], True
             except yaml.YAMLError:
                 pass
 
-    # Count violations by severity from markdown list
-    critical = content.lower().count("**critical**")
-    major = content.lower().count("**major**")
-    minor = content.lower().count("**minor**")
-
-    # Compute score: start at 100, deduct per violation
-    score = max(0, 100 - (critical * 30) - (major * 15) - (minor * 5))
-
     # Extract summary section
     summary = "No summary"
     for line in content.splitlines():
@@ -219,7 +353,6 @@ async def evaluate_commit(
             break
 
     # Extract violations section
-    violations_md = "None"
     in_violations = False
     violation_lines = []
     for line in content.splitlines():
@@ -230,13 +363,15 @@ async def evaluate_commit(
             break
         if in_violations and line.strip().startswith("- "):
             violation_lines.append(line.strip())
-    if violation_lines:
-        violations_md = "\n".join(violation_lines)
 
-    return {"__result__": {
-        "score": score,
-        "maxScore": 100,
-        "pass": verdict == "pass" and score >= threshold,
-        "violations": violations_md,
+    # Count violations by severity from markdown list
+    lowered = content.lower()
+    return {
+        "verdict": verdict,
+        "critical": lowered.count("**critical**"),
+        "major": lowered.count("**major**"),
+        "minor": lowered.count("**minor**"),
         "summary": summary,
-    }}
+        "violations": violation_lines,
+        "parsed": parsed,  # frontmatter carried a real verdict
+    }
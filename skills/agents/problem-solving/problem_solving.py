@@ -16,8 +16,6 @@ import re
 from datetime import date, datetime
 from pathlib import Path
 
-import yaml
-
 from agentos import llm, progress, returns, shell, timeout
 
 
@@ -257,6 +255,8 @@ def _parse_frontmatter(text: str) -> tuple[dict, str]:
     parts = rest.split("---", 2)
     if len(parts) < 3:
         return {}, text
+    import yaml
+
     try:
         fm = yaml.safe_load(parts[1]) or {}
     except yaml.YAMLError:
@@ -267,6 +267,8 @@ def _parse_frontmatter(text: str) -> tuple[dict, str]:
 
 def _dump_frontmatter(fm: dict, body: str) -> str:
     """Serialize frontmatter + body into a markdown file."""
+    import yaml
+
     fm_text = yaml.safe_dump(fm, sort_keys=False, default_flow_style=False, allow_unicode=True)
     return f"---\n{fm_text}---\n\n{body}"
 
@@ -11,18 +11,29 @@ inference operations prefer api but auto-start the server via cli if needed.
 """
 
 import json
+import os
 import shutil
 import sys
 import asyncio
 import time
 from pathlib import Path
 
-from agentos import http, shell, connection, provides, returns, timeout
+from agentos import http, progress, shell, connection, provides, returns, timeout
 from agentos.tools import llm
 
 DEFAULT_BASE_URL = "http://localhost:11434"
 DEFAULT_BINARY = "/opt/homebrew/bin/ollama"
 
+# A server seen alive within this many seconds is trusted without a probe.
+# Any transport failure against it clears the entry immediately.
+LIVENESS_TTL = 30.0
+
+# base_url → monotonic time of the last successful response from that server
+_last_alive: dict[str, float] = {}
+
+# base_url → in-flight `ollama serve` startup task, shared by concurrent callers
+_startups: dict[str, asyncio.Task] = {}
+
 
 # ── Connection helpers ────────────────────────────────────────────────────────
 
@@ -52,22 +63,60 @@ def _connection_name(connection: dict | None) -> str:
 
 # ── HTTP helpers ──────────────────────────────────────────────────────────────
 
+def _origin(url: str) -> str:
+    scheme, _, rest = url.partition("://")
+    return f"{scheme}://{rest.split('/', 1)[0]}"
+
+
+def _mark_alive(base: str) -> None:
+    _last_alive[base] = time.monotonic()
+
+
+def _mark_dead(base: str) -> None:
+    _last_alive.pop(base, None)
+
+
+def _recently_alive(base: str) -> bool:
+    seen = _last_alive.get(base)
+    return seen is not None and time.monotonic() - seen < LIVENESS_TTL
+
+
+async def _send(method, url: str, **kwargs) -> dict:
+    """Issue a request, keeping the liveness cache in step with what it saw.
+
+    Any HTTP response proves the server is up; a transport error (raised, or
+    reported as status 0) means it may not be, so the next call probes again
+    instead of trusting the cache.
+    """
+    base = _origin(url)
+    try:
+        resp = await method(url, **kwargs)
+    except Exception:
+        _mark_dead(base)
+        raise
+    if resp.get("status"):
+        _mark_alive(base)
+    else:
+        _mark_dead(base)
+    return resp
+
+
 async def _http_get(url: str, timeout: int = 10) -> dict:
-    resp = await http.get(url, **http.headers(accept="json"), timeout=timeout)
+    resp = await _send(http.get, url, **http.headers(accept="json"), timeout=timeout)
     if not resp.get("ok"):
         raise RuntimeError(f"HTTP GET {url} failed: {resp.get('status', 0)}")
     return resp.get("json") or json.loads(resp.get("body", "{}"))
 
 
 async def _http_post(url: str, body: dict, timeout: int = 300) -> dict:
-    resp = await http.post(url, json=body, **http.headers(accept="json"), timeout=timeout)
+    resp = await _send(http.post, url, json=body, **http.headers(accept="json"), timeout=timeout)
     if not resp.get("ok"):
         raise RuntimeError(f"HTTP POST {url} failed: {resp.get('status', 0)}")
     return resp.get("json") or json.loads(resp.get("body", "{}"))
 
 
 async def _http_delete(url: str, body: dict, timeout: int = 30) -> int:
-    resp = await http.delete(url, json=body, **http.headers(accept="json"), timeout=timeout)
+    resp = await _send(http.delete, url, json=body, **http.headers(accept="json"), timeout=timeout)
     return resp.get("status", 0)
 
 
@@ -81,7 +130,7 @@ async def _api_running(base_url: str = DEFAULT_BASE_URL) -> bool:
         return False
 
 
-async def _start_server(binary: str) -> bool:
+async def _start_server(binary: str, base_url: str = DEFAULT_BASE_URL) -> bool:
     """Start `ollama serve` in background. Polls up to 8s for readiness."""
     try:
         # shell.run is synchronous, so we use it to invoke `ollama serve` via
@@ -91,18 +140,41 @@ async def _start_server(binary: str) -> bool:
         pass  # timeout is expected — ollama serve runs forever
     for _ in range(16):
         await asyncio.sleep(0.5)
-        if await _api_running():
+        if await _api_running(base_url):
             return True
     return False
 
 
+async def _start_server_once(binary: str, base_url: str = DEFAULT_BASE_URL) -> bool:
+    """Start the server, joining any startup already in flight for base_url.
+
+    Concurrent cold-start callers all await the same task, so only one
+    `ollama serve` is launched.
+    """
+    task = _startups.get(base_url)
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_start_server(binary, base_url))
+        _startups[base_url] = task
+
+        def _forget(t: asyncio.Task) -> None:
+            if _startups.get(base_url) is t:
+                del _startups[base_url]
+
+        task.add_done_callback(_forget)
+    return await asyncio.shield(task)
+
+
 async def _ensure_api_running(connection: dict | None, cli_connection: dict | None = None) -> None:
-    """Ensure the Ollama REST API is reachable, starting it via CLI if not."""
+    """Ensure the Ollama REST API is reachable, starting it via CLI if not.
+
+    Trusts a server seen alive within LIVENESS_TTL, so back-to-back calls
+    skip the /api/version probe.
+    """
     base = _base_url(connection)
-    if await _api_running(base):
+    if _recently_alive(base) or await _api_running(base):
         return
     binary = _binary(cli_connection or connection)
-    started = await _start_server(binary)
+    started = await _start_server_once(binary, base)
     if not started:
         raise RuntimeError(
             "Ollama server is not running and could not be started automatically. "
@@ -122,7 +194,7 @@ async def op_status(connection: dict | None = None, **kwargs) -> dict:
     started = False
 
     if not running:
-        started = await _start_server(binary)
+        started = await _start_server_once(binary, base)
         running = started
 
     version = None
@@ -168,41 +240,49 @@ def _normalize_tool_calls(raw: list) -> list:
     return out
 
 
-@provides(llm)
-@returns({"content": "{'type': 'string', 'description': 'Text response (null if tool calls only)'}", "thinking": "{'type': 'string', 'description': 'Reasoning trace (only for thinking models)'}", "tool_calls": "{'type': 'array', 'description': 'Tool calls the model wants to make'}", "stop_reason": "{'type': 'string', 'enum': ['end_turn', 'tool_use', 'max_tokens']}", "usage": "{'type': 'object', 'description': 'Token counts: input_tokens, output_tokens'}"})
-@connection(["api", "cli"])
-@timeout(300)
-async def op_chat(
-    model: str,
-    messages: list,
-    tools: list = None,
-    system: str = None,
-    max_tokens: int = 4096,
-    temperature: float = 0,
-    thinking: bool = False,
-    connection: dict | None = None,
-    **kwargs,
-) -> dict:
-    """Send a chat message to a local Ollama model. Supports tool calling, system prompts, and extended thinking mode. Uses the REST API by default; falls back to the CLI for single-turn prompts if the API connection is chosen as cli. Auto-starts the Ollama server if it is not running.
+def _usage(resp: dict) -> dict:
+    """Token counts plus Ollama's server-side timings (its durations are in ns).
 
-        Args:
-            model: Model name (e.g. qwen3.5:9b-q8_0, glm-4.7-flash)
-            messages: Array of {role, content} message objects
-            tools: Optional tool definitions ({name, description, input_schema})
-            system: Optional system prompt (prepended as first message)
-            max_tokens: Maximum tokens to generate
-            temperature: Sampling temperature (0 = deterministic, good for agents)
-            thinking: Enable extended thinking / reasoning mode (qwen3, glm-4.7, etc.)
-        """
-    conn_name = _connection_name(connection)
+    Time to first token is model load + prompt eval — what the caller waits
+    before the first output token exists, independent of transport buffering.
+    """
+    output_tokens = resp.get("eval_count", 0)
+    eval_ns = resp.get("eval_duration") or 0
+    first_token_ns = (resp.get("load_duration") or 0) + (resp.get("prompt_eval_duration") or 0)
+    return {
+        "input_tokens": resp.get("prompt_eval_count", 0),
+        "output_tokens": output_tokens,
+        "time_to_first_token_ms": round(first_token_ns / 1e6) if first_token_ns else None,
+        "tokens_per_second": round(output_tokens / (eval_ns / 1e9), 2) if eval_ns else None,
+    }
 
-    if conn_name == "cli":
-        return await _chat_via_cli(model, messages, system, connection)
 
-    # API path — auto-start if needed
-    await _ensure_api_running(connection)
-    base = _base_url(connection)
+def _stop_reason(done_reason: str) -> str:
+    return (
+        "tool_use" if done_reason == "tool_calls"
+        else "max_tokens" if done_reason == "length"
+        else "end_turn"
+    )
+
+
+def _keep_alive(value: str | int) -> str | int:
+    """Ollama takes a duration string ("10m") or seconds; "-1" means forever."""
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    return value
+
 
+def _chat_body(
+    model: str,
+    messages: list,
+    tools: list | None,
+    system: str | None,
+    max_tokens: int,
+    temperature: float,
+    thinking: bool,
+    keep_alive: str | int | None,
+) -> dict:
+    """Build a non-streaming /api/chat request body."""
     all_messages = []
     if system:
         all_messages.append({"role": "system", "content": system})
@@ -217,6 +297,8 @@ async def op_chat(
             "num_predict": max_tokens,
         },
     }
+    if keep_alive is not None:
+        body["keep_alive"] = _keep_alive(keep_alive)
 
     if tools:
         body["tools"] = [
@@ -233,24 +315,136 @@ async def op_chat(
 
     if thinking:
         body["think"] = True
+    return body
 
-    resp = await _http_post(f"{base}/api/chat", body, timeout=300)
+
+def _chat_result(resp: dict) -> dict:
     msg = resp.get("message") or {}
     raw_tools = msg.get("tool_calls") or []
-    done_reason = resp.get("done_reason", "stop")
-
     return {
         "content": msg.get("content") or None,
         "thinking": msg.get("thinking") or None,
         "tool_calls": _normalize_tool_calls(raw_tools),
-        "stop_reason": (
-            "tool_use" if done_reason == "tool_calls"
-            else "max_tokens" if done_reason == "length"
-            else "end_turn"
-        ),
+        "stop_reason": _stop_reason(resp.get("done_reason", "stop")),
+        "usage": _usage(resp),
+    }
+
+
+@provides(llm)
+@returns({"content": "{'type': 'string', 'description': 'Text response (null if tool calls only)'}", "thinking": "{'type': 'string', 'description': 'Reasoning trace (only for thinking models)'}", "tool_calls": "{'type': 'array', 'description': 'Tool calls the model wants to make'}", "stop_reason": "{'type': 'string', 'enum': ['end_turn', 'tool_use', 'max_tokens']}", "usage": "{'type': 'object', 'description': 'Token counts: input_tokens, output_tokens; timings: time_to_first_token_ms, tokens_per_second'}"})
+@connection(["api", "cli"])
+@timeout(300)
+async def op_chat(
+    model: str,
+    messages: list,
+    tools: list = None,
+    system: str = None,
+    max_tokens: int = 4096,
+    temperature: float = 0,
+    thinking: bool = False,
+    keep_alive: str | int = None,
+    connection: dict | None = None,
+    **kwargs,
+) -> dict:
+    """Send a chat message to a local Ollama model. Supports tool calling, system prompts, and extended thinking mode. Uses the REST API by default; falls back to the CLI for single-turn prompts if the API connection is chosen as cli. Auto-starts the Ollama server if it is not running.
+
+        Args:
+            model: Model name (e.g. qwen3.5:9b-q8_0, glm-4.7-flash)
+            messages: Array of {role, content} message objects
+            tools: Optional tool definitions ({name, description, input_schema})
+            system: Optional system prompt (prepended as first message)
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0 = deterministic, good for agents)
+            thinking: Enable extended thinking / reasoning mode (qwen3, glm-4.7, etc.)
+            keep_alive: How long Ollama keeps the model loaded afterwards (e.g. 10m, -1 for forever)
+        """
+    conn_name = _connection_name(connection)
+
+    if conn_name == "cli":
+        return await _chat_via_cli(model, messages, system, connection)
+
+    # API path — auto-start if needed
+    await _ensure_api_running(connection)
+    base = _base_url(connection)
+
+    body = _chat_body(model, messages, tools, system, max_tokens, temperature, thinking, keep_alive)
+    resp = await _http_post(f"{base}/api/chat", body, timeout=300)
+    return _chat_result(resp)
+
+
+def _default_parallelism() -> int:
+    """Match the server's OLLAMA_NUM_PARALLEL; beyond it requests just queue."""
+    try:
+        return max(1, int(os.environ.get("OLLAMA_NUM_PARALLEL", "")))
+    except ValueError:
+        return 4
+
+
+@returns({"results": "{'type': 'array', 'description': 'One chat result (or {error}) per conversation, in input order'}", "usage": "{'type': 'object', 'description': 'input_tokens, output_tokens, completed, failed, elapsed_ms, tokens_per_second'}"})
+@connection("api")
+@timeout(3600)
+async def op_chat_batch(
+    model: str,
+    conversations: list,
+    tools: list = None,
+    system: str = None,
+    max_tokens: int = 4096,
+    temperature: float = 0,
+    thinking: bool = False,
+    concurrency: int = None,
+    keep_alive: str | int = "10m",
+    connection: dict | None = None,
+    **kwargs,
+) -> dict:
+    """Run many independent chats against one local model concurrently. Results keep input order; a failed conversation yields {error} without failing the batch. The model is kept loaded across the batch via keep_alive.
+
+        Args:
+            model: Model name (e.g. qwen3.5:9b-q8_0)
+            conversations: Array of message arrays — each is the `messages` of one chat
+            tools: Optional tool definitions shared by every conversation
+            system: Optional system prompt shared by every conversation
+            max_tokens: Maximum tokens to generate per conversation
+            temperature: Sampling temperature
+            thinking: Enable extended thinking / reasoning mode
+            concurrency: Requests in flight (default: OLLAMA_NUM_PARALLEL, else 4)
+            keep_alive: How long Ollama keeps the model loaded (default 10m)
+        """
+    await _ensure_api_running(connection)
+    base = _base_url(connection)
+    sem = asyncio.Semaphore(max(1, int(concurrency or _default_parallelism())))
+    progress.set_job_id(kwargs.get("__job_id__", ""))
+    done = 0
+
+    async def run_one(messages: list) -> dict:
+        nonlocal done
+        body = _chat_body(model, messages, tools, system, max_tokens, temperature, thinking, keep_alive)
+        async with sem:
+            try:
+                result = _chat_result(await _http_post(f"{base}/api/chat", body, timeout=300))
+            except Exception as e:
+                result = {"error": str(e)}
+        done += 1
+        try:
+            await progress.progress(done, len(conversations), f"{done}/{len(conversations)} chats")
+        except Exception:
+            pass
+        return result
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(run_one(c) for c in conversations))
+    elapsed = time.monotonic() - started
+
+    ok = [r for r in results if "error" not in r]
+    output_tokens = sum(r["usage"]["output_tokens"] or 0 for r in ok)
+    return {
+        "results": results,
         "usage": {
-            "input_tokens": resp.get("prompt_eval_count", 0),
-            "output_tokens": resp.get("eval_count", 0),
+            "input_tokens": sum(r["usage"]["input_tokens"] or 0 for r in ok),
+            "output_tokens": output_tokens,
+            "completed": len(ok),
+            "failed": len(results) - len(ok),
+            "elapsed_ms": round(elapsed * 1000),
+            "tokens_per_second": round(output_tokens / elapsed, 2) if elapsed > 0 else None,
         },
     }
 
@@ -287,7 +481,7 @@ async def _chat_via_cli(
 
 # ── Generate ──────────────────────────────────────────────────────────────────
 
-@returns({"response": "{'type': 'string'}", "usage": "{'type': 'object', 'description': 'input_tokens, output_tokens'}"})
+@returns({"response": "{'type': 'string'}", "usage": "{'type': 'object', 'description': 'input_tokens, output_tokens, time_to_first_token_ms, tokens_per_second'}"})
 @connection("api")
 @timeout(300)
 async def op_generate(
@@ -296,6 +490,7 @@ async def op_generate(
     system: str = None,
     max_tokens: int = 4096,
     temperature: float = 0,
+    keep_alive: str | int = None,
     connection: dict | None = None,
     **kwargs,
 ) -> dict:
@@ -307,6 +502,7 @@ async def op_generate(
             system: Optional system context
             max_tokens:
             temperature:
+            keep_alive: How long Ollama keeps the model loaded afterwards (e.g. 10m, -1 for forever)
         """
     await _ensure_api_running(connection)
     base = _base_url(connection)
@@ -322,14 +518,13 @@ async def op_generate(
     }
     if system:
         body["system"] = system
+    if keep_alive is not None:
+        body["keep_alive"] = _keep_alive(keep_alive)
 
     resp = await _http_post(f"{base}/api/generate", body, timeout=300)
     return {
         "response": resp.get("response", ""),
-        "usage": {
-            "input_tokens": resp.get("prompt_eval_count", 0),
-            "output_tokens": resp.get("eval_count", 0),
-        },
+        "usage": _usage(resp),
     }
 
 
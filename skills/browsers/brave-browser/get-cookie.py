@@ -19,11 +19,28 @@ Chromium cookie encryption (v10):
   3. Cookie values AES-128-CBC encrypted, IV = 16 space bytes (0x20)
   4. First 3 bytes are "v10" prefix, first 32 bytes of decrypted output are
      garbled (CBC IV mismatch artifact), real value starts at byte 32
+
+Every v10 value shares one key and IV, so a lookup decrypts all rows in a
+single crypto.aes_decrypt call over the concatenated ciphertexts (see
+_decrypt_batch). The derived key is cached for the life of the process,
+and decrypted values are cached per cookie version.
+
+The Cookies DB is read from a snapshot copy (Brave holds a lock on the
+live file). Snapshots are reused until the DB or its WAL/journal changes
+(or SNAPSHOT_MAX_AGE passes), are readable only by the user, and record
+their reversed host_keys so a domain lookup is an IN over exact hosts.
 """
 
+import asyncio
+import bisect
+import hashlib
+import json
 import os
 import shutil
+import sys
 import tempfile
+import time
+from pathlib import Path
 
 from agentos import crypto, sql, returns, provides, timeout, cookie_auth
 from agentos.macos import keychain
@@ -45,6 +62,93 @@ async def _derive_key(password: str) -> str:
     return await crypto.pbkdf2(password=password, salt="saltysalt", iterations=1003, length=16)
 
 
+# PBKDF2 output for the Keychain password, derived once per process
+_key_hex: str | None = None
+
+# (profile, host_key, name, creation_utc, ciphertext digest) → plaintext.
+# Chromium keeps creation_utc when a cookie is overwritten, so the digest
+# is what tells versions of the same cookie apart.
+_decrypted: dict[tuple, str] = {}
+_DECRYPTED_MAX = 20_000
+
+_IV_HEX = "20" * 16
+
+
+async def _get_key() -> str:
+    global _key_hex
+    if _key_hex is None:
+        _key_hex = await _derive_key(await _get_master_key())
+    return _key_hex
+
+
+def _unpad(block: bytes) -> bytes | None:
+    """Strip PKCS#7 padding, or None if the padding is invalid."""
+    n = block[-1] if block else 0
+    if not 1 <= n <= 16 or block[-n:] != bytes([n]) * n:
+        return None
+    return block[:-n]
+
+
+async def _decrypt_batch(encrypted_hexes: list[str], key_hex: str) -> list[str | None]:
+    """Decrypt many Chromium cookie values with one AES call.
+
+    All v10 values use the same key and IV, so their ciphertexts are
+    concatenated and decrypted as one CBC stream. Chaining only garbles the
+    first block of each value, which falls inside the 32 bytes that are
+    discarded anyway. Padding of every value but the last (which the engine
+    strips) is removed here. Anything that doesn't fit — odd lengths, bad
+    padding, a failed batch call — is decrypted on its own.
+    """
+    results: list[str | None] = [None] * len(encrypted_hexes)
+    batch, single = [], []
+    for i, encrypted_hex in enumerate(encrypted_hexes):
+        raw = bytes.fromhex(encrypted_hex)
+        if len(raw) < 4:
+            continue
+        if raw[:3] != b"v10":
+            try:
+                results[i] = raw.decode("utf-8")
+            except Exception:
+                pass
+            continue
+        ciphertext = raw[3:]
+        if ciphertext and len(ciphertext) % 16 == 0:
+            batch.append((i, ciphertext))
+        elif ciphertext:
+            single.append(i)
+
+    if batch:
+        total = sum(len(c) for _, c in batch)
+        try:
+            data = b"".join(c for _, c in batch).hex()
+            out = bytes.fromhex(await crypto.aes_decrypt(key=key_hex, data=data, iv=_IV_HEX))
+        except Exception:
+            out = None
+        if out is None or not total - 16 <= len(out) <= total:
+            single += [i for i, _ in batch]
+        else:
+            pos = 0
+            for j, (i, ciphertext) in enumerate(batch):
+                segment = out[pos:pos + len(ciphertext)]
+                pos += len(ciphertext)
+                if j < len(batch) - 1 or len(out) == total:
+                    segment = _unpad(segment)
+                try:
+                    results[i] = segment[32:].decode("utf-8") if segment is not None else None
+                except UnicodeDecodeError:
+                    results[i] = None
+                if results[i] is None:
+                    single.append(i)
+
+    if single:
+        values = await asyncio.gather(
+            *(_decrypt_cookie_value(encrypted_hexes[i], key_hex) for i in single)
+        )
+        for i, value in zip(single, values):
+            results[i] = value
+    return results
+
+
 async def _decrypt_cookie_value(encrypted_hex: str, key_hex: str) -> str | None:
     """Decrypt a Chromium v10 cookie value.
 
@@ -83,6 +187,167 @@ async def _decrypt_cookie_value(encrypted_hex: str, key_hex: str) -> str | None:
         return None
 
 
+SNAPSHOT_ROOT = Path.home() / ".agentos" / "cache" / "brave-browser" / "snapshots"
+# Superseded snapshots are deleted this long after being superseded, leaving
+# time for readers in other processes to finish with them.
+SNAPSHOT_GRACE = 60
+# An unfinished .build- directory this old was abandoned by a dead process.
+SNAPSHOT_BUILD_STALE = 600
+# Snapshots hold a copy of every cookie (encrypted values, hosts, expiry), so
+# even an unchanged one is replaced by the first lookup after this long.
+SNAPSHOT_MAX_AGE = 3600
+
+_snapshot_builds: dict[str, asyncio.Future] = {}
+
+
+def _source_sig(cookies_db: str) -> list:
+    sig = []
+    for suffix in ("", "-journal", "-wal"):
+        try:
+            st = os.stat(cookies_db + suffix)
+            sig.append([suffix, st.st_mtime_ns, st.st_size])
+        except OSError:
+            sig.append([suffix, None, None])
+    return sig
+
+
+def _reverse_bounds(domain: str) -> tuple[str, str]:
+    """Range of reversed host_keys ending in `domain` ("uber.com" → moc.rebu…)."""
+    lo = domain[::-1]
+    return lo, lo[:-1] + chr(ord(lo[-1]) + 1)
+
+
+async def _host_index(db: str) -> list | None:
+    """Sorted [reversed host, host_key] pairs for a snapshot — read-only SQL."""
+    try:
+        rows = await sql.query("SELECT DISTINCT host_key FROM cookies", db=db)
+    except Exception as e:
+        print(f"Warning: Brave cookie host index unavailable ({e}); using LIKE", file=sys.stderr)
+        return None
+    return sorted([row["host_key"].lower()[::-1], row["host_key"]] for row in rows if row.get("host_key"))
+
+
+def _private_copy(src: str, dst: str) -> None:
+    shutil.copyfile(src, dst)
+    os.chmod(dst, 0o600)
+
+
+async def _build_snapshot(cookies_db: str, profile_dir: Path, final: Path) -> tuple[str, list | None]:
+    profile_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+    os.chmod(profile_dir, 0o700)
+    tmp_dir = tempfile.mkdtemp(dir=profile_dir, prefix=".build-")  # created 0700
+    try:
+        # Copy journal/WAL files too so SQLite can replay uncommitted writes
+        tmp_db = os.path.join(tmp_dir, "Cookies")
+        _private_copy(cookies_db, tmp_db)
+        for suffix in ("-journal", "-wal", "-shm"):
+            aux = cookies_db + suffix
+            if os.path.exists(aux):
+                _private_copy(aux, tmp_db + suffix)
+        hosts = await _host_index(tmp_db)
+        ready = os.path.join(tmp_dir, "ready.json")
+        with open(os.open(ready, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            json.dump({"hosts": hosts}, f)
+        try:
+            os.rename(tmp_dir, final)
+        except OSError:
+            # Another process published the same snapshot first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    _prune_snapshots(profile_dir, keep=final)
+    return _ready_snapshot(final)
+
+
+def _prune_snapshots(profile_dir: Path, keep: Path | None = None) -> None:
+    """Retire superseded snapshots, deleting them SNAPSHOT_GRACE after they were superseded.
+
+    The first prune after a snapshot is replaced drops a `superseded` marker
+    in it; the grace period runs from that marker, not from when the
+    snapshot was built, so a reader that just picked it up has time to
+    finish. Abandoned `.build-` directories go once they're stale.
+    """
+    now = time.time()
+    try:
+        others = list(profile_dir.iterdir())
+    except OSError:
+        return
+    for other in others:
+        if other == keep:
+            continue
+        try:
+            if other.name.startswith(".build-"):
+                expired = now - other.stat().st_mtime > SNAPSHOT_BUILD_STALE
+            else:
+                marker = other / "superseded"
+                if not marker.exists():
+                    marker.touch()
+                    continue
+                expired = now - marker.stat().st_mtime > SNAPSHOT_GRACE
+            if expired:
+                _ready_hosts.pop(str(other), None)
+                shutil.rmtree(other, ignore_errors=True)
+        except OSError:
+            pass
+
+
+# Parsed ready.json host lists, keyed by snapshot directory
+_ready_hosts: dict[str, list | None] = {}
+
+
+def _ready_snapshot(final: Path) -> tuple[str, list | None] | None:
+    key = str(final)
+    if not (final / "Cookies").exists():
+        _ready_hosts.pop(key, None)
+        return None
+    if key not in _ready_hosts:
+        try:
+            meta = json.loads((final / "ready.json").read_text())
+        except (OSError, ValueError):
+            return None
+        _ready_hosts[key] = meta.get("hosts")
+    return str(final / "Cookies"), _ready_hosts[key]
+
+
+def _matching_hosts(hosts: list, domain: str) -> list[str]:
+    """host_keys whose reversed form starts with the reversed domain."""
+    lo, hi = _reverse_bounds(domain)
+    start = bisect.bisect_left(hosts, [lo])
+    end = bisect.bisect_left(hosts, [hi])
+    return [host for _, host in hosts[start:end]]
+
+
+async def _snapshot(cookies_db: str, profile: str) -> tuple[str, list | None]:
+    """Path to a current snapshot of the Cookies DB, and its host index (or None).
+
+    Snapshots are named by the source DB/WAL/journal mtimes and sizes, so an
+    unchanged database is copied at most once per SNAPSHOT_MAX_AGE.
+    Concurrent calls in this process share one build.
+    """
+    # The age bucket rolls the name over every SNAPSHOT_MAX_AGE; the previous
+    # snapshot is then pruned like any superseded one.
+    bucket = int(time.time() // SNAPSHOT_MAX_AGE)
+    digest = hashlib.sha256(json.dumps([_source_sig(cookies_db), bucket]).encode()).hexdigest()[:16]
+    profile_dir = SNAPSHOT_ROOT / hashlib.sha256(profile.encode()).hexdigest()[:12]
+    final = profile_dir / digest
+    ready = _ready_snapshot(final)
+    if ready:
+        return ready
+
+    key = str(final)
+    build = _snapshot_builds.get(key)
+    if build is None:
+        build = asyncio.ensure_future(_build_snapshot(cookies_db, profile_dir, final))
+        _snapshot_builds[key] = build
+        build.add_done_callback(lambda _: _snapshot_builds.pop(key, None))
+    ready = await asyncio.shield(build)
+    if not ready:
+        raise RuntimeError(f"Could not snapshot Brave Cookies database: {cookies_db}")
+    return ready
+
+
 async def _get_cookies(domain: str, names: list[str] | None = None,
                 host: str | None = None, profile: str = "Default") -> list[dict]:
     """Extract and decrypt cookies for a domain from Brave's cookie DB."""
@@ -92,88 +357,92 @@ async def _get_cookies(domain: str, names: list[str] | None = None,
     if not os.path.exists(cookies_db):
         raise FileNotFoundError(f"Brave Cookies database not found: {cookies_db}")
 
-    password = await _get_master_key()
-    key_hex = await _derive_key(password)
-
-    # Copy to temp to avoid lock conflicts with running Brave.
-    # Also copy journal/WAL files so SQLite can replay uncommitted writes.
-    tmp_dir = tempfile.mkdtemp()
-    tmp_db = os.path.join(tmp_dir, "Cookies")
-    shutil.copy2(cookies_db, tmp_db)
-    for suffix in ("-journal", "-wal", "-shm"):
-        aux = cookies_db + suffix
-        if os.path.exists(aux):
-            shutil.copy2(aux, tmp_db + suffix)
+    key_hex = await _get_key()
+
+    snapshot_db, hosts = await _snapshot(cookies_db, profile)
+
+    # Always query by domain (broad TLD match) to get all cookies.
+    # If host is specified, post-filter by RFC 6265 domain-matching.
+    # With the host index, "uber.com" becomes the exact host_keys ending in
+    # uber.com (an indexed IN); without it, a LIKE scan.
+    bare = domain.lstrip(".").lower()
+    if hosts is not None and "." in bare:
+        matched = _matching_hosts(hosts, bare)
+        if not matched:
+            return []
+        match = f"host_key IN ({','.join(f':host{i}' for i in range(len(matched)))})"
+        params = {f"host{i}": h for i, h in enumerate(matched)}
+    else:
+        match = "host_key LIKE :match"
+        params = {"match": f"%{domain}%"}
+
+    name_filter = ""
+    if names:
+        placeholders = ",".join(f":name{i}" for i in range(len(names)))
+        name_filter = f"AND name IN ({placeholders})"
+        for i, n in enumerate(names):
+            params[f"name{i}"] = n
+    query = f"""
+        SELECT name, host_key, path, hex(encrypted_value) AS encrypted_hex,
+               is_secure, is_httponly, expires_utc, creation_utc
+        FROM cookies
+        WHERE {match}
+          {name_filter}
+        ORDER BY name
+    """
 
-    try:
-        # Always query by domain (broad TLD match) to get all cookies.
-        # If host is specified, post-filter by RFC 6265 domain-matching.
-        if names:
-            placeholders = ",".join(f":name{i}" for i in range(len(names)))
-            query = f"""
-                SELECT name, host_key, path, hex(encrypted_value) AS encrypted_hex,
-                       is_secure, is_httponly, expires_utc, creation_utc
-                FROM cookies
-                WHERE host_key LIKE :match
-                  AND name IN ({placeholders})
-                ORDER BY name
-            """
-            params = {"match": f"%{domain}%"}
-            for i, n in enumerate(names):
-                params[f"name{i}"] = n
+    rows = await sql.query(query, db=snapshot_db, params=params)
+
+    rows = [row for row in rows if row.get("encrypted_hex")]
+    cache_keys = [
+        (profile, row["host_key"], row["name"], row.get("creation_utc"),
+         hashlib.blake2b(row["encrypted_hex"].encode(), digest_size=16).digest())
+        for row in rows
+    ]
+    misses = [i for i, k in enumerate(cache_keys) if k not in _decrypted]
+    if misses:
+        values = await _decrypt_batch([rows[i]["encrypted_hex"] for i in misses], key_hex)
+        if len(_decrypted) + len(misses) > _DECRYPTED_MAX:
+            _decrypted.clear()
+        for i, value in zip(misses, values):
+            if value is not None:
+                _decrypted[cache_keys[i]] = value
+
+    cookies = []
+    for row, cache_key in zip(rows, cache_keys):
+        value = _decrypted.get(cache_key)
+        if value is None:
+            continue
+
+        expires_utc = row.get("expires_utc", 0) or 0
+        if expires_utc > 0:
+            expires_unix = (expires_utc / 1000000) - 11644473600
         else:
-            query = """
-                SELECT name, host_key, path, hex(encrypted_value) AS encrypted_hex,
-                       is_secure, is_httponly, expires_utc, creation_utc
-                FROM cookies
-                WHERE host_key LIKE :match
-                ORDER BY name
-            """
-            params = {"match": f"%{domain}%"}
-
-        rows = await sql.query(query, db=tmp_db, params=params)
-
-        cookies = []
-        for row in rows:
-            encrypted_hex = row.get("encrypted_hex", "")
-            if not encrypted_hex:
-                continue
-
-            value = await _decrypt_cookie_value(encrypted_hex, key_hex)
-            if value is None:
-                continue
-
-            expires_utc = row.get("expires_utc", 0) or 0
-            if expires_utc > 0:
-                expires_unix = (expires_utc / 1000000) - 11644473600
-            else:
-                expires_unix = -1
+            expires_unix = -1
 
-            creation_utc = row.get("creation_utc", 0) or 0
-            if creation_utc > 0:
-                created_unix = (creation_utc / 1000000) - 11644473600
-            else:
-                created_unix = -1
-
-            cookies.append({
-                "name": row["name"],
-                "value": value,
-                "domain": row["host_key"],
-                "path": row["path"],
-                "httpOnly": bool(row.get("is_httponly")),
-                "secure": bool(row.get("is_secure")),
-                "expires": expires_unix,
-                "created": created_unix,
-            })
-
-        # RFC 6265 domain-matching: filter cookies to only those that should
-        # be sent to the target host. Drops sibling subdomain cookies.
-        if host:
-            cookies = [c for c in cookies if _domain_matches(c["domain"], host)]
-
-        return cookies
-    finally:
-        shutil.rmtree(tmp_dir, ignore_errors=True)
+        creation_utc = row.get("creation_utc", 0) or 0
+        if creation_utc > 0:
+            created_unix = (creation_utc / 1000000) - 11644473600
+        else:
+            created_unix = -1
+
+        cookies.append({
+            "name": row["name"],
+            "value": value,
+            "domain": row["host_key"],
+            "path": row["path"],
+            "httpOnly": bool(row.get("is_httponly")),
+            "secure": bool(row.get("is_secure")),
+            "expires": expires_unix,
+            "created": created_unix,
+        })
+
+    # RFC 6265 domain-matching: filter cookies to only those that should
+    # be sent to the target host. Drops sibling subdomain cookies.
+    if host:
+        cookies = [c for c in cookies if _domain_matches(c["domain"], host)]
+
+    return cookies
 
 
 def _domain_matches(cookie_domain: str, request_host: str) -> bool:
@@ -9,8 +9,6 @@ import json
 import re
 import time
 from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
 
 from agentos import http, connection, provides, returns, timeout, web_read
 
@@ -451,6 +449,9 @@ def _extract_participants(mapped_emails):
 def _build_raw(to, subject, body_text, html_body=None, cc=None, bcc=None,
                in_reply_to=None, references=None, thread_id=None):
     """Build a base64url-encoded RFC 2822 message for the Gmail API 'raw' field."""
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
     if html_body:
         msg = MIMEMultipart("alternative")
         msg.attach(MIMEText(body_text or "", "plain", "utf-8"))
@@ -21,6 +21,7 @@ GLOBAL_STATE_DB = os.path.expanduser(
     "~/Library/Application Support/Cursor/User/globalStorage/state.vscdb"
 )
 AGENTOS_HOME = os.path.expanduser("~/.agentos")
+INDEX_PATH = os.path.join(AGENTOS_HOME, "cache", "cursor", "index.json")
 
 MCP_CONFIG_PATHS = {
     "cursor": os.path.expanduser("~/.cursor/mcp.json"),
@@ -34,17 +35,168 @@ _MIN_SEARCHES = 3
 _MIN_CHARS = 3000
 _MIN_STEPS = 5
 
+# Bump when the on-disk index layout changes — older files are discarded.
+_INDEX_VERSION = 1
+
+
+# ── Index — workspace map, composer metadata, transcript paths ────────────────
+#
+# Every session op used to re-read each workspace.json and open each
+# workspace state.vscdb. The index keeps what those reads produced, keyed by
+# the (mtime, size) signature of the files they came from, and only re-reads
+# entries whose signature moved. Persisted under ~/.agentos/cache so separate
+# engine processes share it.
+
+_index = None
+
+
+def _file_sig(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _db_sig(db_path):
+    # SQLite writes land in the WAL first, so the main file alone can look stale.
+    return [_file_sig(db_path), _file_sig(db_path + "-wal")]
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        try:
+            with open(INDEX_PATH) as f:
+                data = json.load(f)
+            if data.get("version") != _INDEX_VERSION:
+                raise ValueError("stale index")
+        except (OSError, ValueError):
+            data = {"version": _INDEX_VERSION, "workspaces": {}, "transcripts": {}}
+        _index = data
+    return _index
+
+
+def _save_index(index):
+    try:
+        _write_json_atomic(INDEX_PATH, index)
+    except OSError:
+        pass  # The index is an optimization — never fail an op over it
+
+
+def _read_workspace_json(ws_json):
+    try:
+        with open(ws_json) as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+    return {k: data[k] for k in ("folder", "workspace") if k in data}
+
+
+async def _workspace_index():
+    """Workspace hash → {"info", "db", "composers"}, refreshed per file by mtime."""
+    index = _load_index()
+    cached = index["workspaces"]
+    fresh = {}
+    dirty = False
+
+    entries = os.listdir(WORKSPACE_STORAGE) if os.path.isdir(WORKSPACE_STORAGE) else []
+    for ws_hash in entries:
+        ws_dir = os.path.join(WORKSPACE_STORAGE, ws_hash)
+        ws_json = os.path.join(ws_dir, "workspace.json")
+        state_db = os.path.join(ws_dir, "state.vscdb")
+
+        json_sig = _file_sig(ws_json)
+        if json_sig is None:
+            continue
+        db_sig = _db_sig(state_db)
+
+        entry = cached.get(ws_hash)
+        if entry and entry["json_sig"] == json_sig and entry["db_sig"] == db_sig:
+            fresh[ws_hash] = entry
+            continue
+
+        dirty = True
+        if entry and entry["json_sig"] == json_sig:
+            info = entry["info"]
+        else:
+            info = _read_workspace_json(ws_json)
+        composers = await _read_composer_metadata(state_db) if db_sig[0] else []
+        fresh[ws_hash] = {
+            "json_sig": json_sig,
+            # A failed read (e.g. locked DB) gets no signature, so it's retried next call
+            "db_sig": db_sig if composers is not None else None,
+            "info": info,
+            "db": state_db if db_sig[0] else None,
+            "composers": composers or [],
+        }
+
+    if dirty or fresh.keys() != cached.keys():
+        index["workspaces"] = fresh
+        _save_index(index)
+    return fresh
+
+
+def _transcript_paths():
+    """Top-level transcript paths, re-listing only directories whose mtime moved."""
+    index = _load_index()
+    cached = index["transcripts"]
+    fresh = {}
+    dirty = False
+
+    projects = os.listdir(CURSOR_PROJECTS) if os.path.isdir(CURSOR_PROJECTS) else []
+    for project in projects:
+        root = os.path.join(CURSOR_PROJECTS, project, "agent-transcripts")
+        root_sig = _file_sig(root)
+        if root_sig is None:
+            continue
+
+        entry = cached.get(root) or {"sig": None, "sessions": {}}
+        if entry["sig"] == root_sig:
+            names = list(entry["sessions"])
+        else:
+            dirty = True
+            names = [n for n in os.listdir(root) if os.path.isdir(os.path.join(root, n))]
+
+        sessions = {}
+        for name in names:
+            session_dir = os.path.join(root, name)
+            dir_sig = _file_sig(session_dir)
+            if dir_sig is None:
+                dirty = True
+                continue
+            known = entry["sessions"].get(name)
+            if known and known["sig"] == dir_sig:
+                sessions[name] = known
+                continue
+            dirty = True
+            paths = sorted(glob.glob(os.path.join(session_dir, "*.jsonl")))
+            sessions[name] = {"sig": dir_sig, "paths": paths}
+        fresh[root] = {"sig": root_sig, "sessions": sessions}
+
+    if dirty or fresh.keys() != cached.keys():
+        index["transcripts"] = fresh
+        _save_index(index)
+    return [
+        path
+        for entry in fresh.values()
+        for session in entry["sessions"].values()
+        for path in session["paths"]
+    ]
+
 
 # ── Sessions — JSONL transcript source ────────────────────────────────────────
 
 
 def _find_transcripts():
-    pattern = os.path.join(CURSOR_PROJECTS, "*", "agent-transcripts", "*", "*.jsonl")
     results = []
-    for path in glob.glob(pattern):
+    for path in _transcript_paths():
         if "subagents" in path:
             continue
-        mtime = os.path.getmtime(path)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            continue
         results.append((mtime, path))
     results.sort(key=lambda x: x[0], reverse=True)
     return results
@@ -142,6 +294,7 @@ def _workspace_path_to_slug(path):
 
 
 async def _read_composer_metadata(db_path):
+    """Composer list from a workspace state DB; None if the DB couldn't be read."""
     try:
         rows = await sql.query(
             "SELECT value FROM ItemTable WHERE key = 'composer.composerData'",
@@ -151,35 +304,17 @@ async def _read_composer_metadata(db_path):
             return []
         return json.loads(rows[0]["value"]).get("allComposers", [])
     except (json.JSONDecodeError, Exception):
-        return []
+        return None
 
 
 async def _discover_workspaces():
     workspaces = {}
-    if not os.path.isdir(WORKSPACE_STORAGE):
-        return workspaces
-
-    for entry in os.listdir(WORKSPACE_STORAGE):
-        ws_dir = os.path.join(WORKSPACE_STORAGE, entry)
-        ws_json = os.path.join(ws_dir, "workspace.json")
-        state_db = os.path.join(ws_dir, "state.vscdb")
-
-        if not os.path.isfile(ws_json) or not os.path.isfile(state_db):
-            continue
-
-        try:
-            with open(ws_json) as f:
-                folder = json.load(f).get("folder", "")
-            if not folder:
-                continue
-            workspace_path = folder.replace("file://", "")
-        except (json.JSONDecodeError, IOError):
+    for entry in (await _workspace_index()).values():
+        folder = (entry["info"] or {}).get("folder", "")
+        if not folder or not entry["db"] or not entry["composers"]:
             continue
-
-        composers = await _read_composer_metadata(state_db)
-        if composers:
-            workspaces[workspace_path] = {"db": state_db, "composers": composers}
-
+        workspace_path = folder.replace("file://", "")
+        workspaces[workspace_path] = {"db": entry["db"], "composers": entry["composers"]}
     return workspaces
 
 
@@ -395,48 +530,26 @@ def _parse_task_blob(blob_value):
     }
 
 
-def _build_workspace_map():
-    ws_map = {}
-    if not os.path.isdir(WORKSPACE_STORAGE):
-        return ws_map
-    for d in os.listdir(WORKSPACE_STORAGE):
-        wj = os.path.join(WORKSPACE_STORAGE, d, "workspace.json")
-        if os.path.exists(wj):
-            try:
-                with open(wj) as f:
-                    data = json.load(f)
-                folder = data.get("folder", data.get("workspace", ""))
-                if folder.startswith("file:///"):
-                    folder = http.decode(folder[7:])
-                ws_map[d] = folder
-            except (json.JSONDecodeError, IOError):
-                pass
-    return ws_map
+def _workspace_folder(info):
+    folder = info.get("folder", info.get("workspace", ""))
+    if folder.startswith("file:///"):
+        folder = http.decode(folder[7:])
+    return folder
 
 
 async def _build_conversation_index():
-    ws_map = _build_workspace_map()
     convos = {}
-    for ws_hash, folder in ws_map.items():
-        db_path = os.path.join(WORKSPACE_STORAGE, ws_hash, "state.vscdb")
-        if not os.path.exists(db_path):
+    for entry in (await _workspace_index()).values():
+        if entry["info"] is None:
             continue
-        try:
-            rows = await _sql_query(
-                "SELECT value FROM ItemTable WHERE key = 'composer.composerData'",
-                db_path,
-            )
-            if not rows:
-                continue
-            for c in json.loads(rows[0]["value"]).get("allComposers", []):
-                cid = c.get("composerId", "")
-                convos[cid] = {
-                    "name": c.get("name", ""),
-                    "workspace": folder,
-                    "createdAt": c.get("createdAt", 0),
-                }
-        except (json.JSONDecodeError, Exception):
-            pass
+        folder = _workspace_folder(entry["info"])
+        for c in entry["composers"]:
+            cid = c.get("composerId", "")
+            convos[cid] = {
+                "name": c.get("name", ""),
+                "workspace": folder,
+                "createdAt": c.get("createdAt", 0),
+            }
     return convos
 
 
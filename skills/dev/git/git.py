@@ -1,92 +1,292 @@
 """Git skill — Python implementation replacing command: operations."""
 
+import bisect
+import hashlib
 import json
+import os
 import re
-from agentos import shell, returns
+import sys
+import tempfile
+import time
+from pathlib import Path
 
+from agentos import shell, returns, timeout
 
-async def _git(*args, cwd=None):
+
+# Per-repo commit index — one JSON file per worktree root, holding every
+# commit reachable from HEAD, newest first.
+INDEX_DIR = Path.home() / ".agentos" / "cache" / "git"
+_INDEX_VERSION = 1
+INDEX_BATCH = 1000  # commits read per `git log --no-walk` call
+INDEX_BUDGET = 20  # seconds of ingestion per op call; the rest resumes next call
+INDEX_STEP_TIMEOUT = 30
+INDEX_RETRY_AFTER = 3600  # a failed build isn't retried for the same HEAD before this
+
+# Loaded indexes keyed by file path: (file signature, index, sorted shas)
+_loaded = {}
+
+# Queries without regex metacharacters are matched as plain substrings, which
+# is exactly what git's --grep/--author do for them. Anything else goes to git.
+_LITERAL_RE = re.compile(r"[^.\[\]*+?^$(){}|\\]*")
+
+async def _git(*args, cwd=None, timeout=30):
     """Run a git command and return stdout. Raises on timeout or nonzero exit."""
-    result = await shell.run("git", list(args), cwd=cwd, timeout=30)
+    result = await shell.run("git", list(args), cwd=cwd, timeout=timeout)
     if result["exit_code"] != 0:
         raise RuntimeError(result["stderr"].strip() or f"git exited {result['exit_code']}")
     return result["stdout"]
 
 
-def _parse_shortstat(text):
-    """Parse a --shortstat line into (files_changed, insertions, deletions)."""
-    files = ins = dels = 0
-    m = re.search(r"(\d+) files? changed", text)
-    if m:
-        files = int(m.group(1))
-    m = re.search(r"(\d+) insertions?\(\+\)", text)
-    if m:
-        ins = int(m.group(1))
-    m = re.search(r"(\d+) deletions?\(-\)", text)
-    if m:
-        dels = int(m.group(1))
-    return files, ins, dels
+# Record separator, then unit-separated fields. %B is last so its newlines
+# can't shift the other fields; --shortstat lands after the final separator.
+_LOG_FORMAT = "%x1e%H%x1f%h%x1f%an%x1f%ae%x1f%cn%x1f%ce%x1f%aI%x1f%s%x1f%B%x1f"
 
+_SHORTSTAT_RE = re.compile(
+    r"(\d+) files? changed(?:, (\d+) insertions?\(\+\))?(?:, (\d+) deletions?\(-\))?"
+)
 
-_COMMIT_FORMAT = "%H%n%h%n%an%n%ae%n%cn%n%ce%n%aI%n%s"
 
+def _parse_log(raw):
+    """Parse `git log/show --pretty=format:_LOG_FORMAT --shortstat` into index rows."""
+    rows = []
+    for record in raw.split("\x1e"):
+        fields = record.split("\x1f")
+        if len(fields) < 10:
+            continue
+        m = _SHORTSTAT_RE.search(fields[9])
+        files, ins, dels = (int(g or 0) for g in m.groups()) if m else (0, 0, 0)
+        rows.append({
+            "sha": fields[0].strip(),
+            "short_hash": fields[1],
+            "author": fields[2],
+            "author_email": fields[3],
+            "committer": fields[4],
+            "committer_email": fields[5],
+            "published": fields[6],
+            "subject": fields[7],
+            "body": fields[8].strip(),
+            "files_changed": files,
+            "additions": ins,
+            "deletions": dels,
+        })
+    return rows
 
-def _parse_commit_block(block):
-    """Parse an 8-line commit block (from _COMMIT_FORMAT) into a shape-native dict."""
-    lines = block.strip().split("\n")
-    if len(lines) < 8:
-        return None
-    sha = lines[0]
-    author_name = lines[2]
-    author_email = lines[3]
-    committer_name = lines[4]
-    committer_email = lines[5]
+
+def _row_to_commit(row):
+    """Shape an index row (or freshly parsed log row) as a git_commit."""
     return {
-        "id": sha,
-        "sha": sha,
-        "shortHash": lines[1],
-        "name": lines[7],
-        "content": lines[7],
-        "published": lines[6],
-        "author": author_name,
+        "id": row["sha"],
+        "sha": row["sha"],
+        "shortHash": row["short_hash"],
+        "name": row["subject"],
+        "content": row["subject"],
+        "published": row["published"],
+        "author": row["author"],
         "committer": {
             "account": {
-                "name": committer_name,
-                "handle": committer_email,
+                "name": row["committer"],
+                "handle": row["committer_email"],
                 "platform": "email",
             }
         },
+        "files_changed": row["files_changed"],
+        "additions": row["additions"],
+        "deletions": row["deletions"],
     }
 
 
-def _commits_with_stats(raw):
-    """Parse git log output that interleaves commit blocks and shortstat lines."""
-    # Split on the COMMIT_SEP marker we injected
-    chunks = raw.split("COMMIT_SEP\n")
-    results = []
-    for chunk in chunks:
-        chunk = chunk.strip()
-        if not chunk:
-            continue
-        # The commit fields come first (8 lines), then optionally a blank line
-        # and a shortstat line
-        parts = chunk.split("\n")
-        if len(parts) < 8:
-            continue
-        commit = _parse_commit_block("\n".join(parts[:8]))
-        if not commit:
-            continue
-        # Look for shortstat in remaining lines
-        files = ins = dels = 0
-        for line in parts[8:]:
-            if re.search(r"\d+ files? changed", line):
-                files, ins, dels = _parse_shortstat(line)
-                break
-        commit["files_changed"] = files
-        commit["additions"] = ins
-        commit["deletions"] = dels
-        results.append(commit)
-    return results
+# ---------------------------------------------------------------------------
+# Commit index
+# ---------------------------------------------------------------------------
+
+
+def _find_git_dirs(path):
+    """Return (toplevel, git_dir, common_dir) for a worktree path, or None."""
+    start = Path(path).expanduser().resolve()
+    for d in (start, *start.parents):
+        dotgit = d / ".git"
+        if dotgit.is_dir():
+            return d, dotgit, dotgit
+        if dotgit.is_file():
+            text = dotgit.read_text().strip()
+            if not text.startswith("gitdir:"):
+                return None
+            git_dir = (d / text[len("gitdir:"):].strip()).resolve()
+            commondir = git_dir / "commondir"
+            common = (git_dir / commondir.read_text().strip()).resolve() if commondir.is_file() else git_dir
+            return d, git_dir, common
+    return None
+
+
+def _read_head(path):
+    """Resolve HEAD to (toplevel, sha) by reading .git directly — no git spawn.
+
+    Returns None for layouts this doesn't understand; callers fall back to git.
+    """
+    try:
+        dirs = _find_git_dirs(path)
+        if not dirs:
+            return None
+        toplevel, git_dir, common = dirs
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            return str(toplevel), head
+        ref = head[len("ref: "):]
+        for base in (git_dir, common):
+            ref_file = base / ref
+            if ref_file.is_file():
+                return str(toplevel), ref_file.read_text().strip()
+        packed = common / "packed-refs"
+        if packed.is_file():
+            for line in packed.read_text().splitlines():
+                parts = line.split(" ", 1)
+                if len(parts) == 2 and parts[1] == ref:
+                    return str(toplevel), parts[0]
+    except OSError:
+        pass
+    return None
+
+
+def _index_path(toplevel):
+    return INDEX_DIR / (hashlib.sha256(toplevel.encode()).hexdigest()[:16] + ".json")
+
+
+def _load_index(path):
+    """Return (index, sorted shas) for an index file, reusing the parsed copy."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None, None
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _loaded.get(str(path))
+    if cached and cached[0] == sig:
+        return cached[1], cached[2]
+    try:
+        with open(path) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    if index.get("version") != _INDEX_VERSION:
+        return None, None
+    shas = sorted(c["sha"] for c in index["commits"])
+    _loaded[str(path)] = (sig, index, shas)
+    return index, shas
+
+
+def _save_index(path, index):
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=INDEX_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+async def _is_ancestor(toplevel, old, new):
+    result = await shell.run("git", ["merge-base", "--is-ancestor", old, new], cwd=toplevel, timeout=30)
+    return result["exit_code"] == 0
+
+
+async def _plan_build(toplevel, index, new_head):
+    """Start a build towards new_head: the full sha order plus every row already known.
+
+    A fast-forward lists only old..new; anything else lists all of new_head.
+    Rows from the current index (and from an abandoned build) are reused by
+    sha, so a branch switch or rebase only ingests commits not seen before.
+    """
+    reuse = {c["sha"]: c for c in index["commits"]} if index else {}
+    if index and index.get("build"):
+        reuse.update(index["build"]["rows"])
+    old_head = index["head"] if index else None
+    if old_head and await _is_ancestor(toplevel, old_head, new_head):
+        new = (await _git("rev-list", f"{old_head}..{new_head}", cwd=toplevel, timeout=INDEX_STEP_TIMEOUT)).split()
+        order = new + [c["sha"] for c in index["commits"]]
+    else:
+        order = (await _git("rev-list", new_head, cwd=toplevel, timeout=INDEX_STEP_TIMEOUT)).split()
+    return {"head": new_head, "order": order, "rows": {s: reuse[s] for s in order if s in reuse}}
+
+
+async def _advance_index(toplevel, index, new_head):
+    """Ingest up to INDEX_BUDGET seconds of missing commits towards new_head.
+
+    Commits are read INDEX_BATCH at a time by sha with `git log --no-walk`.
+    Returns the finished index, or the current one carrying the partial
+    "build" so the next call resumes where this one stopped.
+    """
+    build = index.get("build") if index else None
+    if not build or build["head"] != new_head:
+        build = await _plan_build(toplevel, index, new_head)
+
+    deadline = time.monotonic() + INDEX_BUDGET
+    todo = [s for s in build["order"] if s not in build["rows"]]
+    for start in range(0, len(todo), INDEX_BATCH):
+        if start and time.monotonic() >= deadline:
+            base = index or {"version": _INDEX_VERSION, "head": None, "commits": []}
+            return {**base, "build": build}
+        raw = await _git(
+            "log", "--no-walk=unsorted", f"--pretty=format:{_LOG_FORMAT}", "--shortstat",
+            *todo[start:start + INDEX_BATCH], cwd=toplevel, timeout=INDEX_STEP_TIMEOUT,
+        )
+        for row in _parse_log(raw):
+            build["rows"][row["sha"]] = row
+    rows = build["rows"]
+    return {"version": _INDEX_VERSION, "head": new_head, "commits": [rows[s] for s in build["order"]]}
+
+
+def _index_unavailable(reason):
+    print(f"Warning: git commit index unavailable ({reason}); running git directly", file=sys.stderr)
+
+
+async def _commit_index(path):
+    """Return (commits newest first, sorted shas) for an up-to-date index, or None.
+
+    HEAD is read from .git without spawning git, so an unchanged repo is
+    answered from the cached index alone. A build that doesn't finish within
+    this call's budget is saved and resumed by the next call; until then, and
+    for INDEX_RETRY_AFTER seconds after a failed build, this returns None and
+    callers run git directly as before.
+    """
+    head = _read_head(path)
+    if not head:
+        return None
+    toplevel, sha = head
+    index_file = _index_path(toplevel)
+    index, shas = _load_index(index_file)
+    if index and index["head"] == sha:
+        return index["commits"], shas
+
+    failed = (index or {}).get("failed")
+    if failed and failed["head"] == sha and time.time() - failed["at"] < INDEX_RETRY_AFTER:
+        return None
+    try:
+        index = await _advance_index(toplevel, index, sha)
+        _save_index(index_file, index)
+    except Exception as e:
+        _index_unavailable(e)
+        base = {k: v for k, v in (index or {"version": _INDEX_VERSION, "head": None, "commits": []}).items()
+                if k != "build"}
+        try:
+            _save_index(index_file, {**base, "failed": {"head": sha, "at": time.time(), "error": str(e)[:200]}})
+        except OSError:
+            pass
+        return None
+    if index.get("build"):
+        return None
+    index, shas = _load_index(index_file)
+    if not index or index["head"] != sha:
+        _index_unavailable(f"could not read back {index_file}")
+        return None
+    return index["commits"], shas
+
+
+def _is_literal(pattern):
+    return bool(_LITERAL_RE.fullmatch(pattern))
 
 
 # ---------------------------------------------------------------------------
@@ -95,8 +295,22 @@ def _commits_with_stats(raw):
 
 
 @returns("git_commit[]")
+@timeout(120)
 async def list_git_commits(path, limit=100, branch=None, author=None, **params):
     """List recent commits in a git repository. Returns commits newest first with diff stats."""
+    indexed = None if branch or (author and not _is_literal(author)) else await _commit_index(path)
+    if indexed:
+        commits, _ = indexed
+        if author:
+            # --author matches "name <email>", case-sensitively
+            commits = (c for c in commits if author in f"{c['author']} <{c['author_email']}>")
+        out = []
+        for c in commits:
+            if len(out) >= int(limit):
+                break
+            out.append(_row_to_commit(c))
+        return out
+
     args = ["log"]
     if branch:
         args.append(branch)
@@ -104,50 +318,65 @@ async def list_git_commits(path, limit=100, branch=None, author=None, **params):
         args.extend(["--author", author])
     args.extend([
         f"-{limit}",
-        f"--pretty=format:COMMIT_SEP%n{_COMMIT_FORMAT}",
+        f"--pretty=format:{_LOG_FORMAT}",
         "--shortstat",
     ])
     raw = await _git(*args, cwd=path)
-    return _commits_with_stats(raw)
+    return [_row_to_commit(r) for r in _parse_log(raw)]
 
 
 @returns("git_commit")
+@timeout(120)
 async def get_git_commit(path, id, **params):
     """Get a single commit with full details and diff stats."""
+    if re.fullmatch(r"[0-9a-fA-F]{4,40}", id):
+        indexed = await _commit_index(path)
+        if indexed:
+            commits, shas = indexed
+            prefix = id.lower()
+            i = bisect.bisect_left(shas, prefix)
+            hits = [sha for sha in shas[i:i + 2] if sha.startswith(prefix)]
+            if len(hits) == 1:
+                return _row_to_commit(next(c for c in commits if c["sha"] == hits[0]))
+
     raw = await _git(
         "show", id,
-        f"--pretty=format:{_COMMIT_FORMAT}",
+        f"--pretty=format:{_LOG_FORMAT}",
         "--shortstat",
         cwd=path,
     )
-    lines = raw.strip().split("\n")
-    commit = _parse_commit_block("\n".join(lines[:8]))
-    if not commit:
+    commits = _parse_log(raw)
+    if not commits:
         raise RuntimeError(f"Could not parse commit {id}")
-    files = ins = dels = 0
-    for line in lines[8:]:
-        if re.search(r"\d+ files? changed", line):
-            files, ins, dels = _parse_shortstat(line)
-            break
-    commit["files_changed"] = files
-    commit["additions"] = ins
-    commit["deletions"] = dels
-    return commit
+    return _row_to_commit(commits[0])
 
 
 @returns("git_commit[]")
+@timeout(120)
 async def search_git_commits(path, query, limit=100, **params):
     """Search commit messages by keyword."""
+    indexed = await _commit_index(path) if query and _is_literal(query) else None
+    if indexed:
+        # Same as --grep -i for a literal: case-insensitive match on the message
+        needle = query.lower()
+        out = []
+        for c in indexed[0]:
+            if len(out) >= int(limit):
+                break
+            if any(needle in line.lower() for line in c["body"].splitlines()):
+                out.append(_row_to_commit(c))
+        return out
+
     args = [
         "log",
         f"--grep={query}",
         "-i",
         f"-{limit}",
-        f"--pretty=format:COMMIT_SEP%n{_COMMIT_FORMAT}",
+        f"--pretty=format:{_LOG_FORMAT}",
         "--shortstat",
     ]
     raw = await _git(*args, cwd=path)
-    return _commits_with_stats(raw)
+    return [_row_to_commit(r) for r in _parse_log(raw)]
 
 
 @returns("branch[]")
@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
+import asyncio
 import base64
+import hashlib
 import json
+import os
+import posixpath
 import re
 import sys
-from agentos import shell, provides, returns, web_read
+import tempfile
+import time
+from pathlib import Path
+from agentos import http, shell, provides, returns, web_read
 
 
 def _fail(message, code=1):
@@ -25,18 +32,270 @@ async def _run_gh(args):
     return result["stdout"]
 
 
+# ---------------------------------------------------------------------------
+# In-process transport — pooled REST client authenticated with the gh token
+# ---------------------------------------------------------------------------
+
+# Spawning gh costs a process start, an auth read and a fresh TLS handshake
+# per call. When a token is available, calls go over one keep-alive client
+# instead; gh stays the fallback (and GITHUB_TRANSPORT=gh forces it).
+API_URL = "https://api.github.com"
+_TRANSPORT = os.environ.get("GITHUB_TRANSPORT", "http")
+
+_token = None  # None = not read yet, "" = unavailable
+_rejected = None  # (token, monotonic time) of the last 401
+_TOKEN_RECHECK = 300  # seconds before a rejected token is read again
+_client = None  # (loop, holder generator, client)
+_client_lock = None  # (loop, asyncio.Lock) guarding client creation
+
+
+async def _gh_token():
+    global _token
+    if _token is None:
+        _token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN") or ""
+        if not _token:
+            result = await shell.run("gh", ["auth", "token"])
+            _token = result["stdout"].strip() if result["exit_code"] == 0 else ""
+    return _token
+
+
+async def _hold_client(token):
+    """Keep one client open until closed or the event loop shuts down.
+
+    asyncio.run closes pending async generators on the way out, which exits
+    the `async with` and closes the client on its own loop.
+    """
+    extra = {"Authorization": f"Bearer {token}", "X-GitHub-Api-Version": "2022-11-28"}
+    async with http.client(**http.headers(accept="json", extra=extra)) as client:
+        yield client
+
+
+async def _api_client():
+    """The shared client for this event loop, created once under a lock.
+
+    Returns None when there is no usable token, or while the last one
+    GitHub rejected is within _TOKEN_RECHECK seconds.
+    """
+    global _client, _client_lock, _token, _rejected
+    loop = asyncio.get_running_loop()
+    if _client is not None and _client[0] is loop:
+        return _client[2]
+    if _client_lock is None or _client_lock[0] is not loop:
+        _client_lock = (loop, asyncio.Lock())
+    async with _client_lock[1]:
+        if _client is not None and _client[0] is loop:
+            return _client[2]
+        if _rejected:
+            if time.monotonic() - _rejected[1] < _TOKEN_RECHECK:
+                return None
+            _token = None  # time to look again; it may have been refreshed
+        token = await _gh_token()
+        if not token or (_rejected and token == _rejected[0]):
+            _rejected = (_rejected[0], time.monotonic()) if _rejected else None
+            return None
+        _rejected = None
+        # A client from another (finished) loop was closed with that loop
+        holder = _hold_client(token)
+        client = await holder.__anext__()
+        _client = (loop, holder, client)
+    return client
+
+
+async def _discard_client(client):
+    """Stop using `client` and close it; later calls build a fresh one."""
+    global _client
+    if _client is None or _client[2] is not client:
+        return
+    holder = _client[1]
+    _client = None
+    try:
+        await holder.aclose()
+    except Exception:
+        pass
+
+
+async def _api(method, endpoint, body=None, headers=None):
+    """Call the REST API in-process.
+
+    Returns (status, headers, data), or None when the caller should fall
+    back to gh. GETs fall back on any transport failure or a rejected
+    token. Other methods fall back only if nothing was sent (no token, no
+    client); once the request may have reached GitHub every failure is
+    reported, so a retry through gh can't create a duplicate.
+    """
+    global _token, _rejected
+    if _TRANSPORT == "gh":
+        return None
+    idempotent = method.upper() == "GET"
+    try:
+        client = await _api_client()
+    except Exception:
+        return None
+    if client is None:
+        return None
+    kwargs = {"headers": headers} if headers else {}
+    if body is not None:
+        kwargs["json"] = body
+    try:
+        resp = await getattr(client, method.lower())(f"{API_URL}/{endpoint}", **kwargs)
+    except Exception as e:
+        await _discard_client(client)
+        if idempotent:
+            return None
+        _fail(f"GitHub API {method} {endpoint} failed: {e}")
+    status = resp.get("status") or 0
+    if status in (0, 401):
+        if status == 401:
+            _rejected, _token = (_token, time.monotonic()), None
+        await _discard_client(client)
+        if idempotent:
+            return None
+        _fail(f"GitHub API {method} {endpoint} failed: HTTP {status or 'no response'}")
+    resp_headers = {k.lower(): v for k, v in (resp.get("headers") or {}).items()}
+    return status, resp_headers, resp.get("json")
+
+
+def _api_fail(status, data):
+    message = (data or {}).get("message") if isinstance(data, dict) else None
+    _fail(message or f"GitHub API returned HTTP {status}")
+
+
+async def _api_get(endpoint):
+    """GET an endpoint's JSON, in-process when possible, else via gh api."""
+    resp = await _api("GET", endpoint)
+    if resp is None:
+        return json.loads(await _run_gh(["api", endpoint]))
+    status, _, data = resp
+    if not 200 <= status < 300:
+        _api_fail(status, data)
+    return data
+
+
+# ---------------------------------------------------------------------------
+# REST listing — ETag store and Link-header pagination
+# ---------------------------------------------------------------------------
+
+# One file per endpoint: {"etag", "link", "body"}. A repeat poll sends
+# If-None-Match and a 304 (which doesn't count against the rate limit) is
+# answered from the stored body.
+ETAG_DIR = Path.home() / ".agentos" / "cache" / "github" / "etags"
+MAX_PER_PAGE = 100
+PAGE_CONCURRENCY = 8
+
+
+def _etag_path(endpoint):
+    return ETAG_DIR / (hashlib.sha256(endpoint.encode()).hexdigest()[:32] + ".json")
+
+
+def _read_etag_entry(endpoint):
+    try:
+        return json.loads(_etag_path(endpoint).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_etag_entry(endpoint, etag, link, body):
+    try:
+        ETAG_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=ETAG_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"etag": etag, "link": link, "body": body}, f)
+        os.replace(tmp, _etag_path(endpoint))
+    except OSError:
+        pass
+
+
+def _split_http_response(raw):
+    """Split `gh api -i` output into (status, headers, body)."""
+    head, sep, body = raw.partition("\r\n\r\n")
+    if not sep:
+        head, _, body = raw.partition("\n\n")
+    lines = head.splitlines()
+    m = re.match(r"HTTP/\S+\s+(\d+)", lines[0] if lines else "")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return (int(m.group(1)) if m else 0), headers, body
+
+
+async def _gh_api_cached(endpoint):
+    """GET an API endpoint, revalidating against the stored ETag.
+
+    Returns (data, headers). gh exits non-zero on a 304, so the status line
+    is checked rather than the exit code.
+    """
+    cached = _read_etag_entry(endpoint)
+    conditional = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else None
+    resp = await _api("GET", endpoint, headers=conditional)
+    if resp is not None:
+        status, headers, data = resp
+        if status == 304 and cached:
+            return cached["body"], {**headers, "link": headers.get("link") or cached.get("link")}
+        if not 200 <= status < 300:
+            _api_fail(status, data)
+        if headers.get("etag"):
+            _write_etag_entry(endpoint, headers["etag"], headers.get("link"), data)
+        return data, headers
+
+    args = ["api", "-i", endpoint]
+    if cached and cached.get("etag"):
+        args[2:2] = ["-H", f"If-None-Match: {cached['etag']}"]
+    result = await shell.run("gh", args)
+    status, headers, body = _split_http_response(result["stdout"])
+    if status == 304 and cached:
+        return cached["body"], {**headers, "link": headers.get("link") or cached.get("link")}
+    if result["exit_code"] != 0 or not 200 <= status < 300:
+        _fail(result["stderr"].strip() or body.strip() or "gh command failed", result["exit_code"] or 1)
+    data = json.loads(body) if body.strip() else None
+    if headers.get("etag"):
+        _write_etag_entry(endpoint, headers["etag"], headers.get("link"), data)
+    return data, headers
+
+
+def _last_page(link):
+    m = re.search(r'[?&]page=(\d+)[^>]*>;\s*rel="last"', link or "")
+    return int(m.group(1)) if m else 1
+
+
+async def _gh_api_list(endpoint, limit, paginate=False):
+    """Fetch up to `limit` items from a list endpoint.
+
+    With `paginate`, page 1's Link header gives the last page and the rest
+    are fetched concurrently (bounded by PAGE_CONCURRENCY). Every page goes
+    through the ETag store.
+    """
+    limit = int(limit)
+    sep = "&" if "?" in endpoint else "?"
+    per_page = min(limit, MAX_PER_PAGE) if paginate else limit
+    first, headers = await _gh_api_cached(f"{endpoint}{sep}per_page={per_page}&page=1")
+    items = list(first or [])
+    if not paginate:
+        return items
+    pages = min(_last_page(headers.get("link")), -(-limit // per_page))
+    sem = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+    async def fetch(page):
+        async with sem:
+            data, _ = await _gh_api_cached(f"{endpoint}{sep}per_page={per_page}&page={page}")
+            return data or []
+
+    for page in await asyncio.gather(*(fetch(n) for n in range(2, pages + 1))):
+        items.extend(page)
+    return items[:limit]
+
+
 @returns("task[]")
-async def list_tasks(*, repo, state="open", limit=30, **params):
+async def list_tasks(*, repo, state="open", limit=30, paginate=False, **params):
     """List issues for a repository
 
         Args:
             repo: Repository in owner/name format
             state: open, closed, or all
             limit: Maximum number of issues to return
+            paginate: Fetch across pages (concurrently) until limit is reached
         """
-    limit = str(limit)
-    output = await _run_gh(["api", f"repos/{repo}/issues?state={state}&per_page={limit}"])
-    data = json.loads(output)
+    data = await _gh_api_list(f"repos/{repo}/issues?state={state}", limit, paginate)
     result = []
     for item in data:
         if item.get("pull_request"):
@@ -109,11 +368,9 @@ async def get_task(*, repo=None, number=None, url=None, **params):
     if not repo or number is None:
         _fail("repo and number are required (or pass url)")
     number = str(number)
-    output = await _run_gh(["api", f"repos/{repo}/issues/{number}"])
-    item = json.loads(output)
+    item = await _api_get(f"repos/{repo}/issues/{number}")
     if item.get("pull_request"):
-        pr_out = await _run_gh(["api", f"repos/{repo}/pulls/{number}"])
-        pr = json.loads(pr_out)
+        pr = await _api_get(f"repos/{repo}/pulls/{number}")
         return _task_shape(
             {
                 "number": pr["number"],
@@ -141,6 +398,12 @@ async def create_task(*, repo, title, body="", **params):
             title: Issue title
             body: Issue body
         """
+    resp = await _api("POST", f"repos/{repo}/issues", {"title": title, "body": body})
+    if resp is not None:
+        status, _, data = resp
+        if status != 201:
+            _api_fail(status, data)
+        return {"url": data["html_url"], "number": data["number"], "title": title}
     url = (await _run_gh(["issue", "create", "--repo", repo, "--title", title, "--body", body])).strip()
     return {"url": url, "number": int(url.rstrip("/").split("/")[-1]), "title": title}
 
@@ -153,7 +416,11 @@ async def close_task(*, repo, number, **params):
             number: Issue number
         """
     number = str(number)
-    await _run_gh(["issue", "close", number, "--repo", repo])
+    resp = await _api("PATCH", f"repos/{repo}/issues/{number}", {"state": "closed"})
+    if resp is None:
+        await _run_gh(["issue", "close", number, "--repo", repo])
+    elif resp[0] != 200:
+        _api_fail(resp[0], resp[2])
     return {"ok": True, "url": f"https://github.com/{repo}/issues/{number}"}
 
 
@@ -165,35 +432,65 @@ async def reopen_task(*, repo, number, **params):
             number: Issue number
         """
     number = str(number)
-    await _run_gh(["issue", "reopen", number, "--repo", repo])
+    resp = await _api("PATCH", f"repos/{repo}/issues/{number}", {"state": "open"})
+    if resp is None:
+        await _run_gh(["issue", "reopen", number, "--repo", repo])
+    elif resp[0] != 200:
+        _api_fail(resp[0], resp[2])
     return {"ok": True, "url": f"https://github.com/{repo}/issues/{number}"}
 
 
+def _pull_request_shape(pr):
+    """Map a REST pull to the fields `gh pr list --json` returns."""
+    user = pr.get("user") or {}
+    state = "MERGED" if pr.get("merged_at") else (pr.get("state") or "").upper()
+    return {
+        "number": pr.get("number"),
+        "title": pr.get("title"),
+        "url": pr.get("html_url"),
+        "state": state,
+        "headRefName": (pr.get("head") or {}).get("ref"),
+        "baseRefName": (pr.get("base") or {}).get("ref"),
+        "createdAt": pr.get("created_at"),
+        "updatedAt": pr.get("updated_at"),
+        "author": {"login": user.get("login"), "is_bot": user.get("type") == "Bot"},
+    }
+
+
 @returns({"items": "array"})
-async def list_pull_requests(*, repo, state="open", limit=30, **params):
+async def list_pull_requests(*, repo, state="open", limit=30, paginate=False, **params):
     """List pull requests for a repository
 
         Args:
             repo: Repository in owner/name format
-            state: open, closed, or all
+            state: open, closed, merged, or all
             limit: Maximum number of pull requests to return
+            paginate: Fetch across pages (concurrently) until limit is reached
         """
-    limit = str(limit)
-    output = await _run_gh(
-        [
-            "pr",
-            "list",
-            "--repo",
-            repo,
-            "--state",
-            state,
-            "--limit",
-            limit,
-            "--json",
-            "number,title,url,state,headRefName,baseRefName,createdAt,updatedAt,author",
-        ]
-    )
-    return json.loads(output)
+    if state == "merged":
+        return await _merged_pull_requests(repo, int(limit))
+    data = await _gh_api_list(f"repos/{repo}/pulls?state={state}", limit, paginate)
+    return [_pull_request_shape(pr) for pr in data]
+
+
+async def _merged_pull_requests(repo, limit):
+    """Page through closed pulls until `limit` merged ones are collected.
+
+    The pulls endpoint has no merged filter and closed-unmerged PRs are
+    interleaved, so the page count isn't known up front.
+    """
+    merged = []
+    page = 1
+    while len(merged) < limit:
+        data, _ = await _gh_api_cached(
+            f"repos/{repo}/pulls?state=closed&per_page={MAX_PER_PAGE}&page={page}"
+        )
+        data = data or []
+        merged.extend(_pull_request_shape(pr) for pr in data if pr.get("merged_at"))
+        if len(data) < MAX_PER_PAGE:
+            break
+        page += 1
+    return merged[:limit]
 
 
 @returns({"url": "string"})
@@ -207,6 +504,20 @@ async def create_pull_request(*, repo, title, head, body="", base=None, **params
             head: Source branch
             base: Target branch
         """
+    payload = {"title": title, "body": body, "head": head}
+    if not base:
+        repo_info = await _api("GET", f"repos/{repo}")
+        if repo_info is not None and repo_info[0] == 200:
+            base = repo_info[2].get("default_branch")
+    if base:
+        payload["base"] = base
+        resp = await _api("POST", f"repos/{repo}/pulls", payload)
+        if resp is not None:
+            status, _, data = resp
+            if status != 201:
+                _api_fail(status, data)
+            return {"url": data["html_url"]}
+
     args = [
         "pr",
         "create",
@@ -231,22 +542,132 @@ def _contents_endpoint(repo, path=None, ref=None):
     if path_part:
       endpoint = f"{endpoint}/{path_part}"
     if ref:
-      endpoint = f"{endpoint}?ref={ref}"
+      endpoint = f"{endpoint}?ref={http.encode(ref)}"
     return endpoint
 
 
+# Blob contents by SHA. A blob SHA is the hash of its content, so entries
+# never go stale and unchanged files cost nothing to re-read.
+BLOB_CACHE_DIR = Path.home() / ".agentos" / "cache" / "github" / "blobs"
+BLOB_CONCURRENCY = 8
+_TREE_KINDS = {"blob": "file", "tree": "dir", "commit": "submodule"}
+
+
+def _read_blob_cache(sha):
+    try:
+        return (BLOB_CACHE_DIR / sha).read_bytes()
+    except OSError:
+        return None
+
+
+def _write_blob_cache(sha, raw):
+    try:
+        BLOB_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=BLOB_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+        os.replace(tmp, BLOB_CACHE_DIR / sha)
+    except OSError:
+        pass
+
+
+async def _fetch_blob(repo, sha):
+    """Return (raw bytes, from_cache) for a blob."""
+    raw = _read_blob_cache(sha)
+    if raw is not None:
+        return raw, True
+    data = await _api_get(f"repos/{repo}/git/blobs/{sha}")
+    raw = base64.b64decode((data.get("content") or "").encode("utf-8"))
+    _write_blob_cache(sha, raw)
+    return raw, False
+
+
+def _on_prefix(item_path, prefixes):
+    """Whether item_path is on the way to, at, or under one of prefixes."""
+    return any(
+        not prefix
+        or item_path == prefix
+        or item_path.startswith(prefix + "/")
+        or prefix.startswith(item_path + "/")
+        for prefix in prefixes
+    )
+
+
+async def _tree_items(repo, tree, prefixes, base="", sem=None):
+    """(path, item) pairs under a tree; returns (items, truncated).
+
+    One recursive call covers most repos. GitHub truncates that response
+    past ~100k entries, so a truncated tree is re-listed one level at a time,
+    descending only into subtrees on the way to one of `prefixes`.
+    """
+    sem = sem or asyncio.Semaphore(BLOB_CONCURRENCY)
+    async with sem:
+        data = await _api_get(f"repos/{repo}/git/trees/{http.encode(tree)}?recursive=1")
+    if not data.get("truncated"):
+        return [(base + i.get("path", ""), i) for i in data.get("tree") or []], False
+
+    async with sem:
+        data = await _api_get(f"repos/{repo}/git/trees/{http.encode(tree)}")
+    items = [(base + i.get("path", ""), i) for i in data.get("tree") or []]
+    subtrees = [
+        (item_path, i) for item_path, i in items
+        if i.get("type") == "tree" and _on_prefix(item_path, prefixes)
+    ]
+    nested = await asyncio.gather(*(
+        _tree_items(repo, i["sha"], prefixes, item_path + "/", sem) for item_path, i in subtrees
+    ))
+    truncated = bool(data.get("truncated"))
+    for sub_items, sub_truncated in nested:
+        items.extend(sub_items)
+        truncated = truncated or sub_truncated
+    return items, truncated
+
+
+async def _tree_entries(repo, path=None, ref=None, dirs=None):
+    """Every entry under `path` at `ref`.
+
+    `dirs` narrows a truncated tree's level-by-level walk to those
+    directories. Returns (entries, truncated); truncated is only set if
+    GitHub cut off even a single directory's listing.
+    """
+    tree_ref = ref or "HEAD"
+    ref_path = "/".join(http.encode(part) for part in tree_ref.split("/"))
+    prefix = (path or "").strip("/")
+    items, truncated = await _tree_items(repo, tree_ref, tuple(dirs) if dirs else (prefix,))
+    entries = []
+    for item_path, item in items:
+        if prefix and item_path != prefix and not item_path.startswith(prefix + "/"):
+            continue
+        entries.append(
+            {
+                "sha": item.get("sha"),
+                "path": item_path,
+                "name": item_path.rsplit("/", 1)[-1],
+                "url": f"https://github.com/{repo}/{'tree' if item.get('type') == 'tree' else 'blob'}/{ref_path}/{item_path}",
+                "size": item.get("size"),
+                "kind": _TREE_KINDS.get(item.get("type"), item.get("type")),
+                "repository": repo,
+            }
+        )
+    return entries, truncated
+
+
 @returns("file[]")
-async def list_documents(*, repo, path=None, ref=None, **params):
+async def list_documents(*, repo, path=None, ref=None, recursive=False, **params):
     """List files and folders at a repository path
 
         Args:
             repo: Repository in owner/name format
             path: Path within the repository
             ref: Branch, tag, or commit
+            recursive: List the whole subtree in one call instead of one level
         """
-    endpoint = _contents_endpoint(repo, path, ref)
-    output = await _run_gh(["api", endpoint])
-    data = json.loads(output)
+    if recursive:
+        entries, truncated = await _tree_entries(repo, path, ref)
+        if truncated:
+            _fail(f"GitHub truncated the tree listing for {repo}; list a narrower path")
+        return entries
+    data = await _api_get(_contents_endpoint(repo, path, ref))
     items = data if isinstance(data, list) else [data]
     result = []
     for item in items:
@@ -264,6 +685,57 @@ async def list_documents(*, repo, path=None, ref=None, **params):
     return result
 
 
+@returns("file[]")
+async def read_documents(*, repo, paths=None, path=None, ref=None, limit=500, **params):
+    """Read many text files at once. Requested paths that aren't files at ref come back with kind "missing" and an error
+
+        Args:
+            repo: Repository in owner/name format
+            paths: Exact file paths to read
+            path: Read every file under this directory (used when paths is not set)
+            ref: Branch, tag, or commit
+            limit: Maximum number of files to read
+        """
+    wanted = list(dict.fromkeys(p.strip("/") for p in paths)) if paths else []
+    dirs = None
+    if wanted:
+        # List only under the deepest directory holding every requested path,
+        # and walk only their own directories if the tree comes back truncated
+        dirs = sorted({posixpath.dirname(p) for p in wanted})
+        path = posixpath.commonpath(dirs)
+    entries, truncated = await _tree_entries(repo, path, ref, dirs)
+    if truncated:
+        _fail(f"GitHub truncated the tree listing for {repo}; read a narrower path")
+    files = [e for e in entries if e["kind"] == "file"]
+    missing = []
+    if wanted:
+        by_path = {e["path"]: e for e in files}
+        files = [by_path[p] for p in wanted if p in by_path]
+        missing = [
+            {
+                "sha": None,
+                "path": p,
+                "name": p.rsplit("/", 1)[-1],
+                "url": None,
+                "size": None,
+                "kind": "missing",
+                "repository": repo,
+                "content": None,
+                "error": "not a file at this ref",
+            }
+            for p in wanted if p not in by_path
+        ]
+    files = files[: int(limit)]
+    sem = asyncio.Semaphore(BLOB_CONCURRENCY)
+
+    async def read(entry):
+        async with sem:
+            raw, _ = await _fetch_blob(repo, entry["sha"])
+        return {**entry, "content": raw.decode("utf-8", errors="replace")}
+
+    return list(await asyncio.gather(*(read(e) for e in files))) + missing
+
+
 def _parse_blob_or_raw_url(url: str) -> tuple[str, str, str] | None:
     """
     Return (owner/repo, path, ref) for blob or raw.githubusercontent.com URLs.
@@ -303,9 +775,7 @@ async def read_document(*, repo=None, path=None, ref=None, url=None, **params):
         repo, path, ref = parsed
     if not repo or not path:
         _fail("repo and path are required (or pass url)")
-    endpoint = _contents_endpoint(repo, path, ref)
-    output = await _run_gh(["api", endpoint])
-    data = json.loads(output)
+    data = await _api_get(_contents_endpoint(repo, path, ref))
     content = data.get("content")
     if content is not None:
         content = base64.b64decode(content.encode("utf-8")).decode("utf-8", errors="replace")
@@ -344,6 +814,7 @@ def _main():
         "createPullRequest": create_pull_request,
         "listDocuments": list_documents,
         "readDocument": read_document,
+        "readDocuments": read_documents,
         "status": status,
     }
     handler = operations.get(operation)
@@ -23,8 +23,13 @@ though the cookies were fresh). Passing the same cookies as a raw
 the one-shot path.
 """
 
+import asyncio
+import hashlib
 import json
+import os
 import re
+import tempfile
+from pathlib import Path
 
 from agentos import http, connection, returns, timeout
 
@@ -46,6 +51,12 @@ INVITE_URL_TEMPLATE = f"{DASHBOARD_BASE}/invitation?token={{token}}"
 # Valid role values from the bundle (chunks reference `n.X.ADMIN`, `n.X.MEMBER`).
 VALID_ROLES = ("ADMIN", "MEMBER")
 
+# Next.js chunk filenames carry a content hash, so a chunk URL's body never
+# changes — grep_page_chunks keeps them on disk and only fetches new ones.
+CHUNK_CACHE_DIR = Path.home() / ".agentos" / "cache" / "greptile" / "chunks"
+CHUNK_FETCH_CONCURRENCY = 8
+CHUNK_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
 
 # ---------------------------------------------------------------------------
 # Low-level helpers — one-shot HTTP with the engine-resolved cookie header
@@ -725,8 +736,118 @@ async def grep_bundle(*, path: str, patterns: list = None, context: int = 60,
     }}
 
 
+def _chunk_cache_path(url: str) -> Path:
+    return CHUNK_CACHE_DIR / (hashlib.sha256(url.encode()).hexdigest() + ".js")
+
+
+async def _fetch_chunk(url: str, headers: dict) -> tuple[str | None, bool]:
+    """Return (body, from_cache) for a chunk URL; body is None on any failure."""
+    path = _chunk_cache_path(url)
+    try:
+        body = path.read_text(encoding="utf-8")
+        os.utime(path)  # mtime doubles as last use for eviction
+        return body, True
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    try:
+        r = await http.get(url, headers=headers, http2=False)
+    except Exception:
+        return None, False
+    body = r.get("body") or ""
+    if r.get("status") != 200 or not isinstance(body, str):
+        return None, False
+
+    try:
+        CHUNK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CHUNK_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return body, False
+
+
+def _prune_chunk_cache() -> None:
+    """Evict least-recently-used chunks until the cache fits CHUNK_CACHE_MAX_BYTES."""
+    try:
+        entries = []
+        for p in CHUNK_CACHE_DIR.glob("*.js"):
+            st = p.stat()
+            entries.append((st.st_mtime, st.st_size, p))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, p in sorted(entries):
+        if total <= CHUNK_CACHE_MAX_BYTES:
+            break
+        try:
+            p.unlink()
+        except OSError:
+            continue
+        total -= size
+
+
+def _combine_patterns(compiled: list) -> re.Pattern | None:
+    """One zero-width regex that stops at every offset where any pattern matches.
+
+    Returns None when the patterns can't share one regex (numbered or named
+    backreferences, inline global flags, duplicate group names) — callers
+    then fall back to one pass per pattern.
+    """
+    pats = [pat for pat, rx in compiled if rx is not None]
+    if not pats or any(re.search(r"\\[1-9]|\(\?P=", pat) for pat in pats):
+        return None
+    try:
+        return re.compile("(?=" + "|".join(f"(?:{pat})" for pat in pats) + ")")
+    except re.error:
+        return None
+
+
+def _scan_chunk(body: str, compiled: list, room: dict):
+    """Yield (pattern, match) over a chunk, exactly as one finditer per pattern would.
+
+    The combined lookahead finds each offset where any pattern matches; every
+    pattern is then tried there on its own, so hits of different patterns can
+    overlap. `room` holds how many more hits each pattern may report; it is
+    decremented here, and a pattern that runs out leaves the combined regex.
+    """
+    live = [(pat, rx) for pat, rx in compiled if rx is not None and room.get(pat, 0) > 0]
+    finder = _combine_patterns(live)
+    if finder is None:
+        for pat, rx in live:
+            for m in rx.finditer(body):
+                if room[pat] <= 0:
+                    break
+                room[pat] -= 1
+                yield pat, m
+        return
+
+    resume = {pat: 0 for pat, _ in live}  # where each pattern's own finditer would resume
+    pos = 0
+    while live and pos <= len(body):
+        hit = finder.search(body, pos)
+        if hit is None:
+            return
+        at = hit.start()
+        for pat, rx in live:
+            if resume[pat] > at:
+                continue
+            m = rx.match(body, at)
+            if m is None:
+                continue
+            resume[pat] = m.end() if m.end() > at else at + 1
+            room[pat] -= 1
+            yield pat, m
+        if any(room[pat] <= 0 for pat, _ in live):
+            live = [(pat, rx) for pat, rx in live if room[pat] > 0]
+            finder = _combine_patterns(live)
+        pos = at + 1
+
+
 @returns({"page_url": "string", "chunks_tried": "integer", "chunks_ok": "integer",
-          "total_bytes": "integer", "matches": "array"})
+          "chunks_cached": "integer", "total_bytes": "integer", "matches": "array"})
 @connection("dashboard")
 @timeout(120)
 async def grep_page_chunks(*, page: str, patterns: list = None, context: int = 80,
@@ -776,41 +897,38 @@ async def grep_page_chunks(*, page: str, patterns: list = None, context: int = 8
         except re.error as e:
             compiled.append((pat, None))
     buckets = {pat: [] for pat, _ in compiled}
+    room = {pat: max_matches_per_pattern for pat, rx in compiled if rx is not None}
+
+    # 3. Fetch chunks concurrently (disk cache first), then grep in page order
+    sem = asyncio.Semaphore(CHUNK_FETCH_CONCURRENCY)
+
+    async def fetch(cpath: str) -> tuple[str | None, bool]:
+        async with sem:
+            return await _fetch_chunk(f"{DASHBOARD_BASE}{cpath}", headers)
+
+    fetched = await asyncio.gather(*(fetch(c) for c in chunk_paths))
+    if not all(from_cache for body, from_cache in fetched if body is not None):
+        _prune_chunk_cache()
 
     chunks_ok = 0
+    chunks_cached = 0
     total_bytes = 0
-
-    # 3. Fetch each chunk and grep
-    for cpath in chunk_paths:
-        curl = f"{DASHBOARD_BASE}{cpath}"
-        try:
-            r = await http.get(curl, headers=headers, http2=False)
-        except Exception as e:
-            continue
-        if r.get("status") != 200:
-            continue
-        body = r.get("body") or ""
-        if not isinstance(body, str):
+    for cpath, (body, from_cache) in zip(chunk_paths, fetched):
+        if body is None:
             continue
         chunks_ok += 1
+        chunks_cached += from_cache
         total_bytes += len(body)
-
-        for pat, rx in compiled:
-            if rx is None:
-                continue
-            bucket = buckets[pat]
-            if len(bucket) >= max_matches_per_pattern:
-                continue
-            for m in rx.finditer(body):
-                if len(bucket) >= max_matches_per_pattern:
-                    break
-                start = max(0, m.start() - context)
-                end = min(len(body), m.end() + context)
-                bucket.append({
-                    "chunk": cpath,
-                    "match": m.group(0),
-                    "context": body[start:end].replace("\n", " "),
-                })
+        if not any(n > 0 for n in room.values()):
+            continue
+        for pat, m in _scan_chunk(body, compiled, room):
+            start = max(0, m.start() - context)
+            end = min(len(body), m.end() + context)
+            buckets[pat].append({
+                "chunk": cpath,
+                "match": m.group(0),
+                "context": body[start:end].replace("\n", " "),
+            })
 
     matches = [{"pattern": pat, "count": len(hits), "hits": hits}
                for pat, hits in buckets.items()]
@@ -819,6 +937,7 @@ async def grep_page_chunks(*, page: str, patterns: list = None, context: int = 8
         "page_url": page_url,
         "chunks_tried": len(chunk_paths),
         "chunks_ok": chunks_ok,
+        "chunks_cached": chunks_cached,
         "total_bytes": total_bytes,
         "matches": matches,
     }}
@@ -1,13 +1,43 @@
 """Linear — project management for engineering teams.
 
-16 GraphQL operations POSTing to the Linear GraphQL API with API key auth.
+GraphQL operations POSTing to the Linear GraphQL API with API key auth, plus a
+local issue store (export_tasks / sync_tasks) that list_tasks and get_task can
+read from instead of the API.
 """
 
+import asyncio
+import hashlib
+import json
+import os
 import re
+import tempfile
+import time
+from pathlib import Path
+
 from agentos import http, provides, returns, web_read
 
 API_URL = "https://api.linear.app/graphql"
 
+# Local issue store — one JSON file per API key (i.e. per workspace + user)
+STORE_DIR = Path.home() / ".agentos" / "cache" / "linear"
+
+# Linear caps `first` at 250; 100 keeps each page's complexity well under budget
+_PAGE_SIZE = 100
+
+
+# Concurrent read-only queries arriving within this window are merged into one
+# aliased document. The cap keeps a merged query under Linear's per-query
+# complexity limit; anything over it is sent on its own.
+_COALESCE_WINDOW = 0.01
+_COALESCE_MAX = 8
+
+# Pause before sending when the remaining budget drops below these
+_MIN_REQUESTS_LEFT = 2
+_MIN_COMPLEXITY_LEFT = 10_000
+_MAX_PACE_SECONDS = 5  # longest single wait; ops carry no @timeout of their own
+_MAX_WAIT_SECONDS = 15  # total waiting per request across pacing and retries
+_RATE_LIMIT_RETRIES = 3
+
 
 def _auth_header(params):
     key = params.get("auth", {}).get("key", "")
@@ -15,19 +45,360 @@ def _auth_header(params):
 
 
 async def _gql(params, query, variables=None):
-    """Execute a GraphQL query against the Linear API."""
-    headers = _auth_header(params)
-    body = {"query": query}
-    if variables:
-        # Strip None values so Linear doesn't choke on null filters
-        body["variables"] = {k: v for k, v in variables.items() if v is not None}
-    resp = await http.post(API_URL, json=body, **http.headers(accept="json", extra=headers))
-    data = resp["json"]
+    """Execute a GraphQL query against the Linear API.
+
+    Plain queries are handed to the coalescer and may share a request with
+    other concurrent callers; mutations and anything it can't merge go
+    straight out.
+    """
+    # Strip None values so Linear doesn't choke on null filters
+    variables = {k: v for k, v in (variables or {}).items() if v is not None}
+    parsed = _parse_operation(query)
+    if parsed:
+        return await _coalesce(params, parsed, query, variables)
+    return await _gql_single(params, query, variables)
+
+
+async def _gql_single(params, query, variables):
+    data = await _gql_post(params, query, variables)
     if data.get("errors"):
         raise Exception(f"GraphQL error: {data['errors']}")
     return data["data"]
 
 
+# ---------------------------------------------------------------------------
+# Transport — rate-limit tracking and pacing
+# ---------------------------------------------------------------------------
+
+# API key → last seen X-RateLimit-* budget (resets are epoch ms)
+_rate_state: dict[str, dict] = {}
+
+
+def _record_rate_limits(key, headers):
+    h = {k.lower(): v for k, v in (headers or {}).items()}
+    state = _rate_state.setdefault(key, {})
+    for name in ("requests", "complexity"):
+        for field in ("remaining", "reset"):
+            value = h.get(f"x-ratelimit-{name}-{field}")
+            if value is not None:
+                try:
+                    state[f"{name}_{field}"] = int(value)
+                except ValueError:
+                    pass
+
+
+async def _pace(key, allowance):
+    """Sleep towards the reset if the last response showed the budget nearly spent.
+
+    Waits at most `allowance` seconds (and _MAX_PACE_SECONDS per budget);
+    returns how long it slept.
+    """
+    state = _rate_state.get(key) or {}
+    now_ms = time.time() * 1000
+    slept = 0.0
+    for name, floor in (("requests", _MIN_REQUESTS_LEFT), ("complexity", _MIN_COMPLEXITY_LEFT)):
+        remaining = state.get(f"{name}_remaining")
+        reset = state.get(f"{name}_reset")
+        if remaining is not None and remaining < floor and reset and reset > now_ms:
+            wait = min((reset - now_ms) / 1000, _MAX_PACE_SECONDS, allowance - slept)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                slept += wait
+            state.pop(f"{name}_remaining", None)
+    return slept
+
+
+def _is_rate_limited(resp, data):
+    if resp.get("status") == 429:
+        return True
+    return any(
+        (e.get("extensions") or {}).get("code") == "RATELIMITED"
+        for e in (data or {}).get("errors") or []
+    )
+
+
+async def _gql_post(params, query, variables):
+    """POST one document. Returns the raw {data, errors} body.
+
+    Waits out a nearly exhausted budget before sending, and on a rate-limit
+    response sleeps until the advertised reset (or backs off) and retries.
+    All waiting together is capped at _MAX_WAIT_SECONDS; after that the
+    rate-limit error is returned to the caller.
+    """
+    key = params.get("auth", {}).get("key", "")
+    body = {"query": query}
+    if variables:
+        body["variables"] = variables
+    waited = 0.0
+    for attempt in range(_RATE_LIMIT_RETRIES + 1):
+        waited += await _pace(key, _MAX_WAIT_SECONDS - waited)
+        resp = await http.post(API_URL, json=body, **http.headers(accept="json", extra=_auth_header(params)))
+        _record_rate_limits(key, resp.get("headers"))
+        data = resp.get("json") or {}
+        if not _is_rate_limited(resp, data) or attempt == _RATE_LIMIT_RETRIES or waited >= _MAX_WAIT_SECONDS:
+            return data
+        state = _rate_state.get(key) or {}
+        reset = state.get("requests_reset") or state.get("complexity_reset")
+        wait = (reset - time.time() * 1000) / 1000 if reset else 2 ** attempt
+        wait = min(max(wait, 1), _MAX_PACE_SECONDS, _MAX_WAIT_SECONDS - waited)
+        await asyncio.sleep(wait)
+        waited += wait
+    return data
+
+
+# ---------------------------------------------------------------------------
+# Query coalescing
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(
+    r'"(?:[^"\\]|\\.)*"|\.\.\.|\$?[A-Za-z_]\w*|-?\d[\w.+-]*|[:(){}\[\]!=@]|[\s,]+|#[^\n]*'
+)
+
+
+class _Unmergeable(Exception):
+    """The query uses syntax the tokenizer doesn't understand — don't merge it."""
+
+
+def _tokens(text):
+    pos = 0
+    for m in _TOKEN_RE.finditer(text):
+        if m.start() != pos:
+            raise _Unmergeable(text[pos:m.start()])
+        pos = m.end()
+        tok = m.group(0)
+        if not tok.strip(" \t\r\n,") or tok.startswith("#"):
+            continue
+        yield tok, m.start(), m.end()
+    if pos != len(text):
+        raise _Unmergeable(text[pos:])
+
+
+def _parse_operation(query):
+    """Split a single anonymous-or-named query into (var_defs, [(key, field_text)]).
+
+    `key` is the response key (alias or field name) and `field_text` the
+    selection without its alias. Returns None for mutations, fragments,
+    directives, or anything else the merger doesn't handle.
+    """
+    try:
+        toks = list(_tokens(query))
+    except _Unmergeable:
+        return None
+    if not toks:
+        return None
+    i = 0
+    if toks[0][0] == "query":
+        i = 1
+        if i < len(toks) and toks[i][0] not in ("(", "{"):
+            i += 1  # operation name
+    elif toks[0][0] != "{":
+        return None
+
+    var_defs = ""
+    if i < len(toks) and toks[i][0] == "(":
+        start = toks[i][2]
+        while i < len(toks) and toks[i][0] != ")":
+            i += 1
+        if i >= len(toks):
+            return None
+        var_defs = query[start:toks[i][1]].strip()
+        i += 1
+    if i >= len(toks) or toks[i][0] != "{":
+        return None
+    i += 1
+
+    fields = []
+    while i < len(toks) and toks[i][0] != "}":
+        name = toks[i][0]
+        if not re.fullmatch(r"[A-Za-z_]\w*", name):
+            return None
+        key, field_start = name, toks[i][1]
+        if i + 1 < len(toks) and toks[i + 1][0] == ":":
+            i += 2
+            if i >= len(toks) or not re.fullmatch(r"[A-Za-z_]\w*", toks[i][0]):
+                return None
+            field_start = toks[i][1]
+        end = toks[i][2]
+        i += 1
+        for open_, close in (("(", ")"), ("{", "}")):
+            if i < len(toks) and toks[i][0] == open_:
+                depth = 0
+                while i < len(toks):
+                    depth += toks[i][0] == open_
+                    depth -= toks[i][0] == close
+                    i += 1
+                    if depth == 0:
+                        break
+                if depth:
+                    return None
+                end = toks[i - 1][2]
+        if i < len(toks) and toks[i][0] == "@":
+            return None
+        fields.append((key, query[field_start:end]))
+    if i != len(toks) - 1 or not fields:
+        return None  # trailing fragments / extra operations
+    return var_defs, fields
+
+
+def _rename_variables(text, prefix):
+    """Prefix every $variable token; string literals and comments are left alone."""
+    return _TOKEN_RE.sub(
+        lambda m: f"${prefix}{m.group(0)[1:]}" if m.group(0).startswith("$") else m.group(0),
+        text,
+    )
+
+
+def _merge_operations(entries):
+    """Build one aliased document from [(parsed, variables)].
+
+    Caller n's variables become $qn_<name> and its top-level fields are
+    aliased qn_<key>. Returns (query, variables).
+    """
+    var_defs, selections, variables = [], [], {}
+    for n, ((defs, fields), vars_) in enumerate(entries):
+        prefix = f"q{n}_"
+        rename = lambda text: _rename_variables(text, prefix)
+        if defs:
+            var_defs.append(rename(defs))
+        for key, text in fields:
+            selections.append(f"{prefix}{key}: {rename(text)}")
+        variables.update({prefix + k: v for k, v in vars_.items()})
+    header = f"query({', '.join(var_defs)})" if var_defs else "query"
+    return header + " {\n  " + "\n  ".join(selections) + "\n}", variables
+
+
+# (event loop, API key) → the open window: {"calls": [...], "task": flush task}
+_pending: dict[tuple, dict] = {}
+
+# (event loop, API key) → requests currently on the wire
+_inflight: dict[tuple, int] = {}
+
+
+def _release(slot):
+    _inflight[slot] -= 1
+    if not _inflight[slot]:
+        del _inflight[slot]  # don't keep finished event loops alive
+
+
+async def _coalesce(params, parsed, query, variables):
+    """Queue a query for merging, or send it at once when nothing else is in play.
+
+    A lone call goes straight out; only calls that arrive while another is
+    in flight or queued wait out the window to share a request. State is
+    kept per event loop, so a torn-down loop can't strand later callers.
+    """
+    slot = (asyncio.get_running_loop(), params.get("auth", {}).get("key", ""))
+    window = _pending.get(slot)
+    if not _inflight.get(slot) and window is None:
+        _inflight[slot] = _inflight.get(slot, 0) + 1
+        try:
+            return await _gql_single(params, query, variables)
+        finally:
+            _release(slot)
+
+    fut = slot[0].create_future()
+    if window is None or window["task"].done():
+        # No window, or its flush task died before dispatching: open a new
+        # one and carry over any callers left in the dead one.
+        calls = window["calls"] if window else []
+        window = _pending[slot] = {"calls": calls, "task": None}
+        window["task"] = asyncio.ensure_future(_flush_after_window(params, slot, window))
+        window["task"].add_done_callback(lambda task, w=window: _abandon_window(slot, w, task))
+    window["calls"].append((parsed, query, variables, fut))
+    if len(window["calls"]) >= _COALESCE_MAX:
+        del _pending[slot]
+        window["task"].cancel()
+        asyncio.ensure_future(_dispatch(params, slot, window["calls"]))
+    return await fut
+
+
+async def _flush_after_window(params, slot, window):
+    await asyncio.sleep(_COALESCE_WINDOW)
+    if _pending.get(slot) is window:
+        del _pending[slot]
+        await _dispatch(params, slot, window["calls"])
+
+
+def _abandon_window(slot, window, task):
+    """Done-callback: fail the callers of a window whose flush never dispatched.
+
+    Covers a flush task cancelled or killed (e.g. at loop teardown) before
+    or during its sleep — those callers would otherwise wait forever.
+    """
+    if _pending.get(slot) is window:
+        del _pending[slot]
+        for *_, fut in window["calls"]:
+            _settle(fut, error=RuntimeError("coalesced request abandoned before sending"))
+
+
+def _settle(fut, result=None, error=None):
+    """Resolve a caller's future unless it was already cancelled or resolved."""
+    if fut.done():
+        return
+    if error is not None:
+        fut.set_exception(error)
+    else:
+        fut.set_result(result)
+
+
+async def _dispatch(params, slot, batch):
+    """Run _flush, guaranteeing every caller in the batch is resolved."""
+    _inflight[slot] = _inflight.get(slot, 0) + 1
+    try:
+        await _flush(params, batch)
+    except Exception as e:
+        for *_, fut in batch:
+            _settle(fut, error=e)
+    finally:
+        _release(slot)
+        for *_, fut in batch:
+            _settle(fut, error=RuntimeError("coalesced request aborted"))
+
+
+async def _send_alone(params, entry):
+    _, query, variables, fut = entry
+    if fut.done():
+        return  # caller gave up
+    try:
+        result = await _gql_single(params, query, variables)
+    except Exception as e:
+        _settle(fut, error=e)
+        return
+    _settle(fut, result)
+
+
+async def _flush(params, batch):
+    """Send a window's calls as one document and hand each caller its slice.
+
+    Errors with a path go to the caller that owns that alias. A failure the
+    merged document can't attribute (transport error, complexity limit)
+    falls back to sending each call on its own.
+    """
+    batch = [entry for entry in batch if not entry[3].done()]
+    if len(batch) <= 1:
+        if batch:
+            await _send_alone(params, batch[0])
+        return
+    query, variables = _merge_operations([(parsed, vars_) for parsed, _, vars_, _ in batch])
+    try:
+        data = await _gql_post(params, query, variables)
+    except Exception:
+        data = None
+    errors = (data or {}).get("errors") or []
+    if data is None or data.get("data") is None or any(not e.get("path") for e in errors):
+        await asyncio.gather(*(_send_alone(params, entry) for entry in batch))
+        return
+
+    merged = data["data"]
+    for n, ((_, fields), _, _, fut) in enumerate(batch):
+        prefix = f"q{n}_"
+        mine = [e for e in errors if str(e["path"][0]).startswith(prefix)]
+        if mine:
+            _settle(fut, error=Exception(f"GraphQL error: {mine}"))
+        else:
+            _settle(fut, {key: merged.get(prefix + key) for key, _ in fields})
+
+
 # ---------------------------------------------------------------------------
 # Issue fields fragment (reused across queries)
 # ---------------------------------------------------------------------------
@@ -52,6 +423,80 @@ _ISSUE_FIELDS_FULL = _ISSUE_FIELDS + """
 """
 
 
+# ---------------------------------------------------------------------------
+# Pagination + local store
+# ---------------------------------------------------------------------------
+
+
+async def _paginate(params, query, variables, connection_key):
+    """Yield every node of a connection, following pageInfo.endCursor.
+
+    `query` must accept `$first: Int` and `$after: String` and select
+    `pageInfo { hasNextPage endCursor }` on the connection.
+    """
+    after = None
+    while True:
+        data = await _gql(params, query, {**variables, "first": _PAGE_SIZE, "after": after})
+        conn = data[connection_key]
+        for node in conn["nodes"]:
+            yield node
+        page = conn.get("pageInfo") or {}
+        if not page.get("hasNextPage") or not page.get("endCursor"):
+            return
+        after = page["endCursor"]
+
+
+_ISSUE_PAGE_QUERY = """
+    query($first: Int, $after: String, $filter: IssueFilter, $includeArchived: Boolean) {
+      issues(first: $first, after: $after, filter: $filter,
+             orderBy: updatedAt, includeArchived: $includeArchived) {
+        nodes { %s archivedAt trashed }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+""" % _ISSUE_FIELDS
+
+
+def _store_path(params):
+    key = params.get("auth", {}).get("key", "")
+    return STORE_DIR / (hashlib.sha256(key.encode()).hexdigest()[:16] + ".json")
+
+
+def _load_store(params):
+    try:
+        with open(_store_path(params)) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"last_sync": None, "issues": {}}
+
+
+def _save_store(params, store):
+    path = _store_path(params)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(store, f)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _store_tasks(store, team_id=None, state_id=None):
+    """Issue nodes from the store, filtered like list_tasks, newest first."""
+    nodes = [
+        n for n in store["issues"].values()
+        if (not team_id or (n.get("team") or {}).get("id") == team_id)
+        and (not state_id or (n.get("state") or {}).get("id") == state_id)
+    ]
+    nodes.sort(key=lambda n: n.get("createdAt") or "", reverse=True)
+    return nodes
+
+
 # ---------------------------------------------------------------------------
 # Shape mapping
 # ---------------------------------------------------------------------------
@@ -143,8 +588,17 @@ def _map_project(node):
 # ---------------------------------------------------------------------------
 
 @returns("task[]")
-async def list_tasks(*, limit: int = 50, team_id: str = None, state_id: str = None, **params) -> list:
-    """List issues with optional filters."""
+async def list_tasks(*, limit: int = 50, team_id: str = None, state_id: str = None,
+                     source: str = "api", **params) -> list:
+    """List issues with optional filters.
+
+    source="store" reads the local store filled by sync_tasks / export_tasks
+    instead of calling the API.
+    """
+    if source == "store":
+        nodes = _store_tasks(_load_store(params), team_id, state_id)
+        return [_map_task(n) for n in nodes[:limit]]
+
     query = """
         query($limit: Int, $teamId: ID, $stateId: ID) {
           issues(
@@ -164,10 +618,12 @@ async def list_tasks(*, limit: int = 50, team_id: str = None, state_id: str = No
 
 @returns("task")
 @provides(web_read, urls=["linear.app/*/issue/*"])
-async def get_task(*, id: str = None, url: str = None, **params) -> dict:
+async def get_task(*, id: str = None, url: str = None, source: str = "api", **params) -> dict:
     """Get a single issue by ID or URL.
 
     If url is provided, extracts the identifier (e.g. PROJ-123) from the URL.
+    source="store" looks the issue up in the local store (by id or identifier);
+    store rows carry the list fields only, without children or relations.
     """
     if url and not id:
         m = re.search(r"/issue/([A-Za-z0-9]+-\d+)", url)
@@ -176,6 +632,15 @@ async def get_task(*, id: str = None, url: str = None, **params) -> dict:
     if not id:
         raise ValueError("Either id or a valid Linear issue url is required")
 
+    if source == "store":
+        issues = _load_store(params)["issues"]
+        node = issues.get(id) or next(
+            (n for n in issues.values() if n.get("identifier") == id), None
+        )
+        if not node:
+            raise ValueError(f"Issue {id} not in local store — run sync_tasks first")
+        return _map_task(node)
+
     query = """
         query($id: String!) {
           issue(id: $id) { %s }
@@ -185,6 +650,63 @@ async def get_task(*, id: str = None, url: str = None, **params) -> dict:
     return _map_task(data["issue"])
 
 
+@returns("task[]")
+async def export_tasks(*, team_id: str = None, state_id: str = None, **params) -> list:
+    """Export every matching issue, following cursors past the first page.
+
+    Unfiltered exports also replace the local store, so they double as a full sync.
+    """
+    flt = {}
+    if team_id:
+        flt["team"] = {"id": {"eq": team_id}}
+    if state_id:
+        flt["state"] = {"id": {"eq": state_id}}
+    nodes = [n async for n in _paginate(params, _ISSUE_PAGE_QUERY, {"filter": flt or None}, "issues")]
+
+    if not flt:
+        _save_store(params, {
+            "last_sync": max((n.get("updatedAt") or "" for n in nodes), default=None),
+            "issues": {n["id"]: n for n in nodes},
+        })
+    return [_map_task(n) for n in nodes]
+
+
+@returns({"fetched": "integer", "removed": "integer", "total": "integer", "last_sync": "string"})
+async def sync_tasks(*, full: bool = False, **params) -> dict:
+    """Pull issues updated since the last sync into the local store.
+
+    The first run (or full=true) pages through everything. Later runs ask only
+    for updatedAt > last_sync, including archived issues so archives and
+    trashing are dropped from the store. last_sync is the newest updatedAt
+    Linear returned, so no local clock skew is involved.
+    """
+    store = {"last_sync": None, "issues": {}} if full else _load_store(params)
+    since = store.get("last_sync")
+    variables = {
+        "filter": {"updatedAt": {"gt": since}} if since else None,
+        "includeArchived": bool(since),
+    }
+
+    fetched = removed = 0
+    issues = store["issues"]
+    async for node in _paginate(params, _ISSUE_PAGE_QUERY, variables, "issues"):
+        fetched += 1
+        if node.get("archivedAt") or node.get("trashed"):
+            removed += issues.pop(node["id"], None) is not None
+        else:
+            issues[node["id"]] = node
+        if (node.get("updatedAt") or "") > (store.get("last_sync") or ""):
+            store["last_sync"] = node["updatedAt"]
+
+    _save_store(params, store)
+    return {
+        "fetched": fetched,
+        "removed": removed,
+        "total": len(issues),
+        "last_sync": store["last_sync"],
+    }
+
+
 @returns("task")
 async def create_task(*, team_id: str, name: str, description: str = None,
                 priority: int = None, project_id: str = None,
@@ -12,20 +12,37 @@ Returns a JSON object matching the website entity schema.
 Usage:
   python3 publish.py --filename index.html --content-type "text/html; charset=utf-8" [--title "My Site"] [--token <api-key>] [--slug <existing-slug>]
   echo "<html>...</html>" | python3 publish.py --filename index.html
+  python3 publish.py --dir ./site [--slug <existing-slug>]
 
 For updates (redeploy), pass --slug to target an existing publish.
 For anonymous publishes (no --token), the response includes claim_token and claim_url — surfaced in data so the agent can show them to the user.
 """
 
 import argparse
+import asyncio
+import hashlib
 import json
+import mimetypes
 import os
 import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
 
 from agentos import http, connection, returns, timeout
 
 BASE_URL = "https://here.now/api/v1"
 
+UPLOAD_CONCURRENCY = 6
+HASH_CHUNK = 1024 * 1024
+
+# Per-slug record of the last publish: {"hashes": {path: sha256}, "output": ..., "savedAt": ...}
+MANIFEST_DIR = Path.home() / ".agentos" / "cache" / "here-now"
+# Without a token the live version can't be checked, so an unchanged
+# anonymous redeploy is only skipped this soon after the last publish.
+MANIFEST_TTL = 600
+
 
 def _map_website(w: dict) -> dict:
     viewer = w.get("viewer") or {}
@@ -133,7 +150,7 @@ async def patch_metadata(*, slug: str, title: str = None, description: str = Non
     return {"success": True}
 
 
-def _make_request(url, method="GET", body=None, headers=None, content_type="application/json"):
+async def _make_request(url, method="GET", body=None, headers=None, content_type="application/json"):
     headers = dict(headers or {})
 
     if body is not None and isinstance(body, (dict, list)):
@@ -151,7 +168,7 @@ def _make_request(url, method="GET", body=None, headers=None, content_type="appl
 
     dispatch = {"GET": http.get, "POST": http.post, "PUT": http.put, "DELETE": http.delete, "PATCH": http.patch}
     fn = dispatch.get(method, http.get)
-    resp = fn(url, **kwargs)
+    resp = await fn(url, **kwargs)
 
     if not resp.get("ok"):
         err_body = resp.get("body", "")
@@ -165,18 +182,73 @@ def _make_request(url, method="GET", body=None, headers=None, content_type="appl
     return resp.get("json") if resp.get("json") is not None else resp.get("body", "")
 
 
-def _do_publish(
-    content,
-    filename="index.html",
-    content_type="text/html; charset=utf-8",
-    title=None,
-    description=None,
-    slug=None,
-    token=None,
-    ttl=None,
-):
-    """Core publish logic. Content can be str or bytes. Returns website entity dict."""
-    content_bytes = content.encode("utf-8") if isinstance(content, str) else content
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _content_type_for(path):
+    mime, _ = mimetypes.guess_type(path)
+    mime = mime or "application/octet-stream"
+    if mime.startswith("text/") or mime in ("application/javascript", "application/json"):
+        mime += "; charset=utf-8"
+    return mime
+
+
+def _collect_directory(directory):
+    """Manifest entries for every non-hidden file under `directory`.
+
+    Files are hashed in chunks from disk; contents are read again only when
+    they're uploaded.
+    """
+    root = os.path.abspath(os.path.expanduser(directory))
+    if not os.path.isdir(root):
+        raise ValueError(f"Not a directory: {root}")
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if name.startswith("."):
+                continue
+            source = os.path.join(dirpath, name)
+            files.append({
+                "path": os.path.relpath(source, root).replace(os.sep, "/"),
+                "size": os.path.getsize(source),
+                "contentType": _content_type_for(name),
+                "hash": _file_sha256(source),
+                "source": source,
+            })
+    if not files:
+        raise ValueError(f"No files to publish in {root}")
+    return files
+
+
+def _read_manifest(slug):
+    try:
+        return json.loads((MANIFEST_DIR / f"{slug}.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(slug, files, output):
+    try:
+        MANIFEST_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=MANIFEST_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({
+                "hashes": {item["path"]: item["hash"] for item in files},
+                "output": output,
+                "savedAt": time.time(),
+            }, f)
+        os.replace(tmp, MANIFEST_DIR / f"{slug}.json")
+    except OSError:
+        pass
+
+
+def _resolve_token(token):
     token = (token or "").strip()
     if not token:
         creds_path = os.path.expanduser("~/.herenow/credentials")
@@ -185,6 +257,91 @@ def _do_publish(
                 token = f.read().strip()
         except FileNotFoundError:
             pass
+    return token
+
+
+async def _upload_all(uploads, files, concurrency=UPLOAD_CONCURRENCY):
+    """PUT each presigned upload, at most `concurrency` at a time.
+
+    Uploads are matched to files by path. The server leaves files whose hash
+    matches the previous version out of the upload list, so order says
+    nothing and an upload without a known path is an error. A file is read
+    from disk only when its slot opens, so at most `concurrency` files are
+    in memory at once.
+    """
+    by_path = {f["path"]: f for f in files}
+    unknown = [u.get("path") for u in uploads if u.get("path") not in by_path]
+    if unknown:
+        raise RuntimeError(f"here.now requested uploads for paths not in the manifest: {unknown}")
+    sem = asyncio.Semaphore(concurrency)
+
+    async def put(upload):
+        file = by_path[upload["path"]]
+        async with sem:
+            if "content" in file:
+                body = file["content"]
+            else:
+                body = await asyncio.to_thread(Path(file["source"]).read_bytes)
+            await _make_request(
+                upload["url"], method="PUT", body=body,
+                headers=dict(upload.get("headers", {})), content_type=file["contentType"],
+            )
+
+    await asyncio.gather(*(put(u) for u in uploads))
+
+
+async def _still_published(slug, previous, token):
+    """Whether the site recorded in `previous` is still live at that version.
+
+    With a token the account's publishes are checked for the same version;
+    without one, only a recent, unexpired manifest is trusted.
+    """
+    output = previous.get("output") or {}
+    if token:
+        try:
+            resp = await http.get(
+                f"{BASE_URL}/publishes",
+                **http.headers(accept="json", extra={"Authorization": f"Bearer {token}"}),
+            )
+        except Exception:
+            return False
+        if not resp.get("ok"):
+            return False
+        for site in (resp.get("json") or {}).get("publishes", []):
+            if site.get("slug") == slug:
+                return site.get("status") == "active" and site.get("currentVersionId") == output.get("currentVersionId")
+        return False
+    if time.time() - (previous.get("savedAt") or 0) > MANIFEST_TTL:
+        return False
+    expires = output.get("expiresAt")
+    if expires:
+        try:
+            if datetime.fromisoformat(str(expires).replace("Z", "+00:00")) <= datetime.now(timezone.utc):
+                return False
+        except ValueError:
+            return False
+    return True
+
+
+async def _publish_files(files, title=None, description=None, slug=None, token=None, ttl=None):
+    """Declare all files in one manifest, upload concurrently, finalize.
+
+    `files` entries carry path/size/contentType/hash plus either `content`
+    (bytes) or `source` (a path on disk). Redeploying a slug whose files all
+    match the last publish from this machine, with no metadata change, and
+    whose site is still live at that version returns the previous result
+    without re-uploading.
+    """
+    token = _resolve_token(token)
+
+    if slug and not (title or description or ttl):
+        previous = _read_manifest(slug)
+        if (
+            previous
+            and previous.get("hashes") == {f["path"]: f["hash"] for f in files}
+            and await _still_published(slug, previous, token)
+        ):
+            return {**previous["output"], "unchanged": True}
 
     headers = {}
     if token:
@@ -192,11 +349,8 @@ def _do_publish(
 
     create_body = {
         "files": [
-            {
-                "path": filename,
-                "size": len(content_bytes),
-                "contentType": content_type,
-            }
+            {k: f[k] for k in ("path", "size", "contentType", "hash")}
+            for f in files
         ]
     }
 
@@ -212,10 +366,10 @@ def _do_publish(
 
     if slug:
         url = f"{BASE_URL}/publish/{slug}"
-        response = _make_request(url, method="PUT", body=create_body, headers=dict(headers))
+        response = await _make_request(url, method="PUT", body=create_body, headers=dict(headers))
     else:
         url = f"{BASE_URL}/publish"
-        response = _make_request(url, method="POST", body=create_body, headers=dict(headers))
+        response = await _make_request(url, method="POST", body=create_body, headers=dict(headers))
 
     slug_val = response.get("slug")
     site_url = response.get("siteUrl")
@@ -224,21 +378,20 @@ def _do_publish(
     finalize_url = upload_info.get("finalizeUrl")
     version_id = upload_info.get("versionId")
 
-    for upload in uploads:
-        put_url = upload["url"]
-        put_headers = dict(upload.get("headers", {}))
-        _make_request(put_url, method="PUT", body=content_bytes, headers=put_headers, content_type=content_type)
+    await _upload_all(uploads, files)
 
     finalize_headers = {}
     if token:
         finalize_headers["Authorization"] = f"Bearer {token}"
-    _make_request(finalize_url, method="POST", body={"versionId": version_id}, headers=finalize_headers)
+    await _make_request(finalize_url, method="POST", body={"versionId": version_id}, headers=finalize_headers)
 
     output = {
         "slug": slug_val,
         "siteUrl": site_url,
         "status": "active",
         "currentVersionId": version_id,
+        "fileCount": len(files),
+        "uploadedCount": len(uploads),
     }
     if title:
         output["viewer"] = {"title": title}
@@ -249,9 +402,36 @@ def _do_publish(
         output["claimToken"] = response.get("claimToken", "")
         output["claimUrl"] = response.get("claimUrl", "")
 
+    if slug_val:
+        # The claim token is shown once; don't persist it
+        _write_manifest(slug_val, files, {k: v for k, v in output.items() if k not in ("claimToken", "claimUrl")})
     return output
 
 
+async def _do_publish(
+    content,
+    filename="index.html",
+    content_type="text/html; charset=utf-8",
+    title=None,
+    description=None,
+    slug=None,
+    token=None,
+    ttl=None,
+):
+    """Core publish logic. Content can be str or bytes. Returns website entity dict."""
+    content_bytes = content.encode("utf-8") if isinstance(content, str) else content
+    file = {
+        "path": filename,
+        "size": len(content_bytes),
+        "contentType": content_type,
+        "hash": hashlib.sha256(content_bytes).hexdigest(),
+        "content": content_bytes,
+    }
+    return await _publish_files(
+        [file], title=title, description=description, slug=slug, token=token, ttl=ttl,
+    )
+
+
 @returns("website")
 @timeout(60)
 async def op_create_website(
@@ -265,7 +445,7 @@ async def op_create_website(
 ):
     """Entry point for python: executor. Create a new publish."""
     token = params.get("auth", {}).get("key", "")
-    return _do_publish(
+    return await _do_publish(
         content=content,
         filename=filename,
         content_type=content_type,
@@ -288,7 +468,7 @@ async def op_update_website(
 ):
     """Entry point for python: executor. Update an existing publish."""
     token = params.get("auth", {}).get("key", "")
-    return _do_publish(
+    return await _do_publish(
         content=content,
         filename=filename,
         content_type=content_type,
@@ -298,11 +478,42 @@ async def op_update_website(
     )
 
 
+@returns("website")
+@timeout(300)
+async def op_publish_directory(
+    directory,
+    slug=None,
+    title=None,
+    description=None,
+    ttl=None,
+    **params,
+):
+    """Publish every file under a local directory as one site.
+
+        Args:
+            directory: Local directory to publish (hidden files are skipped)
+            slug: Existing slug to update (omit to create a new site)
+            title: Human-readable site title
+            description: Site description
+            ttl: TTL in seconds (authenticated only)
+        """
+    token = params.get("auth", {}).get("key", "")
+    return await _publish_files(
+        await asyncio.to_thread(_collect_directory, directory),
+        title=title,
+        description=description,
+        slug=slug,
+        token=token,
+        ttl=ttl,
+    )
+
+
 def _main():
     parser = argparse.ArgumentParser(description="Publish files to here.now")
     parser.add_argument("--filename", default="index.html", help="File path within the publish")
     parser.add_argument("--content-type", default="text/html; charset=utf-8", dest="content_type")
     parser.add_argument("--content", help="File content (reads from stdin if omitted)")
+    parser.add_argument("--dir", help="Publish every file under this directory instead")
     parser.add_argument("--title", help="Human-readable site title")
     parser.add_argument("--description", help="Site description")
     parser.add_argument("--ttl", type=int, help="TTL in seconds (authenticated only)")
@@ -310,8 +521,20 @@ def _main():
     parser.add_argument("--slug", help="Existing slug to update (omit to create new)")
     args = parser.parse_args()
 
+    if args.dir:
+        output = asyncio.run(_publish_files(
+            _collect_directory(args.dir),
+            title=args.title,
+            description=args.description,
+            slug=args.slug,
+            token=args.token or "",
+            ttl=args.ttl,
+        ))
+        print(json.dumps(output))
+        return
+
     content = args.content if args.content else sys.stdin.read()
-    output = _do_publish(
+    output = asyncio.run(_do_publish(
         content=content,
         filename=args.filename,
         content_type=args.content_type,
@@ -320,7 +543,7 @@ def _main():
         slug=args.slug,
         token=args.token or "",
         ttl=args.ttl,
-    )
+    ))
     print(json.dumps(output))
 
 
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 
+import asyncio
 import base64
+import fnmatch
 import grp
+import heapq
 import json
 import math
 import mimetypes
+import mmap
 import os
 import pwd
 import stat
@@ -706,49 +710,245 @@ def _entry_from_direntry(entry):
     return result
 
 
+def _light_entry(entry):
+    """Name/kind/path only — enough for name and kind sorts without a stat."""
+    try:
+        is_dir = entry.is_dir(follow_symlinks=True)
+        is_symlink = entry.is_symlink()
+    except OSError:
+        return None
+    return {
+        "name": entry.name,
+        "kind": "dir" if is_dir else ("symlink" if is_symlink else "file"),
+        "path": entry.path,
+        "_entry": entry,
+    }
+
+
 SORT_KEYS = {
     "name": lambda e: (e["kind"] != "dir", e["name"].lower()),
     "size": lambda e: (e["kind"] != "dir", -(e["size"] or 0), e["name"].lower()),
     "modified": lambda e: (e["kind"] != "dir", e["modified"] or "", e["name"].lower()),
     "kind": lambda e: (e["kind"], e["name"].lower()),
 }
+# Sorts that only look at name/kind, so entries can be ranked before stat
+_LIGHT_SORTS = {"name", "kind"}
 
+STAT_BATCH = 2048
+STAT_WORKERS = 8
+WALK_MAX_DEPTH = 5
+WALK_MAX_ENTRIES = 50_000
 
-@returns({"path": "string", "entries": "{'type': 'array', 'description': 'File and folder entries with shape-compatible fields'}", "count": "integer"})
-@provides(file_list)
-@timeout(10)
-async def list_directory(*, path=None, show_hidden=False, sort=None, **_kwargs):
-    """List contents of a directory. Returns file and folder shapes."""
-    resolved = os.path.expanduser(path or "~")
-    resolved = os.path.abspath(resolved)
 
-    if not os.path.isdir(resolved):
-        raise ValueError(f"Not a directory: {resolved}")
+def _page_key(sort):
+    """Sort key with the path as a unique tiebreaker, so cursors are exact."""
+    key = SORT_KEYS[sort]
+    return lambda e: (*key(e), e["path"])
+
+
+def _encode_cursor(sort, key):
+    return base64.urlsafe_b64encode(json.dumps([sort, list(key)]).encode()).decode("ascii")
+
+
+def _decode_cursor(cursor, sort):
+    try:
+        cursor_sort, key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was issued for sort={cursor_sort}, not sort={sort}")
+    return tuple(key)
+
+
+def _stat_batch(direntries):
+    return [item for item in map(_entry_from_direntry, direntries) if item]
+
+
+async def _stat_parallel(direntries):
+    """Stat a batch of DirEntries across worker threads."""
+    size = max(1, -(-len(direntries) // STAT_WORKERS))
+    parts = [direntries[i:i + size] for i in range(0, len(direntries), size)]
+    results = await asyncio.gather(*(asyncio.to_thread(_stat_batch, part) for part in parts))
+    return [item for part in results for item in part]
+
+
+def _top(items, key_fn, after, limit):
+    """Entries after the cursor, smallest first; at most limit + 1 when limited."""
+    if after is not None:
+        items = (e for e in items if key_fn(e) > after)
+    if limit is None:
+        return sorted(items, key=key_fn)
+    return heapq.nsmallest(limit + 1, items, key=key_fn)
+
+
+async def _list_flat(resolved, show_hidden, pattern, sort, after, limit):
+    """One directory level, streamed from scandir.
+
+    With a limit only the best limit + 1 entries are kept (a heap merge per
+    batch), and for name/kind sorts only those entries are ever stat'ed.
+    """
+    key_fn = _page_key(sort)
+    light = sort in _LIGHT_SORTS
+    kept, batch = [], []
+
+    async def flush():
+        nonlocal kept, batch
+        items = [e for e in map(_light_entry, batch) if e] if light else await _stat_parallel(batch)
+        kept = _top(kept + items, key_fn, after, limit) if limit is not None else kept + items
+        batch = []
 
-    entries = []
     with os.scandir(resolved) as scanner:
         for entry in scanner:
             if not show_hidden and entry.name.startswith("."):
                 continue
-            item = _entry_from_direntry(entry)
-            if item:
+            if pattern and not fnmatch.fnmatch(entry.name, pattern):
+                continue
+            batch.append(entry)
+            if len(batch) >= STAT_BATCH:
+                await flush()
+    await flush()
+    if limit is None:
+        kept = _top(kept, key_fn, after, None)
+
+    if light:
+        kept = await _stat_parallel([e["_entry"] for e in kept])
+    return kept, False
+
+
+def _scan_dir(path, show_hidden):
+    """Stat every entry of one directory (runs in a worker thread)."""
+    try:
+        with os.scandir(path) as scanner:
+            return _stat_batch([e for e in scanner if show_hidden or not e.name.startswith(".")])
+    except OSError:
+        return []
+
+
+async def _list_recursive(resolved, show_hidden, max_depth, pattern):
+    """Breadth-first walk, one worker-thread scan per directory.
+
+    Symlinked directories aren't followed. Stops after WALK_MAX_ENTRIES
+    entries and reports that the walk was truncated.
+    """
+    entries, level, truncated = [], [resolved], False
+    sem = asyncio.Semaphore(STAT_WORKERS * 2)
+
+    async def scan(path):
+        async with sem:
+            return await asyncio.to_thread(_scan_dir, path, show_hidden)
+
+    for depth in range(max_depth):
+        if not level:
+            break
+        next_level = []
+        for items in await asyncio.gather(*(scan(d) for d in level)):
+            for item in items:
+                if item["kind"] == "dir" and not os.path.islink(item["path"]):
+                    next_level.append(item["path"])
+                if pattern and not fnmatch.fnmatch(item["name"], pattern):
+                    continue
+                item["depth"] = depth
                 entries.append(item)
+        if len(entries) >= WALK_MAX_ENTRIES:
+            entries, truncated = entries[:WALK_MAX_ENTRIES], True
+            break
+        level = next_level
+    return entries, truncated
 
-    sort_fn = SORT_KEYS.get(sort or "name", SORT_KEYS["name"])
-    entries.sort(key=sort_fn)
 
-    return {
-        "path": resolved,
-        "entries": entries,
-        "count": len(entries),
-    }
+@returns({"path": "string", "entries": "{'type': 'array', 'description': 'File and folder entries with shape-compatible fields'}", "count": "integer", "nextCursor": "string", "truncated": "boolean"})
+@provides(file_list)
+@timeout(30)
+async def list_directory(*, path=None, show_hidden=False, sort=None, limit=None, cursor=None,
+                         recursive=False, max_depth=None, glob=None, **_kwargs):
+    """List contents of a directory. Returns file and folder shapes.
+
+    With `limit`, returns one page plus `nextCursor`; pass it back as `cursor`
+    for the next page. `recursive` walks subdirectories up to `max_depth`
+    levels (default 5), keeping entries whose name matches `glob`.
+    """
+    resolved = os.path.expanduser(path or "~")
+    resolved = os.path.abspath(resolved)
 
+    if not os.path.isdir(resolved):
+        raise ValueError(f"Not a directory: {resolved}")
+
+    sort = sort if sort in SORT_KEYS else "name"
+    limit = _normalize_limit(limit) or None
+    after = _decode_cursor(cursor, sort) if cursor else None
+    key_fn = _page_key(sort)
+
+    if recursive:
+        walked, truncated = await _list_recursive(
+            resolved, show_hidden, int(max_depth or WALK_MAX_DEPTH), glob
+        )
+        entries = _top(walked, key_fn, after, limit)
+    else:
+        entries, truncated = await _list_flat(resolved, show_hidden, glob, sort, after, limit)
+
+    result = {"path": resolved, "entries": entries, "count": len(entries)}
+    if limit is not None and len(entries) > limit:
+        entries = entries[:limit]
+        result.update(entries=entries, count=limit, nextCursor=_encode_cursor(sort, key_fn(entries[-1])))
+    if truncated:
+        result["truncated"] = True
+    return result
 
-@returns({"name": "string", "path": "string", "content": "string", "encoding": "string", "mimeType": "string", "size": "integer"})
+
+# base64 is produced in slices this size (a multiple of 3, so the encoded
+# slices concatenate cleanly) instead of encoding one large bytes copy.
+B64_CHUNK = 3 * 256 * 1024
+
+
+def _b64_range(mm, start, end):
+    return b"".join(
+        base64.b64encode(mm[pos:min(pos + B64_CHUNK, end)])
+        for pos in range(start, end, B64_CHUNK)
+    ).decode("ascii")
+
+
+def _line_range(mm, size, start_line, end_line):
+    """Byte range covering 1-based lines start_line..end_line (inclusive)."""
+    start = 0
+    for _ in range(max(start_line, 1) - 1):
+        nl = mm.find(b"\n", start)
+        if nl < 0:
+            return size, size
+        start = nl + 1
+    if end_line is None:
+        return start, size
+    end = start
+    for _ in range(max(end_line - max(start_line, 1) + 1, 0)):
+        nl = mm.find(b"\n", end)
+        if nl < 0:
+            return start, size
+        end = nl + 1
+    return start, end
+
+
+def _tail_range(mm, size, lines):
+    """Byte range covering the last `lines` lines, found by searching back from the end."""
+    end = size
+    pos = size - 1 if size and mm[size - 1:size] == b"\n" else size
+    for _ in range(lines):
+        nl = mm.rfind(b"\n", 0, pos)
+        if nl < 0:
+            return 0, end
+        pos = nl
+    return pos + 1, end
+
+
+@returns({"name": "string", "path": "string", "content": "string", "encoding": "string", "mimeType": "string", "size": "integer", "offset": "integer", "length": "integer", "nextOffset": "integer"})
 @provides(file_read)
 @timeout(10)
-async def read_file(*, path, **_kwargs):
-    """Read file contents. Text as UTF-8 string, binary as base64."""
+async def read_file(*, path, offset=None, length=None, start_line=None, end_line=None, tail=None, **_kwargs):
+    """Read file contents. Text as UTF-8 string, binary as base64.
+
+    Reads the whole file by default. For part of a file, pass a byte range
+    (`offset`/`length`), a 1-based inclusive line range (`start_line`/
+    `end_line`), or `tail` for the last N lines. `nextOffset` is set when
+    the read stopped before the end of the file.
+    """
     resolved = os.path.expanduser(path)
     resolved = os.path.abspath(resolved)
 
@@ -757,22 +957,44 @@ async def read_file(*, path, **_kwargs):
 
     file_size = os.path.getsize(resolved)
     is_text = _is_text_file(resolved)
+    max_bytes = MAX_TEXT_BYTES if is_text else MAX_BINARY_BYTES
+    ranged = any(v is not None for v in (offset, length, start_line, end_line, tail))
+
+    if not ranged and file_size > max_bytes:
+        kind = "text" if is_text else "binary"
+        raise ValueError(
+            f"File too large for {kind} read: {_format_size(file_size)} (max {_format_size(max_bytes)}). "
+            "Pass offset/length, start_line/end_line, or tail to read part of it."
+        )
 
-    if is_text and file_size > MAX_TEXT_BYTES:
-        raise ValueError(f"File too large for text read: {_format_size(file_size)} (max {_format_size(MAX_TEXT_BYTES)})")
-    if not is_text and file_size > MAX_BINARY_BYTES:
-        raise ValueError(f"File too large for binary read: {_format_size(file_size)} (max {_format_size(MAX_BINARY_BYTES)})")
-
-    if is_text:
-        with open(resolved, "r", encoding="utf-8", errors="replace") as f:
-            content = f.read()
-        encoding = "utf-8"
-    else:
-        with open(resolved, "rb") as f:
-            content = base64.b64encode(f.read()).decode("ascii")
-        encoding = "base64"
+    start, end = 0, file_size
+    with open(resolved, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if file_size else b""
+        try:
+            if tail is not None:
+                start, end = _tail_range(mm, file_size, int(tail))
+            elif start_line is not None or end_line is not None:
+                start, end = _line_range(
+                    mm, file_size, int(start_line or 1),
+                    int(end_line) if end_line is not None else None,
+                )
+            if offset is not None:
+                start = min(max(int(offset), 0), file_size)
+            if length is not None:
+                end = min(start + max(int(length), 0), end)
+            end = max(start, min(end, start + max_bytes))
+
+            if is_text:
+                content = mm[start:end].decode("utf-8", errors="replace")
+                encoding = "utf-8"
+            else:
+                content = _b64_range(mm, start, end)
+                encoding = "base64"
+        finally:
+            if file_size:
+                mm.close()
 
-    return {
+    result = {
         "name": os.path.basename(resolved),
         "path": resolved,
         "content": content,
@@ -780,6 +1002,11 @@ async def read_file(*, path, **_kwargs):
         "mimeType": _mime_for_path(resolved),
         "size": file_size,
     }
+    if ranged:
+        result.update(offset=start, length=end - start)
+        if end < file_size:
+            result["nextOffset"] = end
+    return result
 
 
 async def _get_volumes():
@@ -1,10 +1,28 @@
 """Hacker News — public Algolia API, no auth required."""
 
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
 from agentos import http, provides, returns, web_read, web_search
 
 BASE = "https://hn.algolia.com/api/v1"
 SITE = "https://news.ycombinator.com"
 
+# Algolia /items/{id} trees, one file per story. How long a copy stays fresh
+# depends on the story's age: new threads change by the minute, threads past
+# HN's two-week reply window never change again.
+ITEM_CACHE_DIR = Path.home() / ".agentos" / "cache" / "hackernews" / "items"
+_ITEM_TTLS = [  # (story younger than, cache for) in seconds
+    (3600, 60),
+    (86400, 300),
+    (7 * 86400, 3600),
+    (14 * 86400, 6 * 3600),
+]
+_ARCHIVED_TTL = 30 * 86400
+
 
 def _post_url(object_id: str) -> str:
     return f"{SITE}/item?id={object_id}"
@@ -36,6 +54,70 @@ def _map_hit(hit: dict) -> dict:
     }
 
 
+def _item_ttl(item: dict) -> int:
+    created = item.get("created_at_i") or 0
+    age = time.time() - created
+    for younger_than, ttl in _ITEM_TTLS:
+        if age < younger_than:
+            return ttl
+    return _ARCHIVED_TTL
+
+
+def _write_item_cache(path: Path, item: dict) -> None:
+    try:
+        ITEM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=ITEM_CACHE_DIR, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump({"fetched_at": time.time(), "item": item}, f)
+        os.replace(tmp, path)
+    except (OSError, ValueError, RecursionError):
+        # Pathologically deep trees can't round-trip through json; skip them
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+async def _fetch_item(item_id: str) -> dict:
+    """GET /items/{id}, served from the item cache while still fresh."""
+    path = ITEM_CACHE_DIR / f"{item_id}.json"
+    try:
+        cached = json.loads(path.read_text())
+        if time.time() - cached["fetched_at"] < _item_ttl(cached["item"]):
+            return cached["item"]
+    except (OSError, ValueError, KeyError, TypeError, RecursionError):
+        pass
+
+    resp = await http.get(f"{BASE}/items/{item_id}")
+    item = resp["json"]
+    if resp.get("ok", True) and isinstance(item, dict):
+        _write_item_cache(path, item)
+    return item
+
+
+def _walk(root: dict):
+    """Yield (node, parent_id) depth-first, parents before their replies.
+
+    Uses an explicit stack of child iterators instead of recursion, so deep
+    threads can't hit the recursion limit and the walk holds only one
+    iterator per level.
+    """
+    yield root, None
+    stack = [(str(root.get("id", "")), iter(root.get("children") or []))]
+    while stack:
+        parent_id, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            continue
+        yield child, parent_id
+        if child.get("children"):
+            stack.append((str(child.get("id", "")), iter(child["children"])))
+
+
 def _map_item(item: dict) -> dict:
     """Map an Algolia items API response to shape-native post fields."""
     item_id = str(item.get("id", ""))
@@ -56,9 +138,19 @@ def _map_item(item: dict) -> dict:
                 "name": cauthor,
                 "url": _user_url(cauthor),
             } if cauthor else None,
-            "replies": [map_comment(child) for child in c.get("children", [])],
+            "replies": [],
         }
 
+    # Build the nested replies without recursion: each mapped comment is
+    # attached to its parent's list as the walk reaches it.
+    replies_of = {item_id: []}
+    for node, parent_id in _walk(item):
+        if parent_id is None:
+            continue
+        mapped = map_comment(node)
+        replies_of[parent_id].append(mapped)
+        replies_of[mapped["id"]] = mapped["replies"]
+
     return {
         "id": item_id,
         "name": item.get("title"),
@@ -74,7 +166,7 @@ def _map_item(item: dict) -> dict:
             "name": author,
             "url": _user_url(author),
         } if author else None,
-        "replies": [map_comment(c) for c in children],
+        "replies": replies_of[item_id],
     }
 
 
@@ -134,24 +226,23 @@ async def get_post(id: str = None, url: str = None, **params) -> dict:
         from agentos import skill_error
         return skill_error("Either id or url with id= parameter is required")
 
-    resp = await http.get(f"{BASE}/items/{id}")
-
-    return _map_item(resp["json"])
+    return _map_item(await _fetch_item(id))
 
 
 @returns("post[]")
-async def comments_post(id: str, **params) -> list[dict]:
+async def comments_post(id: str, limit: int = None, **params) -> list[dict]:
     """Flatten comment tree into a list with repliesTo relations.
 
     Args:
         id: Story ID to get comments for
+        limit: Stop after this many posts (story first, then comments depth-first)
     """
-    resp = await http.get(f"{BASE}/items/{id}")
-
-    item = resp["json"]
+    item = await _fetch_item(id)
     result = []
 
-    def flatten(node: dict, parent_id: str | None):
+    for node, parent_id in _walk(item):
+        if limit is not None and len(result) >= int(limit):
+            break
         nid = str(node.get("id", ""))
         author = node.get("author", "")
         post = {
@@ -173,8 +264,5 @@ async def comments_post(id: str, **params) -> list[dict]:
         if parent_id:
             post["repliesTo"] = {"id": parent_id}
         result.append(post)
-        for child in node.get("children", []):
-            flatten(child, nid)
 
-    flatten(item, None)
     return result
@@ -2,27 +2,18 @@
 
 yt-dlp is installed as a Homebrew formula with its own Python venv.
 We add its site-packages to sys.path so we can use the Python API
-directly (no subprocess, no temp files, no jq).
+directly (no subprocess, no temp files, no jq). The path setup and import
+are deferred to the first extraction — importing yt_dlp costs hundreds of
+milliseconds and get_avatar_channel never needs it.
 """
 
+import asyncio
 import glob
 import sys
 import json
+import time
 from agentos import http, provides, returns, web_read
 
-# Add yt-dlp's own site-packages to path (stable symlink, version-agnostic)
-_ytdlp_paths = glob.glob("/opt/homebrew/opt/yt-dlp/libexec/lib/python*/site-packages")
-for _p in _ytdlp_paths:
-    if _p not in sys.path:
-        sys.path.insert(0, _p)
-
-try:
-    import yt_dlp
-except ImportError as e:
-    raise ImportError(
-        "yt-dlp is required: brew install yt-dlp"
-    ) from e
-
 SITE = "https://www.youtube.com"
 
 _BASE_OPTS = {
@@ -105,11 +96,79 @@ def _map_full_info(info: dict) -> dict:
     return result
 
 
-def _ydl(extra: dict | None = None) -> yt_dlp.YoutubeDL:
+# extract_info results by (option set, URL). get_video and transcript_video
+# share an option set, so reading both for one URL extracts once.
+INFO_TTL = 600
+_INFO_CACHE_MAX = 64
+_info_cache: dict[tuple[str, str], tuple[float, dict]] = {}
+_inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+# Warmed YoutubeDL instances per option set. An instance isn't safe to use
+# from two threads at once, so each extraction checks one out of the pool.
+_idle_extractors: dict[str, list] = {}
+
+
+def _yt_dlp():
+    """Import yt_dlp on first use."""
+    # Add yt-dlp's own site-packages to path (stable symlink, version-agnostic)
+    for p in glob.glob("/opt/homebrew/opt/yt-dlp/libexec/lib/python*/site-packages"):
+        if p not in sys.path:
+            sys.path.insert(0, p)
+    try:
+        import yt_dlp
+    except ImportError as e:
+        raise ImportError(
+            "yt-dlp is required: brew install yt-dlp"
+        ) from e
+    return yt_dlp
+
+
+def _opts(extra: dict | None = None) -> dict:
     opts = dict(_BASE_OPTS)
     if extra:
         opts.update(extra)
-    return yt_dlp.YoutubeDL(opts)
+    return opts
+
+
+def _extract_sync(opts_key: str, opts: dict, url: str) -> dict:
+    pool = _idle_extractors.setdefault(opts_key, [])
+    ydl = pool.pop() if pool else _yt_dlp().YoutubeDL(opts)
+    try:
+        return ydl.extract_info(url, download=False)
+    finally:
+        pool.append(ydl)
+
+
+async def _extract_and_cache(key: tuple[str, str], opts: dict, url: str) -> dict:
+    try:
+        info = await asyncio.to_thread(_extract_sync, key[0], opts, url)
+    finally:
+        _inflight.pop(key, None)
+    _info_cache[key] = (time.monotonic(), info)
+    if len(_info_cache) > _INFO_CACHE_MAX:
+        oldest = min(_info_cache, key=lambda k: _info_cache[k][0])
+        del _info_cache[oldest]
+    return info
+
+
+async def _extract(url: str, extra: dict | None = None) -> dict:
+    """extract_info off the event loop, cached for INFO_TTL seconds.
+
+    Concurrent calls for the same URL and options share one extraction. It
+    runs as its own task, so a caller that is cancelled only stops waiting:
+    the others still get the result, and it still lands in the cache.
+    """
+    opts = _opts(extra)
+    key = (json.dumps(opts, sort_keys=True), url)
+    hit = _info_cache.get(key)
+    if hit and time.monotonic() - hit[0] < INFO_TTL:
+        return hit[1]
+    task = _inflight.get(key)
+    if task is None:
+        task = _inflight[key] = asyncio.ensure_future(_extract_and_cache(key, opts, url))
+        # Mark a failure retrieved even if every caller has given up
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    return await asyncio.shield(task)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -124,8 +183,7 @@ async def search_videos(query: str, limit: int = 50, **params) -> list[dict]:
             query: Search query
             limit: Number of results
         """
-    with _ydl({"extractFlat": "in_playlist"}) as ydl:
-        info = ydl.extract_info(f"ytsearch{limit}:{query}", download=False)
+    info = await _extract(f"ytsearch{limit}:{query}", {"extractFlat": "in_playlist"})
     return [_map_flat_entry(e) for e in (info.get("entries") or [])]
 
 
@@ -137,8 +195,7 @@ async def search_recent_video(query: str, limit: int = 50, **params) -> list[dic
             query: Search query
             limit: Number of results
         """
-    with _ydl({"extractFlat": "in_playlist"}) as ydl:
-        info = ydl.extract_info(f"ytsearchdate{limit}:{query}", download=False)
+    info = await _extract(f"ytsearchdate{limit}:{query}", {"extractFlat": "in_playlist"})
     return [_map_flat_entry(e) for e in (info.get("entries") or [])]
 
 
@@ -150,8 +207,7 @@ async def list_videos(url: str, limit: int = 50, **params) -> list[dict]:
             url: YouTube channel URL (e.g., youtube.com/@channelname) or playlist URL
             limit: Number of videos to return
         """
-    with _ydl({"extractFlat": "in_playlist", "playlistend": limit}) as ydl:
-        info = ydl.extract_info(url, download=False)
+    info = await _extract(url, {"extractFlat": "in_playlist", "playlistend": limit})
     return [_map_flat_entry(e) for e in (info.get("entries") or [])]
 
 
@@ -162,8 +218,7 @@ async def get_video(url: str, **params) -> dict:
         Args:
             url: YouTube video URL
         """
-    with _ydl() as ydl:
-        info = ydl.extract_info(url, download=False)
+    info = await _extract(url)
     return _map_full_info(info)
 
 
@@ -171,8 +226,7 @@ async def get_video(url: str, **params) -> dict:
 @provides(web_read, urls=["youtube.com/*", "youtu.be/*", "music.youtube.com/*"])
 async def transcript_video(url: str, lang: str = "en", format: str = "text", **params) -> dict:
     """Fetch video metadata + transcript. No temp files — captions fetched in memory."""
-    with _ydl() as ydl:
-        info = ydl.extract_info(url, download=False)
+    info = await _extract(url)
 
     vid = _map_full_info(info)
 
@@ -240,8 +294,7 @@ async def get_channel(url: str, **params) -> dict:
         Args:
             url: YouTube channel URL
         """
-    with _ydl({"extractFlat": True, "playlistend": 0}) as ydl:
-        info = ydl.extract_info(url, download=False)
+    info = await _extract(url, {"extractFlat": True, "playlistend": 0})
 
     thumbnails = info.get("thumbnails") or []
     # Avatar = square thumbnail; banner = wide one
@@ -281,12 +334,10 @@ async def get_avatar_channel(url: str, **params) -> dict:
 @returns("post[]")
 async def list_posts(url: str, limit: int = 50, **params) -> list[dict]:
     """List comments on a video as post entities."""
-    opts = {
+    info = await _extract(url, {
         "getcomments": True,
         "extractorArgs": {"youtube": {"maxComments": [str(limit), "all", "all", "100"]}},
-    }
-    with _ydl(opts) as ydl:
-        info = ydl.extract_info(url, download=False)
+    })
 
     vid_id = info.get("id", "")
     # Root post entity for the video itself (comments reply to this)
@@ -4,14 +4,39 @@ Auth token lives in params["auth"]["access_token"], injected by the engine
 from the Mimestream OAuth provider (googleapis.com / calendar.events scope).
 """
 
+import asyncio
 import base64
+import hashlib
+import heapq
+import json
+import os
 import re
+import sys
+import tempfile
+import time
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from agentos import http, connection, provides, returns, timeout, web_read
 
 BASE_URL = "https://www.googleapis.com/calendar/v3"
 
+# Per-calendar event mirrors kept current with events.list syncTokens
+MIRROR_DIR = Path.home() / ".agentos" / "cache" / "google-calendar"
+_PAGE_SIZE = 2500  # events.list maximum
+SYNC_TTL = 120  # seconds a mirror read trusts the last sync
+
+# In-process state: mirror path -> (monotonic sync time, mirror), and
+# access-token digest -> account identity
+_mirrors = {}
+_accounts = {}
+TIMELINE_CONCURRENCY = 6
+
+# Cleaned descriptions keyed by content digest — recurring instances share one
+_cleaned = {}
+_CLEANED_MAX = 1024
+
 VIRTUAL_PATTERNS = [
     (r'https?://meet\.google\.com/[a-z]{3}-[a-z]{4}-[a-z]{3}', 'Google Meet'),
     (r'https?://(?:[a-z0-9]+\.)?zoom\.us/(?:j|my)/\S+', 'Zoom'),
@@ -36,9 +61,20 @@ def _auth_header(params):
 
 
 def _clean_html(text):
-    """Convert HTML description to plain text via lxml."""
+    """Convert HTML description to plain text, memoized by content hash."""
     if not text or "<" not in text:
         return text or ""
+    digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+    cleaned = _cleaned.get(digest)
+    if cleaned is None:
+        if len(_cleaned) >= _CLEANED_MAX:
+            _cleaned.pop(next(iter(_cleaned)))
+        cleaned = _cleaned[digest] = _html_to_text(text)
+    return cleaned
+
+
+def _html_to_text(text):
+    """Convert HTML description to plain text via lxml."""
     try:
         from lxml import html as lxml_html
         from lxml import etree
@@ -329,6 +365,272 @@ def _extract_event_id_from_url(url):
     return parts[-1] if parts else None
 
 
+# ==============================================================================
+# Paging and the local event mirror
+# ==============================================================================
+
+
+class _SyncTokenExpired(Exception):
+    """Google answered 410 Gone — the sync token is no longer valid."""
+
+
+async def _list_pages(headers, calendar_id, query_params, limit=None, strict=False):
+    """Follow nextPageToken through events.list.
+
+    Returns (items, last_page) where last_page is the final response body
+    (nextPageToken, nextSyncToken, timeZone). Stops early once `limit` items
+    are in hand. An error page ends the walk with what was collected, unless
+    `strict` — syncing must not mistake a failed page for the end of the list.
+    """
+    items = []
+    query_params = dict(query_params)
+    while True:
+        resp = await http.get(
+            f"{BASE_URL}/calendars/{http.encode(calendar_id)}/events",
+            params=query_params, **http.headers(accept="json", extra=headers),
+        )
+        if strict and resp.get("status") == 410:
+            raise _SyncTokenExpired()
+        if not resp.get("ok", True):
+            if strict:
+                raise RuntimeError(f"Calendar API error {resp.get('status')}: {(resp.get('body') or '')[:200]}")
+            return items, {}
+        data = resp["json"] or {}
+        items.extend(data.get("items", []))
+        page_token = data.get("nextPageToken")
+        if not page_token or (limit is not None and len(items) >= limit):
+            return items, data
+        query_params["pageToken"] = page_token
+
+
+async def _account_key(params):
+    """Stable identity for the signed-in account: its primary calendar id.
+
+    Looked up once per access token; the account param is only a fallback
+    for when Google can't be asked.
+    """
+    token = (params.get("auth") or {}).get("access_token") or ""
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    if digest not in _accounts:
+        resp = await http.get(f"{BASE_URL}/users/me/calendarList/primary",
+                              **http.headers(accept="json", extra=_auth_header(params)))
+        ident = (resp["json"] or {}).get("id") if resp.get("ok", True) else None
+        if not ident:
+            return params.get("account") or "default"
+        _accounts[digest] = ident
+    return _accounts[digest]
+
+
+async def _mirror_path(params, calendar_id):
+    account = await _account_key(params)
+    name = hashlib.sha256(f"{account}\0{calendar_id}".encode()).hexdigest()[:16]
+    return MIRROR_DIR / f"{name}.json"
+
+
+def _load_mirror(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _save_mirror(path, mirror):
+    """Write the mirror atomically. Best-effort: a failed write only costs a resync."""
+    tmp = None
+    try:
+        MIRROR_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=MIRROR_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(mirror, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: could not save calendar mirror: {e}", file=sys.stderr)
+        if tmp:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def _apply_changes(mirror, items, page):
+    """Fold an incremental events.list result into the mirror."""
+    events = mirror["events"]
+    for item in items:
+        if item.get("status") == "cancelled":
+            events.pop(item.get("id"), None)
+        else:
+            events[item["id"]] = item
+    mirror.update(sync_token=page.get("nextSyncToken") or mirror["sync_token"],
+                  time_zone=page.get("timeZone") or mirror.get("time_zone"),
+                  changed=len(items))
+
+
+async def _sync_mirror(params, calendar_id, full=False):
+    """Bring the calendar's mirror up to date and return it.
+
+    With a stored syncToken only changes since the last sync are fetched
+    (cancelled events are dropped). A 410 from Google, or no mirror yet,
+    triggers a full resync of every event instance.
+    """
+    headers = _auth_header(params)
+    path = await _mirror_path(params, calendar_id)
+    mirror = None if full else _load_mirror(path)
+    base = {"singleEvents": "true", "maxResults": str(_PAGE_SIZE), "showDeleted": "true"}
+
+    if mirror and mirror.get("sync_token"):
+        try:
+            items, page = await _list_pages(
+                headers, calendar_id, {**base, "syncToken": mirror["sync_token"]}, strict=True,
+            )
+        except _SyncTokenExpired:
+            mirror = None
+        else:
+            _apply_changes(mirror, items, page)
+
+    if not mirror or not mirror.get("sync_token"):
+        items, page = await _list_pages(headers, calendar_id, base, strict=True)
+        mirror = {
+            "calendar_id": calendar_id,
+            "sync_token": page.get("nextSyncToken"),
+            "time_zone": page.get("timeZone"),
+            "events": {e["id"]: e for e in items if e.get("status") != "cancelled"},
+            "changed": len(items),
+        }
+
+    mirror["synced_at"] = datetime.now(timezone.utc).isoformat()
+    _save_mirror(path, mirror)
+    _mirrors[path] = (time.monotonic(), mirror)
+    return mirror
+
+
+async def _fresh_mirror(params, calendar_id):
+    """The calendar's mirror for a read, or None if there is none to read.
+
+    A mirror synced within SYNC_TTL is used as is; an older one gets an
+    incremental sync, and is served stale if that fails. Reads never start
+    a full download — without a mirror (or with an expired sync token) the
+    caller falls back to the API until sync_events is run.
+    """
+    path = await _mirror_path(params, calendar_id)
+    cached = _mirrors.get(path)
+    if cached and time.monotonic() - cached[0] < SYNC_TTL:
+        return cached[1]
+    mirror = cached[1] if cached else _load_mirror(path)
+    if not mirror or not mirror.get("sync_token"):
+        return None
+    try:
+        items, page = await _list_pages(
+            _auth_header(params), calendar_id,
+            {"singleEvents": "true", "maxResults": str(_PAGE_SIZE), "showDeleted": "true",
+             "syncToken": mirror["sync_token"]},
+            strict=True,
+        )
+    except _SyncTokenExpired:
+        return None
+    except Exception as e:
+        print(f"Warning: calendar mirror sync failed, serving last copy: {e}", file=sys.stderr)
+        _mirrors[path] = (time.monotonic(), mirror)
+        return mirror
+    _apply_changes(mirror, items, page)
+    mirror["synced_at"] = datetime.now(timezone.utc).isoformat()
+    if items:
+        _save_mirror(path, mirror)
+    _mirrors[path] = (time.monotonic(), mirror)
+    return mirror
+
+
+def _zone(name):
+    try:
+        return ZoneInfo(name) if name else timezone.utc
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+
+def _parse_event_time(value, tz=None):
+    """Event start/end dict → aware datetime.
+
+    All-day dates are midnight in the event's own timeZone, else `tz` (the
+    calendar's time zone), else UTC.
+    """
+    if not value:
+        return None
+    raw = value.get("dateTime") or value.get("date")
+    if not raw:
+        return None
+    try:
+        dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo:
+        return dt
+    return dt.replace(tzinfo=_zone(value.get("timeZone") or tz))
+
+
+def _window(days, past):
+    now = datetime.now(timezone.utc)
+    if past:
+        return now - timedelta(days=days), now
+    return now, now + timedelta(days=days)
+
+
+def _mirror_window(mirror, time_min, time_max, query=None):
+    """Raw events overlapping [time_min, time_max), ordered by start."""
+    needle = query.lower() if query else None
+    tz = mirror.get("time_zone")
+    hits = []
+    for event in mirror["events"].values():
+        start = _parse_event_time(event.get("start"), tz)
+        end = _parse_event_time(event.get("end"), tz) or start
+        if not start or start >= time_max or end <= time_min:
+            continue
+        if needle:
+            haystack = " ".join(
+                [event.get("summary") or "", event.get("description") or "", event.get("location") or ""]
+                + [a.get("email", "") + " " + a.get("displayName", "") for a in event.get("attendees", [])]
+            ).lower()
+            if needle not in haystack:
+                continue
+        hits.append((start, event))
+    hits.sort(key=lambda pair: pair[0])
+    return [event for _, event in hits]
+
+
+async def _window_events(params, calendar_id, time_min, time_max, query,
+                         limit, page_token=None, source="api", strict=False):
+    """Raw events overlapping the window, in start order, at most `limit`.
+
+    Returns (items, time_zone). source="mirror" answers locally when a
+    mirror exists and falls back to the API otherwise. `strict` raises on
+    API errors instead of returning what was collected.
+    """
+    if source == "mirror":
+        mirror = await _fresh_mirror(params, calendar_id)
+        if mirror is not None:
+            return _mirror_window(mirror, time_min, time_max, query)[:limit], mirror.get("time_zone")
+
+    query_params = {
+        "timeMin": time_min.isoformat(),
+        "timeMax": time_max.isoformat(),
+        "maxResults": str(min(limit, _PAGE_SIZE)),
+        "singleEvents": "true",
+        "orderBy": "startTime",
+    }
+    if query:
+        query_params["q"] = query
+    if page_token:
+        query_params["pageToken"] = page_token
+    items, page = await _list_pages(_auth_header(params), calendar_id, query_params, limit, strict)
+    return items[:limit], page.get("timeZone")
+
+
+async def _selected_calendar_ids(params):
+    resp = await http.get(f"{BASE_URL}/users/me/calendarList",
+                          **http.headers(accept="json", extra=_auth_header(params)))
+    items = (resp["json"] or {}).get("items", [])
+    return [c["id"] for c in items if c.get("selected") or c.get("primary")]
+
+
 # ==============================================================================
 # Operations
 # ==============================================================================
@@ -359,41 +661,138 @@ async def list_calendars(*, account=None, **params):
 @connection("api")
 async def list_events(*, calendar_id="primary", days=7, past=False,
                 query=None, limit=50, page_token=None,
-                exclude_all_day=False, **params):
-    """List events within a date range, optionally filtered by search."""
-    headers = _auth_header(params)
-    now = datetime.now(timezone.utc)
+                exclude_all_day=False, source="api", **params):
+    """List events within a date range, optionally filtered by search.
 
-    if past:
-        time_min = (now - timedelta(days=days)).isoformat()
-        time_max = now.isoformat()
-    else:
-        time_min = now.isoformat()
-        time_max = (now + timedelta(days=days)).isoformat()
+    Pages are followed until `limit` events are collected. With
+    source="mirror" the window is answered from the calendar's local mirror
+    once sync_events has created it.
+    """
+    time_min, time_max = _window(days, past)
+    limit = int(limit)
+    items, _ = await _window_events(params, calendar_id, time_min, time_max,
+                                 query, limit, page_token, source)
+    events = [_map_event(e) for e in items]
 
-    query_params = {
-        "timeMin": time_min,
-        "timeMax": time_max,
-        "maxResults": str(limit),
-        "singleEvents": "true",
-        "orderBy": "startTime",
+    if exclude_all_day:
+        events = [e for e in events if not e["allDay"]]
+
+    return events
+
+
+@returns({"events": "array", "errors": "array"})
+@connection("api")
+@timeout(60)
+async def list_timeline(*, calendar_ids=None, days=1, past=False, query=None,
+                        limit=200, exclude_all_day=False, source="api", **params):
+    """Events from several calendars merged into one timeline by start time.
+
+    Defaults to every calendar selected in the user's calendar list. The
+    calendars are queried concurrently; each event carries its calendarId.
+    A calendar that fails is listed under errors and the rest still merge.
+    """
+    time_min, time_max = _window(days, past)
+    limit = int(limit)
+    if calendar_ids is None:
+        calendar_ids = await _selected_calendar_ids(params)
+    elif isinstance(calendar_ids, str):
+        calendar_ids = [c.strip() for c in calendar_ids.split(",") if c.strip()]
+
+    gate = asyncio.Semaphore(TIMELINE_CONCURRENCY)
+
+    async def one(calendar_id):
+        async with gate:
+            items, tz = await _window_events(params, calendar_id, time_min, time_max,
+                                             query, limit, None, source, strict=True)
+        return [(calendar_id, tz, item) for item in items]
+
+    results = await asyncio.gather(*(one(c) for c in calendar_ids), return_exceptions=True)
+    per_calendar, errors = [], []
+    for calendar_id, result in zip(calendar_ids, results):
+        if isinstance(result, BaseException):
+            errors.append({"calendarId": calendar_id, "error": str(result) or type(result).__name__})
+        else:
+            per_calendar.append(result)
+
+    # Each list is already in start order, so a k-way merge is enough
+    def start_key(pair):
+        return _parse_event_time(pair[2].get("start"), pair[1]) or time_min
+
+    events = []
+    for calendar_id, _, item in heapq.merge(*per_calendar, key=start_key):
+        event = _map_event(item)
+        if exclude_all_day and event["allDay"]:
+            continue
+        event["calendarId"] = calendar_id
+        events.append(event)
+        if len(events) >= limit:
+            break
+    return {"events": events, "errors": errors}
+
+
+@returns({"calendar_id": "string", "events": "integer", "changed": "integer", "synced_at": "string"})
+@connection("api")
+@timeout(120)
+async def sync_events(*, calendar_id="primary", full=False, **params):
+    """Sync a calendar's local event mirror.
+
+    The first run (or full=true) pulls every event; later runs fetch only
+    changes via Google's syncToken. Use list_events/search_events with
+    source="mirror" to query it; reads never start the full download.
+    """
+    mirror = await _sync_mirror(params, calendar_id, full=bool(full))
+    return {
+        "calendar_id": calendar_id,
+        "events": len(mirror["events"]),
+        "changed": mirror.get("changed", 0),
+        "synced_at": mirror["synced_at"],
     }
-    if query:
-        query_params["q"] = query
-    if page_token:
-        query_params["pageToken"] = page_token
 
-    resp = await http.get(
-        f"{BASE_URL}/calendars/{calendar_id}/events",
-        params=query_params, **http.headers(accept="json", extra=headers),
-    )
-    data = resp["json"] or {}
-    events = [_map_event(e) for e in data.get("items", [])]
 
-    if exclude_all_day:
-        events = [e for e in events if not e["all_day"]]
+@returns({"busy": "array", "free": "array"})
+@connection("api")
+async def free_busy(*, calendar_id="primary", days=7, past=False, **params):
+    """Busy and free intervals for a window.
 
-    return events
+    Computed from the local mirror when there is one, else from the API.
+    Events shown as free (transparent), declined or cancelled don't count.
+    """
+    time_min, time_max = _window(days, past)
+    items, tz = await _window_events(params, calendar_id, time_min, time_max,
+                                     None, 10 * _PAGE_SIZE, None, "mirror")
+    intervals = []
+    for event in items:
+        if event.get("transparency") == "transparent":
+            continue
+        if any(a.get("self") and a.get("responseStatus") == "declined" for a in event.get("attendees", [])):
+            continue
+        start = _parse_event_time(event.get("start"), tz)
+        if not start:
+            continue
+        start = max(start, time_min)
+        end = min(_parse_event_time(event.get("end"), tz) or start, time_max)
+        if end > start:
+            intervals.append([start, end])
+
+    busy = []
+    for start, end in sorted(intervals):
+        if busy and start <= busy[-1][1]:
+            busy[-1][1] = max(busy[-1][1], end)
+        else:
+            busy.append([start, end])
+
+    free, cursor = [], time_min
+    for start, end in busy:
+        if start > cursor:
+            free.append([cursor, start])
+        cursor = end
+    if cursor < time_max:
+        free.append([cursor, time_max])
+
+    def fmt(spans):
+        return [{"start": a.isoformat(), "end": b.isoformat()} for a, b in spans]
+
+    return {"busy": fmt(busy), "free": fmt(free)}
 
 
 @returns("event")
@@ -409,7 +808,7 @@ async def get_event(*, id=None, url=None, calendar_id="primary", **params):
 
     headers = _auth_header(params)
     resp = await http.get(
-        f"{BASE_URL}/calendars/{calendar_id}/events/{id}",
+        f"{BASE_URL}/calendars/{http.encode(calendar_id)}/events/{id}",
         **http.headers(accept="json", extra=headers),
     )
     return _map_event(resp["json"])
@@ -462,7 +861,7 @@ async def create_event(*, title, start, end=None, all_day=None, calendar_id="pri
             }
         }
 
-    url = f"{BASE_URL}/calendars/{calendar_id}/events"
+    url = f"{BASE_URL}/calendars/{http.encode(calendar_id)}/events"
     if meet:
         url += "?conferenceDataVersion=1"
 
@@ -496,7 +895,7 @@ async def update_event(*, id, calendar_id="primary", title=None, start=None, end
         body["attendees"] = [{"email": e} for e in attendees]
 
     resp = await http.patch(
-        f"{BASE_URL}/calendars/{calendar_id}/events/{id}",
+        f"{BASE_URL}/calendars/{http.encode(calendar_id)}/events/{id}",
         json=body, **http.headers(accept="json", extra=headers),
     )
     return _map_event(resp["json"])
@@ -505,11 +904,11 @@ async def update_event(*, id, calendar_id="primary", title=None, start=None, end
 @returns("event[]")
 @connection("api")
 async def search_events(*, calendar_id="primary", days=30, past=False,
-                   query=None, limit=25, **params):
+                   query=None, limit=25, source="api", **params):
     """Search events — thin wrapper over list_events with search-oriented defaults."""
     return await list_events(
         calendar_id=calendar_id, days=days, past=past,
-        query=query, limit=limit, **params,
+        query=query, limit=limit, source=source, **params,
     )
 
 
@@ -520,7 +919,7 @@ async def delete_event(*, id, calendar_id="primary", **params):
     """Delete a calendar event."""
     headers = _auth_header(params)
     await http.delete(
-        f"{BASE_URL}/calendars/{calendar_id}/events/{id}",
+        f"{BASE_URL}/calendars/{http.encode(calendar_id)}/events/{id}",
         **http.headers(accept="json", extra=headers),
     )
     return {"status": "deleted"}
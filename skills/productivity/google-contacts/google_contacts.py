@@ -4,7 +4,16 @@ Auth token lives in params["auth"]["access_token"], injected by the engine
 from the Mimestream OAuth provider (googleapis.com / contacts scope).
 """
 
+import hashlib
+import json
+import os
 import re
+import sys
+import tempfile
+import time
+import unicodedata
+from datetime import datetime, timezone
+from pathlib import Path
 
 from agentos import http, connection, returns, timeout
 
@@ -16,6 +25,16 @@ PERSON_FIELDS = ",".join([
     "memberships", "metadata", "nicknames",
 ])
 
+# Local contact-book mirror kept current with connections.list sync tokens
+MIRROR_DIR = Path.home() / ".agentos" / "cache" / "google-contacts"
+_PAGE_SIZE = 1000  # connections.list maximum
+SYNC_TTL = 300  # seconds a synced mirror is trusted before the next incremental sync
+
+# Per mirror path: (monotonic time of last sync, mirror, indexes);
+# access-token digest -> account identity
+_loaded = {}
+_accounts = {}
+
 
 # ==============================================================================
 # Internal helpers
@@ -209,6 +228,305 @@ def _map_person(person):
     return result
 
 
+# ==============================================================================
+# Local mirror and indexes
+# ==============================================================================
+
+
+class _SyncTokenExpired(Exception):
+    """The People API no longer accepts the stored sync token."""
+
+
+def _phone_digits(value):
+    """Digits of a phone number, or None if too short to be one."""
+    digits = re.sub(r"\D", "", value or "")
+    return digits if len(digits) >= 7 else None
+
+
+def _email_key(value):
+    value = (value or "").strip().lower()
+    if value.startswith("mailto:"):
+        value = value[7:]
+    return value if "@" in value else None
+
+
+def _fold(text):
+    """Lowercase and strip accents for name matching."""
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in text if not unicodedata.combining(c)).lower().strip()
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _person_names(person):
+    names = [n.get("displayName") for n in person.get("names", [])]
+    names += [n.get("value") for n in person.get("nicknames", [])]
+    names += [o.get("name") for o in person.get("organizations", [])]
+    return [_fold(n) for n in names if n]
+
+
+def _build_indexes(people):
+    """Exact-match indexes over the mirror.
+
+    Phone numbers are keyed three ways: the last ten digits of full numbers
+    (so +1 415-555-0100 and (415) 555-0100 collide), and the last seven
+    digits of every number and of numbers stored without an area code.
+    """
+    phones, phones7, local7, emails, grams = {}, {}, {}, {}, {}
+    for resource, person in people.items():
+        for phone in person.get("phoneNumbers", []):
+            for value in (phone.get("canonicalForm"), phone.get("value")):
+                digits = _phone_digits(value)
+                if not digits:
+                    continue
+                phones7.setdefault(digits[-7:], set()).add(resource)
+                if len(digits) >= 10:
+                    phones.setdefault(digits[-10:], set()).add(resource)
+                else:
+                    local7.setdefault(digits[-7:], set()).add(resource)
+        for email in person.get("emailAddresses", []):
+            key = _email_key(email.get("value"))
+            if key:
+                emails.setdefault(key, set()).add(resource)
+        for name in _person_names(person):
+            for gram in _trigrams(name):
+                grams.setdefault(gram, set()).add(resource)
+    return {"phone": phones, "phone7": phones7, "local7": local7, "email": emails, "name": grams}
+
+
+async def _account_key(params):
+    """Stable identity for the signed-in account: its People resourceName.
+
+    Looked up once per access token; the account param is only a fallback
+    for when Google can't be asked.
+    """
+    token = (params.get("auth") or {}).get("access_token") or ""
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    if digest not in _accounts:
+        resp = await http.get(
+            f"{BASE_URL}/people/me",
+            params={"personFields": "metadata"},
+            **http.headers(accept="json", extra=_auth_header(params)),
+        )
+        ident = (resp["json"] or {}).get("resourceName") if resp.get("ok", True) else None
+        if not ident:
+            return params.get("account") or "default"
+        _accounts[digest] = ident
+    return _accounts[digest]
+
+
+async def _mirror_path(params):
+    account = await _account_key(params)
+    return MIRROR_DIR / f"{hashlib.sha256(account.encode()).hexdigest()[:16]}.json"
+
+
+def _load_mirror(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _save_mirror(path, mirror):
+    """Write the mirror atomically. Best-effort: a failed write only costs a resync."""
+    tmp = None
+    try:
+        MIRROR_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=MIRROR_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(mirror, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: could not save contact mirror: {e}", file=sys.stderr)
+        if tmp:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+async def _list_connections(headers, query, limit=None, strict=False):
+    """Follow nextPageToken through connections.list.
+
+    Returns (people, nextSyncToken); stops early once `limit` people are in
+    hand. An error page ends the walk with what was collected, unless
+    `strict` — syncing must not mistake a failed page for the end of the list.
+    """
+    people = []
+    query = dict(query)
+    while True:
+        resp = await http.get(
+            f"{BASE_URL}/people/me/connections",
+            params=query,
+            **http.headers(accept="json", extra=headers),
+        )
+        body = resp.get("body") or ""
+        if strict and (resp.get("status") == 410 or "EXPIRED_SYNC_TOKEN" in body):
+            raise _SyncTokenExpired()
+        if not resp.get("ok", True):
+            if strict:
+                raise RuntimeError(f"People API error {resp.get('status')}: {body[:200]}")
+            return people, None
+        data = resp["json"] or {}
+        people.extend(data.get("connections", []))
+        page_token = data.get("nextPageToken")
+        if not page_token or (limit is not None and len(people) >= limit):
+            return people, data.get("nextSyncToken")
+        query["pageToken"] = page_token
+
+
+def _apply_changes(mirror, changed, sync_token):
+    """Fold an incremental connections.list result into the mirror."""
+    people = mirror["people"]
+    for person in changed:
+        if person.get("metadata", {}).get("deleted"):
+            people.pop(person.get("resourceName"), None)
+        else:
+            people[person["resourceName"]] = person
+    mirror.update(sync_token=sync_token or mirror["sync_token"], changed=len(changed),
+                  synced_at=datetime.now(timezone.utc).isoformat())
+
+
+def _sync_query(sync_token=None):
+    query = {"personFields": PERSON_FIELDS, "pageSize": str(_PAGE_SIZE), "requestSyncToken": "true"}
+    if sync_token:
+        query["syncToken"] = sync_token
+    return query
+
+
+async def _sync_mirror(params, full=False):
+    """Bring the contact mirror up to date and return it.
+
+    With a stored sync token only changed and deleted contacts are fetched;
+    an expired token (or no mirror yet) triggers a full resync.
+    """
+    headers = _auth_header(params)
+    path = await _mirror_path(params)
+    mirror = None if full else _load_mirror(path)
+
+    if mirror and mirror.get("sync_token"):
+        try:
+            changed, sync_token = await _list_connections(
+                headers, _sync_query(mirror["sync_token"]), strict=True,
+            )
+        except _SyncTokenExpired:
+            mirror = None
+        else:
+            _apply_changes(mirror, changed, sync_token)
+
+    if not mirror or not mirror.get("sync_token"):
+        changed, sync_token = await _list_connections(headers, _sync_query(), strict=True)
+        mirror = {
+            "sync_token": sync_token,
+            "people": {p["resourceName"]: p for p in changed if not p.get("metadata", {}).get("deleted")},
+            "changed": len(changed),
+            "synced_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    _save_mirror(path, mirror)
+    _loaded[path] = (time.monotonic(), mirror, _build_indexes(mirror["people"]))
+    return mirror
+
+
+async def _mirror(params, refresh=False):
+    """(mirror, indexes) for a read, or None if there is no mirror to read.
+
+    A mirror synced within SYNC_TTL is used as is (unless refresh is set);
+    an older one gets an incremental sync, and is served stale if that
+    fails. Reads never start a full download — without a mirror, or once
+    the sync token has expired, sync_contacts has to run first.
+    """
+    path = await _mirror_path(params)
+    entry = _loaded.get(path)
+    if entry and not refresh and time.monotonic() - entry[0] < SYNC_TTL:
+        return entry[1], entry[2]
+    mirror = entry[1] if entry else _load_mirror(path)
+    if not mirror or not mirror.get("sync_token"):
+        return None
+    try:
+        changed, sync_token = await _list_connections(
+            _auth_header(params), _sync_query(mirror["sync_token"]), strict=True,
+        )
+    except _SyncTokenExpired:
+        return None
+    except Exception as e:
+        print(f"Warning: contact mirror sync failed, serving last copy: {e}", file=sys.stderr)
+        changed, sync_token = [], None
+    if changed or (sync_token and sync_token != mirror["sync_token"]):
+        _apply_changes(mirror, changed, sync_token)
+        _save_mirror(path, mirror)
+    indexes = entry[2] if entry and not changed else _build_indexes(mirror["people"])
+    _loaded[path] = (time.monotonic(), mirror, indexes)
+    return mirror, indexes
+
+
+async def _expire_mirror(params):
+    """Force the next mirror read to sync (after a create/update/delete)."""
+    _loaded.pop(await _mirror_path(params), None)
+
+
+def _updated(person):
+    """Latest updateTime across a person's sources, for recency ordering."""
+    return max((s.get("updateTime", "") for s in person.get("metadata", {}).get("sources", [])), default="")
+
+
+def _lookup_handle(indexes, people, handle):
+    """Resource names matching an email address or phone number exactly, best first.
+
+    A full number matches the same last ten digits ahead of contacts stored
+    without an area code; a number without one matches on the last seven.
+    Within each tier the most recently updated contact comes first.
+    """
+    email = _email_key(handle)
+    digits = _phone_digits(handle)
+    if email:
+        tiers = [indexes["email"].get(email, ())]
+    elif not digits or re.search(r"[a-zA-Z]", handle):
+        return []
+    elif len(digits) >= 10:
+        tiers = [indexes["phone"].get(digits[-10:], ()), indexes["local7"].get(digits[-7:], ())]
+    else:
+        tiers = [indexes["phone7"].get(digits[-7:], ())]
+    ranked, seen = [], set()
+    for tier in tiers:
+        fresh = sorted(r for r in tier if r not in seen)
+        fresh.sort(key=lambda r: _updated(people[r]), reverse=True)
+        ranked += fresh
+        seen.update(fresh)
+    return ranked
+
+
+def _search_mirror(mirror, indexes, query, limit):
+    """Exact handle hits first, then names ranked by trigram overlap."""
+    people = mirror["people"]
+    exact = _lookup_handle(indexes, people, query)
+    if exact:
+        return [people[r] for r in exact[:limit]]
+
+    needle = _fold(query)
+    wanted = _trigrams(needle)
+    scores = {}
+    for gram in wanted:
+        for resource in indexes["name"].get(gram, ()):
+            scores[resource] = scores.get(resource, 0) + 1
+
+    ranked = []
+    for resource, hits in scores.items():
+        names = _person_names(people[resource])
+        # Dice coefficient against the best-matching name, with a bonus for substring hits
+        best = max((2 * hits / (len(wanted) + len(_trigrams(n))) for n in names), default=0)
+        if any(needle in n for n in names):
+            best += 1
+        if best >= 0.3:
+            ranked.append((-best, resource))
+    ranked.sort()
+    return [people[r] for _, r in ranked[:limit]]
+
+
 # ==============================================================================
 # Build request bodies
 # ==============================================================================
@@ -299,25 +617,84 @@ def _update_person_fields(body):
 
 @returns("person[]")
 @connection("api")
-async def list_contacts(*, limit=100, page_token=None, **params):
-    """List contacts sorted by last modified."""
-    headers = _auth_header(params)
+async def list_contacts(*, limit=100, page_token=None, source="api", **params):
+    """List contacts sorted by last modified.
+
+    Pages are followed until `limit` contacts are collected. With
+    source="mirror" they come from the local contact mirror instead, once
+    sync_contacts has created it; mirror listings aren't paged, so raise
+    `limit` rather than passing a page_token.
+    """
+    limit = int(limit)
+    if page_token and source == "mirror":
+        raise ValueError('page_token only applies to source="api"; mirror listings take a larger limit instead')
+    local = await _mirror(params) if source == "mirror" else None
+    if local:
+        mirror, _ = local
+        people = sorted(mirror["people"].values(), key=_updated, reverse=True)
+        return [_map_person(p) for p in people[:limit]]
+
     query = {
         "personFields": PERSON_FIELDS,
-        "pageSize": str(min(limit, 1000)),
+        "pageSize": str(min(limit, _PAGE_SIZE)),
         "sortOrder": "LAST_MODIFIED_DESCENDING",
     }
     if page_token:
         query["pageToken"] = page_token
 
-    resp = await http.get(
-        f"{BASE_URL}/people/me/connections",
-        params=query,
-        **http.headers(accept="json", extra=headers),
-    )
-    data = resp["json"]
-    connections = data.get("connections", [])
-    return [_map_person(p) for p in connections]
+    connections, _ = await _list_connections(_auth_header(params), query, limit)
+    return [_map_person(p) for p in connections[:limit]]
+
+
+@returns({"contacts": "integer", "changed": "integer", "synced_at": "string"})
+@connection("api")
+@timeout(120)
+async def sync_contacts(*, full=False, **params):
+    """Sync the local contact mirror.
+
+    The first run (or full=true) pulls every contact; later runs fetch only
+    changes via the People API sync token.
+    """
+    mirror = await _sync_mirror(params, full=bool(full))
+    return {
+        "contacts": len(mirror["people"]),
+        "changed": mirror.get("changed", 0),
+        "synced_at": mirror["synced_at"],
+    }
+
+
+@returns({"matches": "array"})
+@connection("api")
+@timeout(60)
+async def resolve_handles(*, handles, refresh=False, **params):
+    """Resolve email addresses and phone numbers to contacts in one call.
+
+    Lookups run against the local mirror's indexes, so sync_contacts must
+    have run first. Phone numbers match regardless of formatting, and a
+    number without an area code matches on its last seven digits. Returns
+    one entry per handle with the best candidate (full-number matches over
+    seven-digit ones, then the most recently updated), or person set to
+    null when nothing matches.
+    """
+    if isinstance(handles, str):
+        handles = [h.strip() for h in handles.split(",") if h.strip()]
+    local = await _mirror(params, refresh=bool(refresh))
+    if not local:
+        raise ValueError("No contact mirror for this account — run sync_contacts first")
+    mirror, indexes = local
+    people = mirror["people"]
+    mapped = {}
+    matches = []
+    for handle in handles:
+        resources = _lookup_handle(indexes, people, handle)
+        person = None
+        if resources:
+            resource = resources[0]
+            if resource not in mapped:
+                mapped[resource] = _map_person(people[resource])
+            person = mapped[resource]
+        matches.append({"handle": handle, "person": person, "candidates": len(resources)})
+    return {"matches": matches}
 
 
 @returns("person")
@@ -339,8 +716,18 @@ async def get_contact(*, id, **params):
 @returns("person[]")
 @connection("api")
 @timeout(15)
-async def search_contacts(*, query, limit=30, **params):
-    """Search contacts by name, email, phone, or any text."""
+async def search_contacts(*, query, limit=30, source="api", **params):
+    """Search contacts by name, email, phone, or any text.
+
+    With source="mirror" the search runs locally once sync_contacts has
+    created the mirror: exact email/phone matches, otherwise fuzzy name
+    matching, and `limit` isn't capped at 30.
+    """
+    local = await _mirror(params) if source == "mirror" else None
+    if local:
+        mirror, indexes = local
+        return [_map_person(p) for p in _search_mirror(mirror, indexes, query, int(limit))]
+
     headers = _auth_header(params)
     query_params = {
         "query": query,
@@ -378,6 +765,7 @@ async def create_contact(*, first_name=None, last_name=None, organization=None,
         json=body,
         **http.headers(accept="json", extra=headers),
     )
+    await _expire_mirror(params)
     return _map_person(resp["json"])
 
 
@@ -414,6 +802,7 @@ async def update_contact(*, id, first_name=None, last_name=None, organization=No
         json=body,
         **http.headers(accept="json", extra=headers),
     )
+    await _expire_mirror(params)
     return _map_person(resp["json"])
 
 
@@ -429,4 +818,5 @@ async def delete_contact(*, id, **params):
         f"{BASE_URL}/{resource}:deleteContact",
         **http.headers(accept="json", extra=headers),
     )
+    await _expire_mirror(params)
     return {"status": "deleted", "id": resource}
@@ -4,6 +4,7 @@
 Commands:
   list [limit] [page]   - List recent meetings with metadata
   get <doc_id>          - Get a meeting with full transcript + AI summary
+  get_many <doc_id>...  - Get many meetings (batched documents, concurrent hydration)
 
 Auth: reads ~/Library/Application Support/Granola/supabase.json
       Token auto-refreshed by the Granola app (~6hr lifetime)
@@ -22,9 +23,13 @@ Web: https://notes.granola.ai/t/{thread_id}
 Local cache: ~/Library/Application Support/Granola/cache-v6.json — same entity shape, works offline.
 """
 
+import asyncio
 import json
+import mmap
+import os
 import re
 import sys
+import tempfile
 from datetime import datetime
 from pathlib import Path
 
@@ -34,6 +39,13 @@ DEFAULT_API_BASE = "https://api.granola.ai"
 DEFAULT_AUTH_FILE = Path.home() / "Library" / "Application Support" / "Granola" / "supabase.json"
 DEFAULT_CACHE_FILE = Path.home() / "Library" / "Application Support" / "Granola" / "cache-v6.json"
 
+# Transcript + panels per document, reused while the document's updated_at is unchanged
+TRANSCRIPT_CACHE_DIR = Path.home() / ".agentos" / "cache" / "granola" / "transcripts"
+
+# get-documents-batch page size and max in-flight transcript/panel hydrations
+_DOCUMENT_BATCH_SIZE = 50
+_HYDRATE_CONCURRENCY = 8
+
 
 def _expand_path(p: str) -> Path:
     if p.startswith("~/"):
@@ -197,17 +209,64 @@ async def _cmd_list(token: str, limit: int, page: int, con: dict | None = None)
     return [_normalize_meeting(d) for d in docs]
 
 
-async def _cmd_get(token: str, doc_id: str, con: dict | None = None) -> dict:
-    # Fetch document metadata
-    batch = await _api_post(token, "/v1/get-documents-batch", {"document_ids": [doc_id]}, con)
-    docs = batch.get("docs", batch) if isinstance(batch, dict) else batch
-    if not docs:
-        _die(f"Document {doc_id} not found")
-    doc = docs[0]
+def _read_hydration_cache(doc: dict) -> dict | None:
+    path = TRANSCRIPT_CACHE_DIR / f"{doc['id']}.json"
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not doc.get("updated_at") or cached.get("updated_at") != doc.get("updated_at"):
+        return None
+    return cached
+
+
+def _write_hydration_cache(doc: dict, utterances: object, panels: object) -> None:
+    if not doc.get("updated_at"):
+        return
+    try:
+        TRANSCRIPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=TRANSCRIPT_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"updated_at": doc["updated_at"], "utterances": utterances, "panels": panels}, f)
+        os.replace(tmp, TRANSCRIPT_CACHE_DIR / f"{doc['id']}.json")
+    except OSError:
+        pass  # Cache is best-effort; the meeting was already fetched
+
+
+async def _fetch_documents(token: str, doc_ids: list, con: dict | None = None) -> dict:
+    """Fetch document metadata in get-documents-batch pages. Returns {id: doc}."""
+    chunks = [doc_ids[i : i + _DOCUMENT_BATCH_SIZE] for i in range(0, len(doc_ids), _DOCUMENT_BATCH_SIZE)]
+    results = await asyncio.gather(*(
+        _api_post(token, "/v1/get-documents-batch", {"document_ids": chunk}, con) for chunk in chunks
+    ))
+    by_id = {}
+    for batch in results:
+        docs = batch.get("docs", batch) if isinstance(batch, dict) else batch
+        for doc in docs or []:
+            by_id[doc["id"]] = doc
+    return by_id
+
+
+async def _hydrate_meeting(token: str, doc: dict, con: dict | None = None) -> dict:
+    """Normalize a document and attach its transcript + AI summary.
+
+    Transcript and panels are fetched concurrently, and skipped entirely when
+    the local cache holds them for the document's current updated_at.
+    """
+    doc_id = doc["id"]
     meeting = _normalize_meeting(doc)
 
-    # Fetch transcript
-    utterances = await _api_post(token, "/v1/get-document-transcript", {"document_id": doc_id}, con)
+    cached = _read_hydration_cache(doc)
+    if cached:
+        utterances, panels = cached.get("utterances"), cached.get("panels")
+    else:
+        utterances, panels = await asyncio.gather(
+            _api_post(token, "/v1/get-document-transcript", {"document_id": doc_id}, con),
+            _api_post(token, "/v1/get-document-panels", {"document_id": doc_id}, con),
+        )
+        _write_hydration_cache(doc, utterances, panels)
+
     if utterances and isinstance(utterances, list):
         start_str = meeting.get("start") or doc.get("created_at")
         meeting_start = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
@@ -215,15 +274,13 @@ async def _cmd_get(token: str, doc_id: str, con: dict | None = None) -> dict:
         meeting["transcript_text"] = transcript_text
         meeting["segments"] = segments
         meeting["segment_count"] = len(segments)
-        meeting["duration_ms"] = segments[-1]["end_ms"] if segments else 0
+        meeting["duration_ms"] = segments[-1]["endMs"] if segments else 0
     else:
         meeting["transcript_text"] = ""
         meeting["segments"] = []
         meeting["segment_count"] = 0
         meeting["duration_ms"] = 0
 
-    # Fetch AI summary panels
-    panels = await _api_post(token, "/v1/get-document-panels", {"document_id": doc_id}, con)
     if panels and isinstance(panels, list):
         parts = [_html_to_markdown(p.get("original_content", "")) for p in panels]
         meeting["summary_text"] = "\n\n".join(p for p in parts if p)
@@ -233,6 +290,29 @@ async def _cmd_get(token: str, doc_id: str, con: dict | None = None) -> dict:
     return meeting
 
 
+async def _cmd_get(token: str, doc_id: str, con: dict | None = None) -> dict:
+    docs = await _fetch_documents(token, [doc_id], con)
+    if doc_id not in docs:
+        _die(f"Document {doc_id} not found")
+    return await _hydrate_meeting(token, docs[doc_id], con)
+
+
+async def _cmd_get_many(token: str, doc_ids: list, con: dict | None = None) -> list:
+    """Hydrate many meetings: batched document fetch, bounded concurrent hydration.
+
+    Results follow the order of `doc_ids`; ids Granola doesn't return are skipped.
+    """
+    doc_ids = list(dict.fromkeys(doc_ids))
+    docs = await _fetch_documents(token, doc_ids, con)
+    sem = asyncio.Semaphore(_HYDRATE_CONCURRENCY)
+
+    async def hydrate(doc: dict) -> dict:
+        async with sem:
+            return await _hydrate_meeting(token, doc, con)
+
+    return await asyncio.gather(*(hydrate(docs[i]) for i in doc_ids if i in docs))
+
+
 async def _cmd_list_conversations(token: str, document_id: str, con: dict | None = None) -> list:
     """List Q&A chat threads linked to a meeting document."""
     # get-entity-set returns IDs only; we need batch to get grouping_key
@@ -319,61 +399,222 @@ async def _cmd_get_conversation(token: str, thread_id: str, con: dict | None = N
 # -----------------------------------------------------------------------------
 
 
+# Only these subtrees of cache.state are kept. Everything else in the file
+# (transcripts, panels, people, ...) is skipped by scanning, never decoded.
+_CACHE_SUBTREES = (
+    ("cache", "state", "documents"),
+    ("cache", "state", "entities", "chat_thread"),
+    ("cache", "state", "entities", "chat_message"),
+)
+
+_WS = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_SCALAR = re.compile(rb"[^,}\] \t\n\r]+")
+_STRUCTURAL = re.compile(rb'["{}\[\]]')
+
+# Parsed snapshots keyed by cache path; each is reused until the file's
+# (mtime, size) changes.
+_CACHE_SNAPSHOTS: dict[str, dict] = {}
+
+
+def _extract_paths(value: object, paths: list, out: dict, depth: int) -> None:
+    """Pull `paths` out of an already-decoded value (legacy string-encoded caches)."""
+    for path in paths:
+        node = value
+        for key in path[depth:]:
+            node = node.get(key) if isinstance(node, dict) else None
+        if node is not None:
+            out[path] = node
+
+
+def _skip_value(buf, pos: int) -> int:
+    """Index just past the JSON value at `pos`, found by scanning — nothing is decoded."""
+    first = buf[pos:pos + 1]
+    if first == b'"':
+        m = _STRING.match(buf, pos)
+        if not m:
+            raise ValueError(f"unterminated string at {pos}")
+        return m.end()
+    if first not in (b"{", b"["):
+        m = _SCALAR.match(buf, pos)
+        if not m:
+            raise ValueError(f"expected a value at {pos}")
+        return m.end()
+    depth = 0
+    while True:
+        m = _STRUCTURAL.search(buf, pos)
+        if not m:
+            raise ValueError(f"unterminated container at {pos}")
+        ch = m.group()
+        if ch == b'"':
+            pos = _skip_value(buf, m.start())
+            continue
+        pos = m.end()
+        depth += 1 if ch in (b"{", b"[") else -1
+        if depth == 0:
+            return pos
+
+
+def _decode(buf, pos: int) -> tuple:
+    end = _skip_value(buf, pos)
+    return json.loads(buf[pos:end]), end
+
+
+def _walk_object(buf, pos: int, paths: list, out: dict, depth: int) -> int:
+    """Walk the JSON object at `pos`, decoding only values on one of `paths`.
+
+    Returns the index just past the closing brace. Values off every path are
+    skipped by a bracket/string scan without being decoded.
+    """
+    pos = _WS.match(buf, pos + 1).end()
+    if buf[pos:pos + 1] == b"}":
+        return pos + 1
+    while True:
+        key, pos = _decode(buf, pos)
+        pos = _WS.match(buf, pos).end()
+        if buf[pos:pos + 1] != b":":
+            raise ValueError(f"expected ':' at {pos}")
+        pos = _WS.match(buf, pos + 1).end()
+
+        matched = [p for p in paths if p[depth] == key]
+        if any(len(p) == depth + 1 for p in matched):
+            out[matched[0]], pos = _decode(buf, pos)
+        elif matched and buf[pos:pos + 1] == b"{":
+            pos = _walk_object(buf, pos, matched, out, depth + 1)
+        elif matched and buf[pos:pos + 1] == b'"':
+            # Older Granola builds store `cache` as a JSON-encoded string.
+            raw, pos = _decode(buf, pos)
+            _extract_paths(json.loads(raw), matched, out, depth + 1)
+        else:
+            pos = _skip_value(buf, pos)
+
+        pos = _WS.match(buf, pos).end()
+        if buf[pos:pos + 1] == b"}":
+            return pos + 1
+        if buf[pos:pos + 1] != b",":
+            raise ValueError(f"expected ',' or '}}' at {pos}")
+        pos = _WS.match(buf, pos + 1).end()
+
+
+def _read_cache_subtrees(cache_path: Path, paths=_CACHE_SUBTREES) -> dict:
+    """Read the cache file and return {path: value} for each path present.
+
+    The file is memory-mapped and scanned in place: only the wanted subtrees
+    are copied out and decoded, so neither the file text nor the sibling
+    values are ever materialized. A truncated or malformed file (e.g. Granola
+    mid-write) raises json.JSONDecodeError, as json.load would.
+    """
+    out: dict = {}
+    with open(cache_path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # empty file
+            raise json.JSONDecodeError(f"Empty Granola cache: {e}", "", 0) from e
+        with buf:
+            pos = _WS.match(buf).end()
+            if buf[pos:pos + 1] != b"{":
+                raise json.JSONDecodeError("Granola cache is not a JSON object", "", pos)
+            try:
+                _walk_object(buf, pos, list(paths), out, 0)
+            except json.JSONDecodeError:
+                raise
+            except (IndexError, ValueError) as e:
+                raise json.JSONDecodeError(f"Truncated or malformed Granola cache: {e}", "", len(buf)) from e
+    return out
+
+
+def _message_sort_key(m: dict) -> tuple:
+    return ((m.get("data") or {}).get("turn_index", 0), m.get("created_at", ""))
+
+
+def _build_snapshot(subtrees: dict) -> dict:
+    """Precompute the sorted indexes the cache-mode ops page through."""
+    docs = subtrees.get(_CACHE_SUBTREES[0]) or {}
+    threads = subtrees.get(_CACHE_SUBTREES[1]) or {}
+    msgs = subtrees.get(_CACHE_SUBTREES[2]) or {}
+
+    live_docs = [d for d in docs.values() if not d.get("deleted_at")]
+    live_docs.sort(key=lambda d: (d.get("updated_at") or d.get("created_at") or ""), reverse=True)
+
+    threads_by_doc: dict[str, list] = {}
+    for t in threads.values():
+        if t.get("deleted_at"):
+            continue
+        gk = (t.get("data") or {}).get("grouping_key", "")
+        if gk.startswith("meeting:"):
+            threads_by_doc.setdefault(gk[len("meeting:"):], []).append(t)
+    for ts in threads_by_doc.values():
+        ts.sort(key=lambda t: (t.get("updated_at") or ""), reverse=True)
+
+    messages_by_thread: dict[str, list] = {}
+    for m in msgs.values():
+        if m.get("deleted_at"):
+            continue
+        tid = (m.get("data") or {}).get("thread_id")
+        if tid:
+            messages_by_thread.setdefault(tid, []).append(m)
+    for ms in messages_by_thread.values():
+        ms.sort(key=_message_sort_key)
+
+    return {
+        "meetings": live_docs,
+        "threads": threads,
+        "threads_by_doc": threads_by_doc,
+        "messages_by_thread": messages_by_thread,
+    }
+
+
 def _load_cache(cache_path: Path) -> dict:
-    """Load the Granola app's local entity cache."""
-    if not cache_path.exists():
+    """Load the Granola app's local entity cache as an indexed snapshot.
+
+    Re-reads the file only when its mtime or size changes; otherwise every
+    page and lookup is served from the in-process snapshot.
+    """
+    try:
+        st = cache_path.stat()
+    except FileNotFoundError:
         _die("Granola cache not found. Install and run Granola at least once.")
-    with open(cache_path) as f:
-        return json.load(f)
+    sig = (st.st_mtime_ns, st.st_size)
+    key = str(cache_path)
+    snap = _CACHE_SNAPSHOTS.get(key)
+    if snap is None or snap["sig"] != sig:
+        snap = _build_snapshot(_read_cache_subtrees(cache_path))
+        snap["sig"] = sig
+        _CACHE_SNAPSHOTS[key] = snap
+    return snap
 
 
 def _cmd_list_from_cache(limit: int = 20, page: int = 0, con: dict | None = None) -> list:
     """List meetings from local cache."""
-    data = _load_cache(_cache_file(con))
-    docs = (data.get("cache", {}).get("state", {}) or {}).get("documents", {})
-    if not docs:
-        return []
-    items = [_normalize_meeting(d) for d in docs.values() if not d.get("deleted_at")]
-    items.sort(key=lambda x: (x.get("updatedAt") or x.get("createdAt") or ""), reverse=True)
+    snap = _load_cache(_cache_file(con))
     start = page * limit
-    return items[start : start + limit]
+    return [_normalize_meeting(d) for d in snap["meetings"][start : start + limit]]
 
 
 def _cmd_list_conversations_from_cache(document_id: str, con: dict | None = None) -> list:
     """List Q&A threads for a meeting from local cache."""
-    data = _load_cache(_cache_file(con))
-    threads = (data.get("cache", {}).get("state", {}).get("entities", {}) or {}).get("chat_thread", {})
-    target_key = f"meeting:{document_id}"
-    out = []
-    for t in threads.values():
-        if t.get("deleted_at"):
-            continue
-        gk = (t.get("data") or {}).get("grouping_key", "")
-        if gk != target_key:
-            continue
-        out.append({
+    snap = _load_cache(_cache_file(con))
+    return [
+        {
             "id": t["id"],
             "title": (t.get("data") or {}).get("title"),
             "createdAt": t.get("created_at"),
             "updatedAt": t.get("updated_at"),
             "documentId": document_id,
             "notesUrl": f"https://notes.granola.ai/t/{t['id']}",
-        })
-    return sorted(out, key=lambda x: (x["updatedAt"] or ""), reverse=True)
+        }
+        for t in snap["threads_by_doc"].get(document_id, [])
+    ]
 
 
 def _cmd_get_conversation_from_cache(thread_id: str, con: dict | None = None) -> dict:
     """Get a Q&A conversation from local cache."""
-    data = _load_cache(_cache_file(con))
-    threads = (data.get("cache", {}).get("state", {}).get("entities", {}) or {}).get("chat_thread", {})
-    msgs = (data.get("cache", {}).get("state", {}).get("entities", {}) or {}).get("chat_message", {})
-    thread = threads.get(thread_id)
+    snap = _load_cache(_cache_file(con))
+    thread = snap["threads"].get(thread_id)
     if not thread or thread.get("deleted_at"):
         _die(f"Thread {thread_id} not found in cache")
-    raw_msgs = [m for m in msgs.values() if (m.get("data") or {}).get("thread_id") == thread_id and not m.get("deleted_at")]
-    raw_msgs.sort(key=lambda m: ((m.get("data") or {}).get("turn_index", 0), m.get("created_at", "")))
     messages = []
-    for m in raw_msgs:
+    for m in snap["messages_by_thread"].get(thread_id, []):
         d = m.get("data") or {}
         role = d.get("role", "unknown")
         text = d.get("raw_text") or ""
@@ -444,6 +685,21 @@ async def op_get_meeting(id: str = None, url: str = None, connection: dict | Non
     return await _cmd_get(token, doc_id, connection)
 
 
+@returns("meeting[]")
+@connection("api")
+@timeout(120)
+async def op_get_meetings(ids: list, connection: dict | None = None, **_kwargs) -> list:
+    """Get many meetings with transcripts and AI summaries in one call
+
+        Args:
+            ids: Meeting document IDs (UUIDs)
+        """
+    if not ids:
+        return []
+    token = _get_token(connection)
+    return await _cmd_get_many(token, ids, connection)
+
+
 @returns("conversation[]")
 @connection(["api", "cache"])
 async def op_list_conversations(document_id: str, connection: dict | None = None, **_kwargs) -> list:
@@ -500,6 +756,11 @@ if __name__ == "__main__":
                 _die("Usage: granola.py get <doc_id>")
             token = _get_token(None)
             result = _cmd_get(token, sys.argv[2], None)
+        elif cmd == "get_many":
+            if len(sys.argv) < 3:
+                _die("Usage: granola.py get_many <doc_id> [doc_id...]")
+            token = _get_token(None)
+            result = _cmd_get_many(token, sys.argv[2:], None)
         elif cmd == "listConversations":
             if len(sys.argv) < 3:
                 _die("Usage: granola.py list_conversations <document_id> [api|cache]")
@@ -1,6 +1,5 @@
 """Curl skill — simple URL fetching via HTTP GET."""
 
-from lxml import html
 from agentos import http, provides, returns, timeout, web_read
 
 
@@ -21,6 +20,8 @@ async def read_webpage(*, url: str, **params) -> dict:
 
     title = ""
     if content_type.startswith("text/html") and content:
+        from lxml import html
+
         doc = html.fromstring(content[:4000])
         title_el = doc.cssselect("title")
         if title_el: